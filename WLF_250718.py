@@ -1,13 +1,23 @@
+import json
+import os
+import queue
+import threading
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
-from scipy.interpolate import UnivariateSpline
+import matplotlib
+from matplotlib.figure import Figure
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
 from tkinter import ttk
 
+import wlf_batch
+import wlf_core
+import wlf_io
+import wlf_master
+import wlf_shift
+
 # ── Color Palette & Style Constants ──────────────────────────────────────────
 BG          = '#F5F6FA'   # main background (off-white)
 SURFACE     = '#FFFFFF'   # card / panel surface
@@ -23,14 +33,257 @@ DANGER_HVR  = '#CB2431'
 WARN        = '#F9A825'   # amber
 PLOT_BG     = '#FFFFFF'   # plot background
 PLOT_GRID   = '#E8EAED'   # plot grid color
-import matplotlib.font_manager as _fm
+
+FIT_POLL_MS = 50          # how often the GUI checks on a background fit
+TREE_ROW_HEIGHT = 28      # Treeview row height, also used to size the result window
+SLIDER_FRAME_MS = 16      # slider redraws are coalesced to ~60 frames/s
+SLIDER_RESOLUTION = 0.05  # model-parameter sliders (also hits Tg = 263.15 K)
+LANDSCAPE_CACHE_SIZE = 8  # SSE landscapes kept per (data, T_r)
+FIT_VIEWS = ('Fit Curves', 'SSE Map')
+# Notebook tabs (key, title); each is built by create_<key>_tab on first view
+TABS = (
+    ('step1', "  Step 1: Enter Variables  "),
+    ('step2_3', "  Step 2 & 3: WLF Estimation  "),
+    ('step4', "  Step 4: Estimate a\u209c  "),
+    ('step5', "  Step 5: Shift Data  "),
+    ('step6', "  Step 6: Modify Master Curve  "),
+)
+
+# (canvas, figure, axes) attributes freed by release_idle_figures, per tab
+PLOT_ATTRS = {
+    'step2_3': (('canvas', 'figure', 'ax'),),
+    'step4': (('estimate_canvas', 'estimate_figure', 'estimate_ax'),),
+    'step5': (('shifted_canvas', 'shifted_figure', 'shifted_ax'),),
+    'step6': (('master_curve_canvas', 'master_curve_figure', 'master_curve_ax'),
+              ('at_plot_canvas', 'at_plot_figure', 'at_plot_ax')),
+}
+
+FONT_CANDIDATES = ('Segoe UI', 'Helvetica', 'Arial', 'DejaVu Sans')
+CONFIG_DIR_ENV = 'WLF_CONFIG_DIR'
+
+
+def _settings_path():
+    """Small settings file: $WLF_CONFIG_DIR, else ~/.config/wlf/settings.json."""
+    config_dir = os.environ.get(CONFIG_DIR_ENV) or os.path.join(
+        os.path.expanduser('~'), '.config', 'wlf')
+    return os.path.join(config_dir, 'settings.json')
+
+
+def _load_settings():
+    try:
+        with open(_settings_path(), encoding='utf-8') as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return settings if isinstance(settings, dict) else {}
+
+
+def _save_settings(settings):
+    try:
+        os.makedirs(os.path.dirname(_settings_path()), exist_ok=True)
+        with open(_settings_path(), 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+    except OSError:
+        pass
+
+
+def _pick_font_family():
+    """First available candidate font, cached per matplotlib version.
+
+    Scanning the font list is only needed once; later starts read the
+    choice back from the settings file.
+    """
+    settings = _load_settings()
+    cached = settings.get('font_family')
+    if cached and settings.get('font_matplotlib') == matplotlib.__version__:
+        return cached
+
+    import matplotlib.font_manager as fm
+    names = {f.name.lower() for f in fm.fontManager.ttflist}
+    family = 'sans-serif'
+    for candidate in FONT_CANDIDATES:
+        if any(candidate.lower() in name for name in names):
+            family = candidate
+            break
+    settings.update(font_family=family, font_matplotlib=matplotlib.__version__)
+    _save_settings(settings)
+    return family
+
+
 # Pick the first available font for cross-platform support
-FONT_FAMILY = 'sans-serif'
-for _candidate in ('Segoe UI', 'Helvetica', 'Arial', 'DejaVu Sans'):
-    if any(_candidate.lower() in f.name.lower() for f in _fm.fontManager.ttflist):
-        FONT_FAMILY = _candidate
-        break
-plt.rcParams['font.family'] = FONT_FAMILY
+FONT_FAMILY = _pick_font_family()
+matplotlib.rcParams['font.family'] = FONT_FAMILY
+
+
+# Grid-search results as shown in the Step 2 & 3 table
+def result_dtype(names=('C1', 'C2')):
+    """Row layout of the result table for a model's parameter names."""
+    return np.dtype([('Select', bool)] + [(name, float) for name in names]
+                    + [('SSE', float)])
+
+
+RESULT_DTYPE = result_dtype()
+
+
+def param_decimals(model):
+    """Decimals of each parameter's grid values, from its bounds and steps."""
+    def decimals(value):
+        return len(repr(float(value)).split('.')[1].rstrip('0'))
+    return tuple(max(decimals(value) for value in bounds) for bounds in model.ranges)
+
+
+def result_records(ranked, model='WLF'):
+    """Structured result rows from (*params, SSE) rows of ``model``.
+
+    Parameters are rounded to the decimals of their grid (Tg sits on
+    x.15 K), so the rows are the exact mesh points their SSE belongs to.
+    """
+    model = wlf_core.get_model(model)
+    ranked = np.asarray(ranked, dtype=float).reshape(-1, len(model.params) + 1)
+    records = np.zeros(len(ranked), dtype=result_dtype(model.params))
+    for k, (name, decimals) in enumerate(zip(model.params, param_decimals(model))):
+        records[name] = ranked[:, k].round(decimals)
+    records['SSE'] = ranked[:, -1].round(4)
+    return records
+
+
+def param_text(names, values, sep='=', join=', '):
+    """'C1=17.4, C2=51.6' style text of model parameters."""
+    return join.join('{0}{1}{2}'.format(name, sep, value) for name, value in zip(names, values))
+
+
+def landscape_key(T, log_aT, T_r):
+    """Cache key of an SSE landscape: the exact data and reference temperature."""
+    return (np.asarray(T, dtype=float).tobytes(),
+            np.asarray(log_aT, dtype=float).tobytes(), float(T_r))
+
+
+class ResultTable:
+    """Virtual Treeview over a structured array of grid-search results.
+
+    Only as many Treeview items as fit on screen exist; scrolling just
+    rewrites their values from ``records[order[offset:offset + rows]]``.
+    Sorting is an ``argsort`` of one column and never touches Tk items.
+    """
+
+    def __init__(self, parent, on_toggle=None):
+        self.records = np.zeros(0, dtype=RESULT_DTYPE)
+        self.order = np.zeros(0, dtype=np.intp)
+        self.offset = 0
+        self.rows = 15
+        self.best = None
+        self.on_toggle = on_toggle
+
+        self.tree = ttk.Treeview(parent, show='headings', height=self.rows)
+        self._set_columns(RESULT_DTYPE.names)
+        self.tree.tag_configure('recommended', background='#DDEAF6')
+
+        self.scrollbar = ttk.Scrollbar(parent, orient='vertical',
+                                       command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<ButtonRelease-1>', self._on_click)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+        self._render()
+
+    def _set_columns(self, names):
+        # One column per model parameter between Sel and SSE
+        self.tree.delete(*self.tree.get_children())
+        self.tree['columns'] = names
+        self.tree.heading('Select', text='Sel')
+        self.tree.column('Select', width=50, anchor='center')
+        for col in names[1:]:
+            self.tree.heading(col, text=col,
+                              command=lambda col=col: self.sort_column(col, False))
+            self.tree.column(col, width=90 if col == 'SSE' else 80, anchor='center')
+
+    def set_records(self, records):
+        if records.dtype.names != self.records.dtype.names:
+            self._set_columns(records.dtype.names)
+        self.records = records
+        self.order = np.arange(len(records))
+        self.offset = 0
+        self.best = int(np.argmin(records['SSE'])) if len(records) else None
+        self._render()
+
+    def selected(self):
+        """Checked records, in display order."""
+        rows = self.records[self.order]
+        return rows[rows['Select']]
+
+    def sort_column(self, col, reverse):
+        keys = self.records[col]
+        order = np.argsort(-keys if reverse else keys, kind='stable')
+        self.order = order
+        self.offset = 0
+        self.tree.heading(col, command=lambda: self.sort_column(col, not reverse))
+        self._render()
+
+    def scroll(self, rows):
+        self.offset += rows
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.offset = int(round(float(value) * len(self.order)))
+        elif unit == 'pages':
+            self.offset += int(value) * self.rows
+        else:
+            self.offset += int(value)
+        self._render()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        # One header row, the rest are data rows
+        rows = max(1, event.height // TREE_ROW_HEIGHT - 1)
+        if rows != self.rows:
+            self.rows = rows
+            self._render()
+
+    def _on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != 'cell':
+            return
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        position = self.offset + self.tree.index(item)
+        if position >= len(self.order):
+            return
+        record = self.order[position]
+        self.records['Select'][record] = not self.records['Select'][record]
+        self._render()
+        if self.on_toggle is not None:
+            self.on_toggle()
+
+    def _render(self):
+        total = len(self.order)
+        self.offset = max(0, min(self.offset, total - self.rows))
+        window = self.order[self.offset:self.offset + self.rows]
+
+        items = self.tree.get_children()
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+            items = items[:len(window)]
+        for _ in range(len(window) - len(items)):
+            self.tree.insert('', 'end')
+        items = self.tree.get_children()
+
+        for item, record in zip(items, window):
+            row = self.records[record]
+            self.tree.item(item, values=('1' if row['Select'] else '0',)
+                           + tuple(row[name] for name in self.records.dtype.names[1:]),
+                           tags=('recommended',) if record == self.best else ())
+        if total:
+            self.scrollbar.set(self.offset / total,
+                               min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
 
 class WLF_GUI(tk.Tk):
@@ -43,17 +296,55 @@ class WLF_GUI(tk.Tk):
         # Initialize variables to prevent attribute errors
         self.dragging = False
         self.selected_line = None
-        self.shifted_data = None
-        self.shifted_freqs = None
+        self.drag_column = None
+        self.drag_start_values = None
+        self.drag_log_factor = 0.0
+        self._shifted_lines = {}
+        self._drag_index = None
+        self._drag_index_key = None
+        self._drag_background = None
+        # Steps 5/6 keep per-isotherm shift factors; shifted_data and
+        # shifted_freqs are derived from them and the loaded table on demand
+        self.shift_history = None
+        self._shift_source = None
+        self._shift_views = None
+        self._shift_selected = None
+        self._step5_state = None
+        self._master_history = None
+        self._master_source = None
+        self._master_base = None
+        self._master_factors = (1.0, 1.0)
+        self._master_editing = False
+        self._step6_state = None
         self.data = None
         self.estimated_aT_values = None
+        self.estimated_aT_params = None
+        self.estimated_aT_model = 'WLF'
+        self._estimate_plot_args = None
 
         self.screen_width = self.winfo_screenwidth()
         self.screen_height = self.winfo_screenheight()
         self.geometry("{0}x{1}".format(self.screen_width, self.screen_height // 2))
         self.T_data = None
         self.log_aT_data = None
-        self.sort_orders = {'C1': False, 'C2': False, 'SSE': False}
+        self._fit_thread = None
+        self._fit_cancel = None
+        self._fit_queue = None
+        self._fit_warning = None
+        self._fit_line = None
+        self._fit_plot_key = None
+        self._fit_background = None
+        self._landscapes = {}
+        self._landscape_drawn = None
+        self._landscape_marker = None
+        self.fit_params = None
+        self._slider_job = None
+        self._master_lines = {}
+        self._master_background = None
+        self._at_line = None
+        self._bt_line = None
+        self.prony_fit = None
+        self.smoothed_curve = None
 
         self._configure_styles()
         self.create_widgets()
@@ -141,7 +432,7 @@ class WLF_GUI(tk.Tk):
                              background=SURFACE,
                              foreground=TEXT,
                              fieldbackground=SURFACE,
-                             rowheight=28,
+                             rowheight=TREE_ROW_HEIGHT,
                              borderwidth=0)
         self.style.configure('Treeview.Heading',
                              font=(FONT_FAMILY, 11, 'bold'),
@@ -175,7 +466,9 @@ class WLF_GUI(tk.Tk):
 
     def _setup_plot(self, figsize=(10, 6)):
         """Create a matplotlib figure + axes with clean styling."""
-        fig, ax = plt.subplots(figsize=figsize)
+        # Plain Figures (no pyplot) are freed with their canvas
+        fig = Figure(figsize=figsize)
+        ax = fig.add_subplot()
         fig.patch.set_facecolor(PLOT_BG)
         ax.set_facecolor(PLOT_BG)
         ax.tick_params(colors=TEXT, labelsize=9)
@@ -215,19 +508,106 @@ class WLF_GUI(tk.Tk):
 
     # ── Widget Creation ──────────────────────────────────────────────────────
     def create_widgets(self):
+        menubar = tk.Menu(self)
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Undo Shift", accelerator="Ctrl+Z",
+                              command=self.undo_shift)
+        edit_menu.add_command(label="Redo Shift", accelerator="Ctrl+Y",
+                              command=self.redo_shift)
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        self.bind('<Control-z>', self.undo_shift)
+        self.bind('<Control-y>', self.redo_shift)
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_command(label="Release Idle Plots",
+                              command=self.release_idle_figures)
+        menubar.add_cascade(label="View", menu=view_menu)
+        self.config(menu=menubar)
+
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=12, pady=(8, 12))
 
-        self.create_step1_tab()
-        self.create_step2_3_tab()
-        self.create_step4_tab()
-        self.create_step5_tab()
-        self.create_step6_tab()
+        # Every tab starts as an empty frame and is filled on first view
+        self._tab_frames = {}
+        self._tabs_built = set()
+        self._figures_released = set()
+        self._plot_cards = {}
+        for key, text in TABS:
+            frame = ttk.Frame(self.notebook, style='BG.TFrame')
+            self.notebook.add(frame, text=text)
+            self._tab_frames[key] = frame
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._ensure_tab('step1')
+
+    def _current_tab(self):
+        return TABS[self.notebook.index(self.notebook.select())][0]
+
+    def _on_tab_changed(self, event=None):
+        key = self._current_tab()
+        self._ensure_tab(key)
+        # Shift edits made on the other tab are drawn once this one is shown
+        if key == 'step5' and self._step5_state is not None \
+                and self._step5_state is not self.shift_history.current:
+            self.plot_shifted_data()
+        elif key == 'step6' and self._step6_state is not None \
+                and self._step6_state is not self._master_history.current:
+            self._refresh_master_curve()
+
+    def _ensure_tab(self, key, replot=True):
+        """Build a tab on first use and bring back its released figures."""
+        if key not in self._tabs_built:
+            self._tabs_built.add(key)
+            getattr(self, 'create_{0}_tab'.format(key))(self._tab_frames[key])
+        elif key in self._figures_released:
+            self._figures_released.discard(key)
+            getattr(self, '_create_{0}_plots'.format(key))()
+            if replot:
+                self._replot_tab(key)
+
+    def _replot_tab(self, key):
+        """Redraw a tab whose figures were recreated, from the app state."""
+        if key == 'step2_3':
+            if self.fit_view_var.get() == 'SSE Map':
+                self._plot_landscape()
+            elif len(self.result_table.selected()):
+                self.update_checked_plots()
+            else:
+                self.update_plot()
+        elif key == 'step4' and self._estimate_plot_args is not None:
+            self._plot_estimated_aT(*self._estimate_plot_args)
+        elif key == 'step5':
+            if self.shifted_data is not None:
+                self.plot_shifted_data()
+            elif self.data is not None:
+                self.plot_loaded_data()
+        elif key == 'step6' and self._master_history is not None:
+            self.plot_master_curve()
+            if getattr(self, 'selected_temp', None) is not None:
+                self._highlight_master_temp()
+                self.update_master_curve()
+
+    def release_idle_figures(self):
+        """Free the figures of every built tab except the visible one.
+
+        They are recreated and redrawn the next time their tab is shown.
+        """
+        current = self._current_tab()
+        for key in self._tabs_built - self._figures_released - {current, 'step1'}:
+            for names in PLOT_ATTRS[key]:
+                getattr(self, names[0]).get_tk_widget().destroy()
+                getattr(self, names[1]).clear()
+                for name in names:
+                    setattr(self, name, None)
+            self._figures_released.add(key)
+        # Cached artists belong to the figures that were just dropped
+        if 'step2_3' in self._figures_released:
+            self._fit_line = self._fit_plot_key = self._fit_background = None
+        if 'step6' in self._figures_released:
+            self._master_lines = {}
+            self._master_background = None
+            self._at_line = self._bt_line = None
 
     # ── Step 1 ───────────────────────────────────────────────────────────────
-    def create_step1_tab(self):
-        step1_frame = ttk.Frame(self.notebook, style='BG.TFrame')
-        self.notebook.add(step1_frame, text="  Step 1: Enter Variables  ")
+    def create_step1_tab(self, step1_frame):
 
         # Center card
         card = self._make_card(step1_frame, padx=32, pady=24)
@@ -246,6 +626,7 @@ class WLF_GUI(tk.Tk):
                  font=(FONT_FAMILY, 12, 'bold'), bg=SURFACE, fg=ACCENT
                  ).grid(row=1, column=1, padx=24, pady=(0, 8))
 
+        self.step1_card = card
         self.temp_entries = []
         self.log_aT_entries = []
 
@@ -253,20 +634,33 @@ class WLF_GUI(tk.Tk):
         default_log_aT_values = [1.93, 1.3, 0.9, 0]
 
         for i in range(8):
-            temp_entry = self._make_entry(card, width=16,
-                                          default=str(default_temp_values[i]) if i < len(default_temp_values) else '')
-            temp_entry.grid(row=i + 2, column=0, padx=24, pady=4)
-            self.temp_entries.append(temp_entry)
-
-            log_aT_entry = self._make_entry(card, width=16,
-                                            default=str(default_log_aT_values[i]) if i < len(default_log_aT_values) else '')
-            log_aT_entry.grid(row=i + 2, column=1, padx=24, pady=4)
-            self.log_aT_entries.append(log_aT_entry)
+            self._add_step1_row(default_temp_values[i] if i < len(default_temp_values) else '',
+                                default_log_aT_values[i] if i < len(default_log_aT_values) else '')
+
+    def _add_step1_row(self, temp='', log_aT=''):
+        row = len(self.temp_entries) + 2
+        temp_entry = self._make_entry(self.step1_card, width=16, default=str(temp))
+        temp_entry.grid(row=row, column=0, padx=24, pady=4)
+        self.temp_entries.append(temp_entry)
+
+        log_aT_entry = self._make_entry(self.step1_card, width=16, default=str(log_aT))
+        log_aT_entry.grid(row=row, column=1, padx=24, pady=4)
+        self.log_aT_entries.append(log_aT_entry)
+
+    def _set_step1_values(self, temperatures, log_aT_values):
+        """Replace the Step 1 table, adding rows when there are more than 8."""
+        while len(self.temp_entries) < len(temperatures):
+            self._add_step1_row()
+        for i, (temp_entry, log_aT_entry) in enumerate(zip(self.temp_entries,
+                                                           self.log_aT_entries)):
+            temp_entry.delete(0, tk.END)
+            log_aT_entry.delete(0, tk.END)
+            if i < len(temperatures):
+                temp_entry.insert(0, '{0:g}'.format(temperatures[i]))
+                log_aT_entry.insert(0, '{0:.4f}'.format(log_aT_values[i]))
 
     # ── Step 2 & 3 ──────────────────────────────────────────────────────────
-    def create_step2_3_tab(self):
-        step2_3_frame = ttk.Frame(self.notebook, style='BG.TFrame')
-        self.notebook.add(step2_3_frame, text="  Step 2 & 3: WLF Estimation  ")
+    def create_step2_3_tab(self, step2_3_frame):
 
         # ── Left: Plot ──
         left_panel = tk.Frame(step2_3_frame, bg=BG)
@@ -275,24 +669,27 @@ class WLF_GUI(tk.Tk):
         plot_card = self._make_card(left_panel, padx=12, pady=12)
         plot_card.pack(fill=tk.BOTH, expand=True)
 
-        tk.Label(plot_card, text="WLF Estimation Plot",
+        header = tk.Frame(plot_card, bg=SURFACE)
+        header.pack(fill=tk.X, pady=(0, 8))
+        tk.Label(header, text="WLF Estimation Plot",
                  font=(FONT_FAMILY, 14, 'bold'), bg=SURFACE, fg=TEXT
-                 ).pack(anchor='w', pady=(0, 8))
-
-        self.figure, self.ax = self._setup_plot(figsize=(10, 6))
-        self.canvas = FigureCanvasTkAgg(self.figure, master=plot_card)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        # Sliders
-        slider_card = self._make_card(left_panel, padx=16, pady=12)
-        slider_card.pack(fill=tk.X, pady=(8, 0))
-
-        self.c1_slider = self._make_scale(slider_card, 'C1', 0, 200,
-                                          resolution=0.5,
-                                          command=self.update_plot)
-        self.c2_slider = self._make_scale(slider_card, 'C2', 0, 200,
-                                          resolution=0.5,
-                                          command=self.update_plot)
+                 ).pack(side=tk.LEFT)
+        self.fit_view_var = tk.StringVar(value=FIT_VIEWS[0])
+        view_box = ttk.Combobox(header, textvariable=self.fit_view_var,
+                                values=FIT_VIEWS, state='readonly', width=11,
+                                font=(FONT_FAMILY, 11))
+        view_box.pack(side=tk.RIGHT)
+        view_box.bind('<<ComboboxSelected>>', lambda event: self._replot_tab('step2_3'))
+        tk.Label(header, text="View:", font=(FONT_FAMILY, 11), bg=SURFACE, fg=TEXT
+                 ).pack(side=tk.RIGHT, padx=(0, 6))
+
+        self._plot_cards['step2_3'] = plot_card
+        self._create_step2_3_plots()
+
+        # Sliders, one per parameter of the selected model
+        self.slider_card = self._make_card(left_panel, padx=16, pady=12)
+        self.slider_card.pack(fill=tk.X, pady=(8, 0))
+        self.param_sliders = []
 
         # ── Right: Controls ──
         right_panel = tk.Frame(step2_3_frame, bg=BG)
@@ -301,10 +698,23 @@ class WLF_GUI(tk.Tk):
         ctrl_card = self._make_card(right_panel, padx=16, pady=16)
         ctrl_card.pack(fill=tk.X)
 
-        tk.Label(ctrl_card, text="WLF C1, C2 Estimation",
+        tk.Label(ctrl_card, text="Shift Model Estimation",
                  font=(FONT_FAMILY, 14, 'bold'), bg=SURFACE, fg=TEXT
                  ).pack(anchor='w', pady=(0, 12))
 
+        # Shift model
+        model_frame = tk.Frame(ctrl_card, bg=SURFACE)
+        model_frame.pack(fill=tk.X, pady=4)
+        tk.Label(model_frame, text="Model:",
+                 font=(FONT_FAMILY, 11), bg=SURFACE, fg=TEXT
+                 ).pack(side=tk.LEFT)
+        self.model_var = tk.StringVar(value='WLF')
+        self.model_box = ttk.Combobox(model_frame, textvariable=self.model_var,
+                                      values=tuple(wlf_core.SHIFT_MODELS), state='readonly',
+                                      width=14, font=(FONT_FAMILY, 11))
+        self.model_box.pack(side=tk.LEFT, padx=(8, 0))
+        self.model_box.bind('<<ComboboxSelected>>', self._on_model_selected)
+
         # Reference temperature
         ref_frame = tk.Frame(ctrl_card, bg=SURFACE)
         ref_frame.pack(fill=tk.X, pady=4)
@@ -314,56 +724,75 @@ class WLF_GUI(tk.Tk):
         self.reference_temp_entry = self._make_entry(ref_frame, width=8, default='40')
         self.reference_temp_entry.pack(side=tk.LEFT, padx=(8, 0))
 
+        # Joint T_r search: 0 keeps T_r fixed
+        span_frame = tk.Frame(ctrl_card, bg=SURFACE)
+        span_frame.pack(fill=tk.X, pady=4)
+        tk.Label(span_frame, text="Search T\u1d63 \u00b1 (\u00b0C):",
+                 font=(FONT_FAMILY, 11), bg=SURFACE, fg=TEXT
+                 ).pack(side=tk.LEFT)
+        self.reference_span_entry = self._make_entry(span_frame, width=6, default='0')
+        self.reference_span_entry.pack(side=tk.LEFT, padx=(8, 0))
+
+        # Fitting backend
+        method_frame = tk.Frame(ctrl_card, bg=SURFACE)
+        method_frame.pack(fill=tk.X, pady=4)
+        tk.Label(method_frame, text="Fit Method:",
+                 font=(FONT_FAMILY, 11), bg=SURFACE, fg=TEXT
+                 ).pack(side=tk.LEFT)
+        self.fit_method_var = tk.StringVar(value='curve_fit')
+        ttk.Combobox(method_frame, textvariable=self.fit_method_var,
+                     values=wlf_core.FIT_METHODS, state='readonly', width=10,
+                     font=(FONT_FAMILY, 11)).pack(side=tk.LEFT, padx=(8, 0))
+
         # Buttons
         btn_frame = tk.Frame(ctrl_card, bg=SURFACE)
         btn_frame.pack(fill=tk.X, pady=(12, 8))
-        self._make_button(btn_frame, "Fit Data", self.fit_data,
-                          'Primary.TButton').pack(side=tk.LEFT, padx=(0, 6))
+        self.fit_button = self._make_button(btn_frame, "Fit Data", self.fit_data,
+                                            'Primary.TButton')
+        self.fit_button.pack(side=tk.LEFT, padx=(0, 6))
         self._make_button(btn_frame, "Save to Excel", self.save_to_excel,
-                          'Success.TButton').pack(side=tk.LEFT)
+                          'Success.TButton').pack(side=tk.LEFT, padx=(0, 6))
+        self.cancel_fit_button = self._make_button(btn_frame, "Cancel",
+                                                   self.cancel_fit,
+                                                   'Danger.TButton')
+        self.cancel_fit_button.pack(side=tk.LEFT)
+        self.cancel_fit_button.state(['disabled'])
+
+        self.fit_progress = ttk.Progressbar(ctrl_card, orient='horizontal',
+                                            mode='determinate', maximum=100)
+        self.fit_progress.pack(fill=tk.X, pady=(4, 0))
 
         # Result label
-        self.result_label = tk.Label(ctrl_card, text="C1: \u2014   C2: \u2014",
+        self.result_label = tk.Label(ctrl_card, text="",
                                      font=(FONT_FAMILY, 14, 'bold'),
                                      bg=SURFACE, fg=ACCENT)
-        self.result_label.pack(anchor='w', pady=(8, 12))
+        self.result_label.pack(anchor='w', pady=(8, 0))
+        self.region_label = tk.Label(ctrl_card, text="", font=(FONT_FAMILY, 10),
+                                     bg=SURFACE, fg=TEXT_SEC, justify=tk.LEFT)
+        self.region_label.pack(anchor='w', pady=(2, 12))
 
         # Treeview
         tree_card = self._make_card(right_panel, padx=8, pady=8)
         tree_card.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
 
-        self.tree = ttk.Treeview(tree_card,
-                                 columns=('Select', 'C1', 'C2', 'SSE'),
-                                 show='headings', height=15)
-        self.tree.heading('Select', text='Sel')
-        self.tree.heading('C1', text='C1',
-                          command=lambda: self.sort_tree_column('C1', False))
-        self.tree.heading('C2', text='C2',
-                          command=lambda: self.sort_tree_column('C2', False))
-        self.tree.heading('SSE', text='SSE',
-                          command=lambda: self.sort_tree_column('SSE', False))
-        self.tree.column('Select', width=50, anchor='center')
-        self.tree.column('C1', width=80, anchor='center')
-        self.tree.column('C2', width=80, anchor='center')
-        self.tree.column('SSE', width=90, anchor='center')
-
-        scrollbar = ttk.Scrollbar(tree_card, orient='vertical',
-                                  command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.tree.bind('<ButtonRelease-1>', self.on_row_click)
+        self.result_table = ResultTable(tree_card, on_toggle=self.update_checked_plots)
+        self._build_param_sliders()
 
         # SSE note
         tk.Label(right_panel, text="SSE = \u03a3(log(a\u209c) \u2212 fit)²",
                  font=(FONT_FAMILY, 10), bg=BG, fg=TEXT_SEC
                  ).pack(anchor='w', pady=(6, 0), padx=8)
 
+    def _create_step2_3_plots(self):
+        self.figure, self.ax = self._setup_plot(figsize=(10, 6))
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self._plot_cards['step2_3'])
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect('draw_event', self._on_fit_canvas_draw)
+        self._landscape_drawn = None
+        self._landscape_marker = None
+
     # ── Step 4 ───────────────────────────────────────────────────────────────
-    def create_step4_tab(self):
-        step4_frame = ttk.Frame(self.notebook, style='BG.TFrame')
-        self.notebook.add(step4_frame, text="  Step 4: Estimate a\u209c  ")
+    def create_step4_tab(self, step4_frame):
 
         wrapper = tk.Frame(step4_frame, bg=BG)
         wrapper.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
@@ -396,15 +825,17 @@ class WLF_GUI(tk.Tk):
         plot_card = self._make_card(wrapper, padx=12, pady=12)
         plot_card.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
+        self._plot_cards['step4'] = plot_card
+        self._create_step4_plots()
+
+    def _create_step4_plots(self):
         self.estimate_figure, self.estimate_ax = self._setup_plot(figsize=(10, 6))
         self.estimate_canvas = FigureCanvasTkAgg(self.estimate_figure,
-                                                  master=plot_card)
+                                                  master=self._plot_cards['step4'])
         self.estimate_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     # ── Step 5 ───────────────────────────────────────────────────────────────
-    def create_step5_tab(self):
-        step5_frame = ttk.Frame(self.notebook, style='BG.TFrame')
-        self.notebook.add(step5_frame, text="  Step 5: Shift Data  ")
+    def create_step5_tab(self, step5_frame):
 
         wrapper = tk.Frame(step5_frame, bg=BG)
         wrapper.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
@@ -423,34 +854,63 @@ class WLF_GUI(tk.Tk):
         button_configs = [
             ("Load Data",          self.load_data,                 'Primary.TButton'),
             ("Shift Data",         self.apply_tts,                 'Success.TButton'),
+            ("Auto Shift",         self.auto_shift_data,           'Success.TButton'),
             ("Retrieve a\u209c",   self.retrieve_aT_values,        'Secondary.TButton'),
             ("Save Shifted Data",  self.save_shifted_data_to_excel, 'Secondary.TButton'),
             ("Send to Step 6",     self.send_to_step6,             'Danger.TButton'),
             ("Output TTS",         self.output_tts,                'Secondary.TButton'),
             ("Smooth Curve",       self.smooth_curve,              'Secondary.TButton'),
+            ("Undo Shift",         self.undo_shift,                'Secondary.TButton'),
+            ("Redo Shift",         self.redo_shift,                'Secondary.TButton'),
         ]
 
         for text, command, bstyle in button_configs:
             self._make_button(btn_row, text, command, bstyle
                               ).pack(side=tk.LEFT, padx=(0, 6), pady=2)
 
+        # Prony series (generalized Maxwell) fit of the master curve
+        prony_row = tk.Frame(btn_card, bg=SURFACE)
+        prony_row.pack(fill=tk.X, pady=(8, 0))
+        tk.Label(prony_row, text="Prony Terms:", font=(FONT_FAMILY, 10),
+                 bg=SURFACE, fg=TEXT_SEC).pack(side=tk.LEFT)
+        self.prony_terms_entry = self._make_entry(prony_row, width=6, default='30')
+        self.prony_terms_entry.pack(side=tk.LEFT, padx=(4, 12))
+        self._make_button(prony_row, "Fit Prony", self.fit_prony,
+                          'Success.TButton').pack(side=tk.LEFT, padx=(0, 6))
+        self._make_button(prony_row, "Save Prony", self.save_prony,
+                          'Secondary.TButton').pack(side=tk.LEFT, padx=(0, 6))
+
+        # Global master-curve smoothing used by "Smooth Curve"
+        tk.Label(prony_row, text="Smoothing:", font=(FONT_FAMILY, 10),
+                 bg=SURFACE, fg=TEXT_SEC).pack(side=tk.LEFT, padx=(12, 0))
+        self.smooth_method_var = tk.StringVar(value='spline')
+        ttk.Combobox(prony_row, textvariable=self.smooth_method_var,
+                     values=wlf_master.SMOOTH_METHODS, state='readonly', width=8,
+                     font=(FONT_FAMILY, 10)).pack(side=tk.LEFT, padx=(4, 0))
+
         # Plot card
         plot_card = self._make_card(wrapper, padx=12, pady=12)
         plot_card.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
+        self._plot_cards['step5'] = plot_card
+        self._create_step5_plots()
+
+    def _create_step5_plots(self):
         self.shifted_figure, self.shifted_ax = self._setup_plot(figsize=(10, 6))
         self.shifted_canvas = FigureCanvasTkAgg(self.shifted_figure,
-                                                 master=plot_card)
+                                                 master=self._plot_cards['step5'])
         self.shifted_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         self.shifted_canvas.mpl_connect('button_press_event', self.on_press)
         self.shifted_canvas.mpl_connect('motion_notify_event', self.on_motion)
         self.shifted_canvas.mpl_connect('button_release_event', self.on_release)
+        self.shifted_canvas.mpl_connect('draw_event', self._on_shifted_canvas_draw)
+        self.shifted_canvas.mpl_connect('key_press_event', self.on_key)
+        self._shifted_lines = {}
+        self._drag_index = None
 
     # ── Step 6 ───────────────────────────────────────────────────────────────
-    def create_step6_tab(self):
-        step6_frame = ttk.Frame(self.notebook, style='BG.TFrame')
-        self.notebook.add(step6_frame, text="  Step 6: Modify Master Curve  ")
+    def create_step6_tab(self, step6_frame):
 
         # ── Left: Master curve plot ──
         left_panel = tk.Frame(step6_frame, bg=BG)
@@ -464,11 +924,7 @@ class WLF_GUI(tk.Tk):
                  font=(FONT_FAMILY, 14, 'bold'), bg=SURFACE, fg=TEXT
                  ).pack(anchor='w', pady=(0, 8))
 
-        self.master_curve_figure, self.master_curve_ax = self._setup_plot(
-            figsize=(10, 6))
-        self.master_curve_canvas = FigureCanvasTkAgg(
-            self.master_curve_figure, master=plot_card)
-        self.master_curve_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._plot_cards['step6'] = plot_card
 
         # ── Right: Controls ──
         right_panel = tk.Frame(step6_frame, bg=BG, width=320)
@@ -499,9 +955,52 @@ class WLF_GUI(tk.Tk):
         self.bt_slider = self._make_scale(slider_card, 'b\u209c', 0.1, 10,
                                           resolution=0.1,
                                           command=self.update_master_curve)
+        # Every drag (or key press) of a slider is its own undo step
+        for slider in (self.at_slider, self.bt_slider):
+            slider.bind('<ButtonRelease-1>', self._rebase_master)
+            slider.bind('<KeyRelease>', self._rebase_master)
         self.sensitivity_slider = self._make_scale(slider_card, 'Sensitivity',
                                                    1, 10,
                                                    command=self.update_sensitivity)
+        undo_row = tk.Frame(slider_card, bg=SURFACE)
+        undo_row.pack(fill=tk.X, pady=(8, 0))
+        self._make_button(undo_row, "Undo", self.undo_shift,
+                          'Secondary.TButton').pack(side=tk.LEFT, padx=(0, 6))
+        self._make_button(undo_row, "Redo", self.redo_shift,
+                          'Secondary.TButton').pack(side=tk.LEFT)
+
+        # b_T from density and the joint a_T/b_T fit
+        shift_card = self._make_card(right_panel, padx=12, pady=12)
+        shift_card.pack(fill=tk.X, pady=(8, 0))
+
+        tk.Label(shift_card, text="a\u209c / b\u209c Estimation",
+                 font=(FONT_FAMILY, 11, 'bold'), bg=SURFACE, fg=TEXT
+                 ).pack(anchor='w', pady=(0, 8))
+
+        density_row = tk.Frame(shift_card, bg=SURFACE)
+        density_row.pack(fill=tk.X, pady=2)
+        tk.Label(density_row, text="Density \u03c1:", font=(FONT_FAMILY, 10),
+                 bg=SURFACE, fg=TEXT_SEC).pack(side=tk.LEFT)
+        self.density_entry = self._make_entry(density_row, width=18, default='')
+        self.density_entry.pack(side=tk.LEFT, padx=(4, 0), fill=tk.X, expand=True)
+        tk.Label(shift_card, text="one value per isotherm, in table order",
+                 font=(FONT_FAMILY, 9), bg=SURFACE, fg=TEXT_SEC).pack(anchor='w')
+
+        self.fit_bT_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(shift_card, text="Fit b\u209c", variable=self.fit_bT_var,
+                       font=(FONT_FAMILY, 10), bg=SURFACE, fg=TEXT,
+                       activebackground=SURFACE, highlightthickness=0
+                       ).pack(anchor='w', pady=(4, 0))
+
+        fit_row = tk.Frame(shift_card, bg=SURFACE)
+        fit_row.pack(fill=tk.X, pady=(6, 0))
+        self._make_button(fit_row, "Density b\u209c", self.apply_density_bT,
+                          'Secondary.TButton').pack(side=tk.LEFT, padx=(0, 6))
+        self._make_button(fit_row, "Fit a\u209c/b\u209c", self.fit_step6_shifts,
+                          'Primary.TButton').pack(side=tk.LEFT)
+        self.shift_fit_label = tk.Label(shift_card, text="", font=(FONT_FAMILY, 9),
+                                        bg=SURFACE, fg=TEXT_SEC)
+        self.shift_fit_label.pack(anchor='w', pady=(4, 0))
 
         # Axis range
         axis_card = self._make_card(right_panel, padx=12, pady=12)
@@ -545,9 +1044,21 @@ class WLF_GUI(tk.Tk):
                  font=(FONT_FAMILY, 11, 'bold'), bg=SURFACE, fg=TEXT
                  ).pack(anchor='w', pady=(0, 4))
 
+        self._plot_cards['step6_at'] = at_card
+        self._create_step6_plots()
+
+    def _create_step6_plots(self):
+        self.master_curve_figure, self.master_curve_ax = self._setup_plot(
+            figsize=(10, 6))
+        self.master_curve_canvas = FigureCanvasTkAgg(
+            self.master_curve_figure, master=self._plot_cards['step6'])
+        self.master_curve_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.master_curve_canvas.mpl_connect('draw_event',
+                                             self._on_master_canvas_draw)
+
         self.at_plot_figure, self.at_plot_ax = self._setup_plot(figsize=(5, 3))
         self.at_plot_canvas = FigureCanvasTkAgg(self.at_plot_figure,
-                                                 master=at_card)
+                                                 master=self._plot_cards['step6_at'])
         self.at_plot_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     # ═════════════════════════════════════════════════════════════════════════
@@ -570,6 +1081,7 @@ class WLF_GUI(tk.Tk):
 
         self.at_slider.set(1)
         self.bt_slider.set(1)
+        self._highlight_master_temp()
         self.update_master_curve()
 
     def on_temperature_selected(self, event):
@@ -581,27 +1093,39 @@ class WLF_GUI(tk.Tk):
         self.sensitivity = self.sensitivity_slider.get()
 
     def send_to_step6(self):
-        if not hasattr(self, 'shifted_data') or not hasattr(self, 'shifted_freqs'):
+        if self.shift_history is None:
             messagebox.showerror("Error", "Please shift data in Step 5 first.")
             return
 
-        self.loaded_shifted_data = self.shifted_data
-        self.loaded_shifted_freqs = self.shifted_freqs
+        self._ensure_tab('step6', replot=False)
+        # Step 6 edits the same shift history, so they show up in Step 5 and
+        # in every export
+        self._master_history = self.shift_history
+        self._master_source = self._shift_source
+        self._rebase_master()
 
-        for temp in self.loaded_shifted_data.columns:
+        self.temp_table.delete(*self.temp_table.get_children())
+        for temp in self._master_source.columns:
             self.temp_table.insert("", "end", values=(f'{temp}\u00b0C'))
 
         self.plot_master_curve()
 
     def plot_master_curve(self):
-        if not hasattr(self, 'loaded_shifted_data') or not hasattr(self, 'loaded_shifted_freqs'):
+        if self._master_history is None:
             return
+        self._ensure_tab('step6', replot=False)
 
+        # One artist per temperature, kept (with its data at the current
+        # shift state) so that slider moves only touch the selected series
         self.master_curve_ax.clear()
-        for temp in self.loaded_shifted_data.keys():
-            freqs = self.loaded_shifted_freqs[temp]
-            data = self.loaded_shifted_data[temp]
-            self.master_curve_ax.plot(freqs, data, label=f'{temp}\u00b0C')
+        self._master_lines = {}
+        self._at_line = self._bt_line = None
+        state = self._master_history.current
+        for i, temp in enumerate(self._master_source.columns):
+            freqs, data = wlf_shift.shifted_column(self._master_source, state, i)
+            line, = self.master_curve_ax.plot(freqs, data, label=f'{temp}\u00b0C')
+            self._master_lines[temp] = (line, freqs, data)
+        self._step6_state = state
 
         self._style_plot(self.master_curve_ax,
                          xlabel='Shifted Frequency (Hz)',
@@ -610,96 +1134,351 @@ class WLF_GUI(tk.Tk):
         self.master_curve_ax.set_xscale('log')
         self.master_curve_ax.set_yscale('log')
         self.update_axis_range()
-        self.master_curve_canvas.draw()
 
-    def update_master_curve(self, event=None):
-        if not hasattr(self, 'loaded_shifted_data') or not hasattr(self, 'loaded_shifted_freqs'):
-            return
+    def _selected_master_line(self):
+        selected_temp = getattr(self, 'selected_temp', None)
+        for temp, entry in self._master_lines.items():
+            if float(temp) == selected_temp:
+                return entry
+        return None
 
-        aT = self.at_slider.get()
-        bT = self.bt_slider.get()
+    def _highlight_master_temp(self):
+        """Recolour all series for a new selection and redraw once.
 
-        self.master_curve_ax.clear()
-        for temp in self.loaded_shifted_data.keys():
-            if float(temp) == self.selected_temp:
-                freqs = self.loaded_shifted_freqs[temp] * aT
-                data = self.loaded_shifted_data[temp] * bT
-                self.master_curve_ax.plot(freqs, data,
-                                          label=f'{temp}\u00b0C',
-                                          color=ACCENT, linewidth=2)
-            else:
-                freqs = self.loaded_shifted_freqs[temp]
-                data = self.loaded_shifted_data[temp]
-                self.master_curve_ax.plot(freqs, data,
-                                          label=f'{temp}\u00b0C',
-                                          color='#C0C0C0', alpha=0.5)
+        The series are re-derived from the current shift state, which also
+        becomes the base the a_T/b_T sliders are relative to.
+        """
+        if not self._master_lines:
+            return
+        state = self._master_history.current
+        for i, (temp, (line, _, _)) in enumerate(list(self._master_lines.items())):
+            freqs, data = wlf_shift.shifted_column(self._master_source, state, i)
+            self._master_lines[temp] = (line, freqs, data)
+        self._rebase_master()
+        self._step6_state = state
+
+        selected = self._selected_master_line()
+        for line, freqs, data in self._master_lines.values():
+            is_selected = selected is not None and line is selected[0]
+            line.set_data(freqs, data)
+            line.set_color(ACCENT if is_selected else '#C0C0C0')
+            line.set_alpha(None if is_selected else 0.5)
+            line.set_linewidth(2 if is_selected else 1.5)
+            # The selected series is left out of the cached background
+            line.set_animated(is_selected)
 
         self._style_plot(self.master_curve_ax,
                          xlabel='Shifted Frequency (Hz)',
                          ylabel='Shifted Data (MPa)',
                          title='Adjusted Master Curve')
-        self.master_curve_ax.set_xscale('log')
-        self.master_curve_ax.set_yscale('log')
-        self.update_axis_range()
         self.master_curve_canvas.draw()
 
+    def _on_master_canvas_draw(self, event):
+        self._master_background = self.master_curve_canvas.copy_from_bbox(
+            self.master_curve_figure.bbox)
+        selected = self._selected_master_line()
+        if selected is not None and selected[0].get_animated():
+            self.master_curve_ax.draw_artist(selected[0])
+
+    def _refresh_master_curve(self):
+        """Redraw Step 6 from the current shift state, sliders back at 1."""
+        if getattr(self, 'selected_temp', None) is None:
+            self.plot_master_curve()
+            self.update_at_plot()
+            return
+        self.at_slider.set(1)
+        self.bt_slider.set(1)
+        self._highlight_master_temp()
+        self.update_master_curve()
+
+    def _rebase_master(self, event=None):
+        """Make the current shift state and slider positions the base of the
+        next a_T/b_T slider move, which then starts a new undo step."""
+        if self._master_history is not None:
+            self._master_base = self._master_history.current
+        self._master_factors = (self.at_slider.get(), self.bt_slider.get())
+        self._master_editing = False
+
+    def update_master_curve(self, event=None):
+        if self._master_history is None:
+            return
+
+        selected = self._selected_master_line()
+        if selected is None:
+            return
+
+        aT = self.at_slider.get()
+        bT = self.bt_slider.get()
+
+        line, freqs, data = selected
+        line.set_data(freqs * aT, data * bT)
+        if line.get_animated() and self._master_background is not None:
+            self.master_curve_canvas.restore_region(self._master_background)
+            self.master_curve_ax.draw_artist(line)
+            self.master_curve_canvas.blit(self.master_curve_figure.bbox)
+        else:
+            self.master_curve_canvas.draw_idle()
+
+        # Stored relative to the base state and slider positions; one slider
+        # drag replaces its own previous value, so it is undone in one step
+        i = [entry[0] for entry in self._master_lines.values()].index(line)
+        aT_base, bT_base = self._master_factors
+        log_aT = self._master_base.log_aT.copy()
+        log_bT = self._master_base.log_bT.copy()
+        log_aT[i] += np.log10(aT) - np.log10(aT_base)
+        log_bT[i] += np.log10(bT) - np.log10(bT_base)
+        before = self._master_history.current
+        state = self._master_history.push(log_aT, log_bT, replace=self._master_editing)
+        if state is not before:
+            self._master_editing = True
+            self._step6_state = state
+            self._shifts_changed()
+
         self.update_at_plot()
 
     def update_at_plot(self):
-        if not hasattr(self, 'loaded_shifted_data') or not hasattr(self, 'loaded_shifted_freqs'):
+        if self._master_history is None:
             return
 
-        aT = self.at_slider.get()
+        # a_T and b_T of every isotherm straight from the shift state; the
+        # modulus is multiplied by 10**log_bT, i.e. divided by b_T
+        state = self._master_history.current
+        temperatures = np.array([float(temp) for temp in self._master_source.columns])
+        order = np.argsort(temperatures, kind='stable')
+        temperatures = temperatures[order]
+        at_values = 10 ** state.log_aT[order]
+        bt_values = 10 ** -state.log_bT[order]
+
+        if self._at_line is not None and self._at_line.axes is self.at_plot_ax:
+            self._at_line.set_data(temperatures, at_values)
+            self._bt_line.set_data(temperatures, bt_values)
+            self.at_plot_ax.relim()
+            self.at_plot_ax.autoscale_view()
+            self.at_plot_canvas.draw_idle()
+            return
 
         self.at_plot_ax.clear()
-        temperatures = sorted([float(temp) for temp in self.loaded_shifted_data.keys()])
-        at_values = [aT if float(temp) == self.selected_temp else 1 for temp in temperatures]
-
-        self.at_plot_ax.plot(temperatures, at_values, marker='o', linestyle='-',
-                             color=ACCENT, label='Adjusted a\u209c')
+        self._at_line, = self.at_plot_ax.plot(temperatures, at_values, marker='o', linestyle='-',
+                                              color=ACCENT, label='a\u209c')
+        self._bt_line, = self.at_plot_ax.plot(temperatures, bt_values, marker='s', linestyle='--',
+                                              color=SUCCESS, label='b\u209c')
+        self.at_plot_ax.set_yscale('log')
         self._style_plot(self.at_plot_ax,
                          xlabel='Temperature (\u00b0C)',
-                         ylabel='a\u209c',
+                         ylabel='a\u209c, b\u209c',
                          title='T vs a\u209c')
         self.at_plot_canvas.draw()
 
+    def _density_values(self):
+        """Densities typed in Step 6 (comma separated), or None if empty."""
+        text = self.density_entry.get().replace(';', ',')
+        values = [float(value) for value in text.split(',') if value.strip()]
+        return values or None
+
+    def _step6_reference_temp(self):
+        """Temperature (\u00b0C) at which the current log a_T crosses zero."""
+        state = self._master_history.current
+        temperatures = np.array([float(temp) for temp in self._master_source.columns])
+        order = np.argsort(state.log_aT, kind='stable')
+        return float(np.interp(0.0, state.log_aT[order], temperatures[order]))
+
+    def _density_log_bT(self, density):
+        temperatures = [float(temp) for temp in self._master_source.columns]
+        bT = wlf_shift.density_bT(temperatures, density, self._step6_reference_temp())
+        return -np.log10(bT)
+
+    def apply_density_bT(self):
+        if self._master_history is None:
+            messagebox.showerror("Error", "Please send shifted data to Step 6 first.")
+            return
+        try:
+            density = self._density_values()
+            if density is None:
+                raise ValueError("Enter one density per isotherm.")
+            log_bT = self._density_log_bT(density)
+        except ValueError as e:
+            messagebox.showerror("Error", "Density b\u209c failed: {0}".format(e))
+            return
+
+        self._master_history.push(log_bT=log_bT)
+        self._shifts_changed()
+        self._refresh_master_curve()
+
+    def fit_step6_shifts(self):
+        if self._master_history is None:
+            messagebox.showerror("Error", "Please send shifted data to Step 6 first.")
+            return
+
+        state = self._master_history.current
+        try:
+            density = self._density_values()
+            # Densities fix b_T; otherwise it is fitted along with a_T
+            if density is not None:
+                log_bT, fit_bT = self._density_log_bT(density), False
+            else:
+                log_bT, fit_bT = state.log_bT, self.fit_bT_var.get()
+            fit = wlf_shift.fit_shifts(self._master_source, state.log_aT, log_bT,
+                                       fit_bT=fit_bT)
+        except ValueError as e:
+            messagebox.showerror("Error", "Shift fit failed: {0}".format(e))
+            return
+
+        self._master_history.push(fit.log_aT, fit.log_bT)
+        self._shifts_changed()
+        self._refresh_master_curve()
+        self.shift_fit_label.config(
+            text="RMS {0:.4f} log\u2081\u2080 units, {1} iterations".format(fit.rms, fit.n_iter))
+
+    # ── Shift state ──────────────────────────────────────────────────────────
+    @property
+    def shifted_data(self):
+        views = self._current_shift_views()
+        return None if views is None else views[0]
+
+    @property
+    def shifted_freqs(self):
+        views = self._current_shift_views()
+        return None if views is None else views[1]
+
+    def _current_shift_views(self):
+        """Shifted DataFrames for the current shift state, built on first use."""
+        if self.shift_history is None:
+            return None
+        state = self.shift_history.current
+        if self._shift_views is None or self._shift_views[0] is not state:
+            self._shift_views = (state, wlf_shift.shift_views(self._shift_source, state))
+        return self._shift_views[1]
+
+    def _start_shifts(self, log_aT):
+        """Shift the loaded table by ``log_aT`` (column order), b_T = 1."""
+        log_bT = np.zeros(len(log_aT))
+        if self.shift_history is not None and self._shift_source is self.data:
+            # Re-shifting the same table keeps the earlier edits undoable
+            self.shift_history.push(log_aT, log_bT)
+        else:
+            self.shift_history = wlf_shift.ShiftHistory(log_aT, log_bT)
+            self._shift_source = self.data
+            self._shift_selected = None
+        self._shifts_changed()
+        self.plot_shifted_data()
+
+    def _shift_state_changed(self):
+        """Redraw the visible shift plot after an undo or redo; the other
+        tab catches up when it is shown."""
+        self._shifts_changed()
+        key = self._current_tab()
+        if key == 'step5':
+            self.plot_shifted_data()
+        elif key == 'step6' and self._master_history is self.shift_history \
+                and self._master_lines:
+            self._refresh_master_curve()
+
+    def undo_shift(self, event=None):
+        if self.shift_history is not None and self.shift_history.can_undo:
+            self.shift_history.undo()
+            self._shift_state_changed()
+
+    def redo_shift(self, event=None):
+        if self.shift_history is not None and self.shift_history.can_redo:
+            self.shift_history.redo()
+            self._shift_state_changed()
+
+    # ── Step 5 drag shifting ─────────────────────────────────────────────────
+    def _nearest_shifted_line(self, x, y):
+        """Shifted-data line with the point nearest to display point (x, y).
+
+        All series points are indexed once in a KD-tree over display
+        coordinates; the tree is rebuilt only when the plotted lines, the
+        axis limits or the canvas size change.
+        """
+        ax = self.shifted_ax
+        key = (ax.get_xlim(), ax.get_ylim(), tuple(ax.bbox.bounds))
+        if self._drag_index is None or self._drag_index_key != key:
+            from scipy.spatial import cKDTree
+            lines = list(self._shifted_lines)
+            points, owners = [], []
+            for i, line in enumerate(lines):
+                xy = ax.transData.transform(np.column_stack(
+                    (np.asarray(line.get_xdata(), dtype=float),
+                     np.asarray(line.get_ydata(), dtype=float))))
+                ok = np.isfinite(xy).all(axis=1)
+                points.append(xy[ok])
+                owners.append(np.full(np.count_nonzero(ok), i))
+            points = np.concatenate(points) if points else np.empty((0, 2))
+            if not len(points):
+                return None
+            self._drag_index = (cKDTree(points), lines, np.concatenate(owners))
+            self._drag_index_key = key
+        tree, lines, owners = self._drag_index
+        _, i = tree.query((x, y))
+        return lines[owners[i]]
+
+    def _on_shifted_canvas_draw(self, event):
+        if self.dragging:
+            self._drag_background = self.shifted_canvas.copy_from_bbox(self.shifted_ax.bbox)
+
     def on_press(self, event):
-        if event.inaxes is not None:
-            self.dragging = True
-            self.drag_start_y = event.ydata
-            self.drag_start_data = self.shifted_data.copy()
-
-            self.selected_line = None
-            min_distance = float('inf')
-            for line in self.shifted_ax.get_lines():
-                xdata, ydata = line.get_data()
-                distance = np.min(np.abs(ydata - event.ydata))
-                if distance < min_distance:
-                    min_distance = distance
-                    self.selected_line = line
+        if event.inaxes is not self.shifted_ax or not self._shifted_lines:
+            return
+        line = self._nearest_shifted_line(event.x, event.y)
+        if line is None:
+            return
+        self.dragging = True
+        self.selected_line = line
+        self.drag_start_y = event.ydata
+        # Only the dragged series is kept as the drag's starting point
+        self.drag_column = self._shifted_lines[line]
+        self._shift_selected = self.drag_column
+        self.drag_start_values = wlf_shift.shifted_column(
+            self._shift_source, self.shift_history.current, self.drag_column)[1]
+        self.drag_log_factor = 0.0
+        # One full draw without the line caches the background for blitting
+        line.set_animated(True)
+        self.shifted_canvas.draw()
+        self.shifted_ax.draw_artist(line)
+        self.shifted_canvas.blit(self.shifted_ax.bbox)
 
     def on_motion(self, event):
-        if self.dragging and event.inaxes is not None and self.selected_line is not None:
-            dy = event.ydata - self.drag_start_y
-            label = self.selected_line.get_label().replace('\u00b0C', '').strip()
-            label = float(label)
-            shift_factor = 10 ** (dy / 100)
-            self.shifted_data[label] = self.drag_start_data[label] * shift_factor
-            self.plot_shifted_data()
+        if not self.dragging or event.inaxes is not self.shifted_ax or self.selected_line is None:
+            return
+        dy = event.ydata - self.drag_start_y
+        self.drag_log_factor = dy / 100
+        self.selected_line.set_ydata(self.drag_start_values * 10 ** self.drag_log_factor)
+        self.shifted_canvas.restore_region(self._drag_background)
+        self.shifted_ax.draw_artist(self.selected_line)
+        self.shifted_canvas.blit(self.shifted_ax.bbox)
 
     def on_release(self, event):
+        line = self.selected_line
         self.dragging = False
         self.selected_line = None
+        self._drag_background = None
+        if line is None:
+            return
+        line.set_animated(False)
+        if self.drag_log_factor:
+            # The whole drag is one b_T edit of the dragged isotherm
+            self._step5_state = self.shift_history.shift(
+                self.drag_column, d_log_bT=self.drag_log_factor)
+            self._drag_index = None
+            self._shifts_changed()
+        self.drag_start_values = None
+        self.shifted_canvas.draw_idle()
 
     def plot_shifted_data(self):
         if self.shifted_data is None or self.shifted_freqs is None:
             return
+        self._ensure_tab('step5', replot=False)
 
         self.shifted_ax.clear()
-        for temp in self.shifted_data.columns:
-            self.shifted_ax.plot(self.shifted_freqs[temp],
-                                self.shifted_data[temp],
-                                label='{0}\u00b0C'.format(temp))
+        self._shifted_lines = {}
+        self._drag_index = None
+        self._step5_state = self.shift_history.current
+        for i, temp in enumerate(self.shifted_data.columns):
+            line, = self.shifted_ax.plot(self.shifted_freqs[temp],
+                                         self.shifted_data[temp],
+                                         label='{0}\u00b0C'.format(temp))
+            self._shifted_lines[line] = i
 
         self._style_plot(self.shifted_ax,
                          xlabel='Shifted Frequency (Hz)',
@@ -715,41 +1494,38 @@ class WLF_GUI(tk.Tk):
             messagebox.showerror("Error", "No estimated a\u209c values to save. Please estimate a\u209c values in Step 4 first.")
             return
 
-        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel files', '*.xlsx'), ('All files', '*.*')])
+        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=wlf_io.TABLE_FILETYPES)
         if file_path:
-            self.estimated_aT_values.to_excel(file_path, index=False)
+            wlf_io.write_table(file_path, self.estimated_aT_values)
             messagebox.showinfo("Save to Excel", "Estimated a\u209c values saved successfully!")
 
     def save_to_excel(self):
-        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel files', '*.xlsx'), ('All files', '*.*')])
+        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=wlf_io.TABLE_FILETYPES)
         if file_path:
-            selected_data = []
-            for item in self.tree.get_children():
-                if self.tree.set(item, 'Select') == '1':
-                    values = self.tree.item(item, 'values')
-                    selected_data.append(values)
+            selected_data = self.result_table.selected()
 
-            if not selected_data:
+            if not len(selected_data):
                 messagebox.showerror("Save to Excel", "No data selected.")
                 return
 
             T_r = float(self.reference_temp_entry.get()) + 273.15
             T_fit = np.arange(-80, 81, 5) + 273.15
 
-            with pd.ExcelWriter(file_path) as writer:
-                for values in selected_data:
-                    C1, C2 = float(values[1]), float(values[2])
-                    log_aT_fit = self.WLF(T_fit, C1, C2, T_r)
-                    aT_fit = 10 ** log_aT_fit
-                    fit_df = pd.DataFrame({
-                        'Temperature (\u00b0C)': T_fit - 273.15,
-                        'log(a_T)': log_aT_fit,
-                        'a_T': aT_fit
-                    })
-                    sheet_name = 'C1_{0}_C2_{1}'.format(C1, C2)
-                    # Excel sheet names max 31 chars, no special chars
-                    sheet_name = sheet_name[:31]
-                    fit_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            model = self._model()
+            params = [tuple(row[name] for name in model.params) for row in selected_data]
+            log_aT_fits = wlf_core.evaluate_model(model, params, T_fit, T_r)
+            aT_fits = 10 ** log_aT_fits
+
+            sheets = {}
+            for values, log_aT_fit, aT_fit in zip(params, log_aT_fits, aT_fits):
+                fit_df = pd.DataFrame({
+                    'Temperature (\u00b0C)': T_fit - 273.15,
+                    'log(a_T)': log_aT_fit,
+                    'a_T': aT_fit
+                })
+                # Excel sheet names are limited to 31 characters
+                sheets[param_text(model.params, values, '_', '_')[:31]] = fit_df
+            wlf_io.write_sheets(file_path, sheets)
 
             messagebox.showinfo("Save to Excel", "Data saved successfully!")
 
@@ -758,37 +1534,84 @@ class WLF_GUI(tk.Tk):
             messagebox.showerror("Error", "Please shift data first.")
             return
 
-        self.shifted_ax.clear()
-        for temp in self.shifted_data.columns:
-            freqs = self.shifted_freqs[temp]
-            data = self.shifted_data[temp]
-            spline = UnivariateSpline(np.log(freqs), np.log(data), s=1)
-            smoothed_data = np.exp(spline(np.log(freqs)))
-            self.shifted_ax.plot(freqs, smoothed_data,
-                                label='{0}\u00b0C'.format(temp))
+        method = self.smooth_method_var.get()
+        # One fit over all shifted points, reused until the shifts change
+        if self.smoothed_curve is None or self.smoothed_curve.method != method:
+            try:
+                self.smoothed_curve = wlf_master.smooth_master(
+                    *wlf_master.master_points(self.shifted_data, self.shifted_freqs),
+                    method=method)
+            except ValueError as e:
+                messagebox.showerror("Error", "Smoothing failed: {0}".format(e))
+                return
 
+        self.plot_shifted_data()
+        self.shifted_ax.plot(self.smoothed_curve.freqs, self.smoothed_curve.values,
+                             color=TEXT, linewidth=2.5, label='Smoothed')
         self._style_plot(self.shifted_ax,
                          xlabel='Shifted Frequency (Hz)',
                          ylabel='Shifted Data (MPa)',
                          title='Smoothed Shifted Data Using TTS')
-        self.shifted_ax.set_xscale('log')
-        self.shifted_ax.set_yscale('log')
-        self.shifted_ax.set_ylim([0.1, 1e4])
         self.shifted_canvas.draw()
 
+    def _shifts_changed(self):
+        # The smoothed master curve no longer matches the shifted data
+        self.smoothed_curve = None
+
+    def fit_prony(self):
+        if self.shifted_data is None or self.shifted_freqs is None:
+            messagebox.showerror("Error", "Please shift data first.")
+            return
+
+        try:
+            n_terms = int(self.prony_terms_entry.get())
+            freqs, values = wlf_master.master_points(self.shifted_data,
+                                                     self.shifted_freqs)
+            # Re-fits after the shifts were adjusted start from the last support
+            self.prony_fit = wlf_master.fit_prony(freqs, values, n_terms,
+                                                  warm_start=self.prony_fit)
+        except ValueError as e:
+            messagebox.showerror("Error", "Prony fit failed: {0}".format(e))
+            return
+
+        self.plot_shifted_data()
+        curve_freqs = np.logspace(np.log10(freqs[0]), np.log10(freqs[-1]), 400)
+        self.shifted_ax.plot(curve_freqs,
+                             wlf_master.prony_modulus(self.prony_fit, curve_freqs),
+                             color=TEXT, linestyle='--', linewidth=2,
+                             label='Prony ({0} terms)'.format(n_terms))
+        self._style_plot(self.shifted_ax,
+                         xlabel='Shifted Frequency (Hz)',
+                         ylabel='Shifted Data (MPa)',
+                         title='Prony Series Fit (RMS {0:.2%})'.format(self.prony_fit.rms))
+        self.shifted_canvas.draw()
+
+    def save_prony(self):
+        if self.prony_fit is None:
+            messagebox.showerror("Error", "Please fit a Prony series first.")
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=wlf_io.TABLE_FILETYPES)
+        if file_path:
+            wlf_io.write_table(file_path, wlf_master.prony_table(self.prony_fit))
+            messagebox.showinfo("Save Prony", "Prony coefficients saved successfully!")
+
     def load_data(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=wlf_io.TABLE_FILETYPES)
         if not file_path:
             return
 
         try:
-            self.data = pd.read_excel(file_path, index_col=0)
+            self.data = wlf_io.read_dma_table(file_path)
             self.plot_loaded_data()
         except Exception as e:
             messagebox.showerror("Error", "Failed to load data: {0}".format(e))
 
     def plot_loaded_data(self):
+        self._ensure_tab('step5', replot=False)
         self.shifted_ax.clear()
+        self._shifted_lines = {}
+        self._drag_index = None
         for temp in self.data.columns:
             self.shifted_ax.plot(self.data.index, self.data[temp],
                                 label='{0}\u00b0C'.format(temp))
@@ -820,38 +1643,53 @@ class WLF_GUI(tk.Tk):
                                  "to Step 5 first.")
             return
 
-        shifted_data = {}
-        shifted_freqs = {}
+        try:
+            aT_values = wlf_core.aT_for_temperatures(
+                self.data.columns, self.estimated_aT_values, self.estimated_aT_params,
+                self.estimated_aT_model)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
 
-        for temp in self.data.columns:
-            try:
-                closest_temp = min(self.estimated_aT_values['Temperature (\u00b0C)'], key=lambda x: abs(x - float(temp)))
-                aT = self.estimated_aT_values[self.estimated_aT_values['Temperature (\u00b0C)'] == closest_temp]['a_T'].values[0]
-            except IndexError:
-                messagebox.showerror("Error", "No estimated a\u209c value for temperature {0}\u00b0C.".format(temp))
-                return
+        self._start_shifts(np.log10(aT_values))
 
-            shifted_freq = self.data.index * aT
-            shifted_data[temp] = self.data[temp].values
-            shifted_freqs[temp] = shifted_freq
+    def auto_shift_data(self):
+        if self.data is None:
+            messagebox.showerror("Error", "Please load the data first.")
+            return
 
-        self.shifted_data = pd.DataFrame(shifted_data)
-        self.shifted_freqs = pd.DataFrame(shifted_freqs)
+        try:
+            # T_r is read from Step 2 & 3, which may not have been opened yet
+            self._ensure_tab('step2_3')
+            T_r = float(self.reference_temp_entry.get())
+            temperatures, log_aT = wlf_shift.auto_shift(self.data, T_r)
+        except ValueError as e:
+            messagebox.showerror("Error", "Automatic shift failed: {0}".format(e))
+            return
 
-        self.plot_shifted_data()
+        # The overlap shifts become the Step 1 table, ready for Fit Data
+        order = np.argsort(temperatures)
+        self._set_step1_values(temperatures[order], log_aT[order])
+        self._start_shifts(log_aT)
+        messagebox.showinfo("Auto Shift",
+                            "log(a\u209c) of {0} isotherms entered in Step 1 "
+                            "(T\u1d63 = {1}\u00b0C).\nUse 'Fit Data' in Step 2 & 3 "
+                            "to fit WLF.".format(len(temperatures), T_r))
 
     def output_tts(self):
         if not hasattr(self, 'shifted_data') or self.shifted_data is None:
             messagebox.showerror("Error", "Please apply TTS first.")
             return
 
-        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel files', '*.xlsx'), ('All files', '*.*')])
+        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=wlf_io.TABLE_FILETYPES)
         if file_path:
-            tts_data = pd.DataFrame({
-                'Frequency (Hz)': self.shifted_freqs.values.flatten(),
-                'Modulus': self.shifted_data.values.flatten()
-            })
-            tts_data.to_excel(file_path, index=False)
+            smoothed_values = None
+            if self.smoothed_curve is not None:
+                smoothed_values = wlf_master.smooth_values(
+                    self.smoothed_curve, self.shifted_freqs.values.flatten())
+            wlf_io.write_table(file_path, wlf_io.tts_table(self.shifted_data,
+                                                           self.shifted_freqs,
+                                                           smoothed_values))
             messagebox.showinfo("Output TTS", "TTS data saved successfully!")
 
     def save_shifted_data_to_excel(self):
@@ -859,15 +1697,14 @@ class WLF_GUI(tk.Tk):
             messagebox.showerror("Error", "No shifted data to save. Please shift data in Step 5 first.")
             return
 
-        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel files', '*.xlsx'), ('All files', '*.*')])
+        file_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=wlf_io.TABLE_FILETYPES)
         if file_path:
-            with pd.ExcelWriter(file_path) as writer:
-                for temp in self.shifted_data.columns:
-                    data_df = pd.DataFrame({
-                        'Frequency (Hz)': self.shifted_freqs[temp],
-                        'Modulus (MPa)': self.shifted_data[temp]
-                    })
-                    data_df.to_excel(writer, sheet_name=f'{temp}\u00b0C', index=False)
+            smoothed = None
+            if self.smoothed_curve is not None:
+                smoothed = (self.smoothed_curve.freqs, self.smoothed_curve.values)
+            wlf_io.write_sheets(file_path, wlf_io.shifted_sheets(self.shifted_data,
+                                                                 self.shifted_freqs,
+                                                                 smoothed))
             messagebox.showinfo("Save to Excel", "Shifted data saved successfully!")
 
     def send_aT_values(self):
@@ -891,6 +1728,8 @@ class WLF_GUI(tk.Tk):
                             "Use 'Retrieve a\u209c' in Step 5 to load them.")
 
     def fit_data(self):
+        if self._fit_thread is not None and self._fit_thread.is_alive():
+            return
         try:
             temperatures = []
             log_aT_values = []
@@ -909,136 +1748,311 @@ class WLF_GUI(tk.Tk):
             self.log_aT_data = np.array(log_aT_values)
 
             T_r = float(self.reference_temp_entry.get()) + 273.15
-            initial_guess = [17, 52]
+            span = float(self.reference_span_entry.get() or 0)
+        except Exception as e:
+            messagebox.showerror("Error", "Failed to fit data: {0}".format(e))
+            return
+
+        # curve_fit and the grid search run in a worker thread; results come
+        # back through a queue that _poll_fit drains on the Tk main thread
+        self._fit_cancel = threading.Event()
+        self._fit_queue = queue.Queue()
+        self._fit_warning = None
+        landscape = self._landscapes.get(landscape_key(self.T_data, self.log_aT_data, T_r))
+        self._fit_thread = threading.Thread(
+            target=self._fit_worker,
+            args=(self.T_data, self.log_aT_data, T_r, self.fit_method_var.get(),
+                  self._fit_cancel, self._fit_queue, landscape, self.model_var.get(), span),
+            daemon=True)
+        self._set_fit_running(True)
+        self._fit_thread.start()
+        self.after(FIT_POLL_MS, self._poll_fit)
+
+    @staticmethod
+    def _fit_worker(T_data, log_aT_data, T_r, method, cancel, results, landscape=None,
+                    model='WLF', span=0.0):
+        try:
+            try:
+                params = wlf_core.fit_model(model, T_data, log_aT_data, T_r, method=method)
+                results.put(('fit', tuple(round(value, 1) for value in params)))
+            except wlf_core.FitError as e:
+                # The grid optimum below takes the place of the diverged fit
+                results.put(('warning', str(e)))
+            if span > 0:
+                # The landscape is needed at the best T_r, not the entered one
+                landscape = None
+            # A cached landscape for the same data and T_r is reused as is;
+            # otherwise the full-range mesh takes most of the progress bar.
+            # The (C1, C2) landscape only exists for WLF.
+            share = 1.0 if landscape is not None or model != 'WLF' else 0.2
+            ranked, T_r = WLF_GUI._grid_stage(
+                model, T_data, log_aT_data, T_r, span,
+                progress=lambda fraction: results.put(('progress', share * fraction)),
+                cancel=cancel)
+            if span > 0:
+                results.put(('reference', T_r))
+            if landscape is None and model == 'WLF':
+                landscape = wlf_core.sse_landscape(
+                    T_data, log_aT_data, T_r,
+                    progress=lambda fraction: results.put(
+                        ('progress', share + (1 - share) * fraction)),
+                    cancel=cancel)
+            results.put(('done', (ranked, landscape_key(T_data, log_aT_data, T_r), landscape)))
+        except wlf_core.Cancelled:
+            results.put(('cancelled', None))
+        except Exception as e:
+            results.put(('error', e))
 
-            popt, _ = curve_fit(lambda T, C1, C2: self.WLF(T, C1, C2, T_r),
-                                self.T_data, self.log_aT_data, p0=initial_guess)
-            self.C1_fit = round(popt[0], 1)
-            self.C2_fit = round(popt[1], 1)
-            self.result_label.config(text="C1: {0}   C2: {1}".format(self.C1_fit, self.C2_fit))
+    def _poll_fit(self):
+        while True:
+            try:
+                kind, payload = self._fit_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                self.fit_progress['value'] = 100 * payload
+            elif kind == 'fit':
+                self._set_fit_params(payload)
+            elif kind == 'warning':
+                self._fit_warning = payload
+            elif kind == 'reference':
+                self.reference_temp_entry.delete(0, tk.END)
+                self.reference_temp_entry.insert(0, '{0:g}'.format(payload - 273.15))
+            else:
+                self._set_fit_running(False)
+                if kind == 'done':
+                    ranked, key, landscape = payload
+                    if landscape is not None:
+                        self._cache_landscape(key, landscape)
+                    self._show_grid_results(ranked)
+                    self.update_plot()
+                    if self._fit_warning:
+                        messagebox.showwarning(
+                            "Fit", "{0} The grid optimum is used.".format(self._fit_warning))
+                elif kind == 'cancelled':
+                    self.fit_progress['value'] = 0
+                else:
+                    messagebox.showerror("Error", "Failed to fit data: {0}".format(payload))
+                return
 
-            self.c1_slider.set(self.C1_fit)
-            self.c2_slider.set(self.C2_fit)
+        self.after(FIT_POLL_MS, self._poll_fit)
 
-            self.perform_grid_search()
+    def _set_fit_running(self, running):
+        if running:
+            self.fit_progress['value'] = 0
+            self.fit_button.state(['disabled'])
+            self.cancel_fit_button.state(['!disabled'])
+            # The running fit's parameters must match the sliders and table
+            self.model_box.state(['disabled'])
+        else:
+            self.fit_button.state(['!disabled'])
+            self.cancel_fit_button.state(['disabled'])
+            self.model_box.state(['!disabled'])
+
+    def cancel_fit(self):
+        if self._fit_cancel is not None:
+            self._fit_cancel.set()
+
+    # ── Shift model ──────────────────────────────────────────────────────────
+    def _model(self):
+        return wlf_core.get_model(self.model_var.get())
+
+    def _build_param_sliders(self):
+        """One slider per parameter of the selected model, over its grid range."""
+        for child in self.slider_card.winfo_children():
+            child.destroy()
+        model = self._model()
+        self.param_sliders = []
+        for name, unit, (lower, upper, _, _) in zip(model.params, model.units, model.ranges):
+            label = '{0} ({1})'.format(name, unit) if unit else name
+            self.param_sliders.append(self._make_scale(
+                self.slider_card, label, lower, upper, resolution=SLIDER_RESOLUTION,
+                command=self._schedule_plot_update))
+        self.result_label.config(text=param_text(model.params, ['\u2014'] * len(model.params),
+                                                 ': ', '   '))
+
+    def _slider_params(self):
+        return tuple(slider.get() for slider in self.param_sliders)
+
+    def _set_fit_params(self, params):
+        self.fit_params = tuple(params)
+        self.result_label.config(text=param_text(self._model().params, self.fit_params,
+                                                 ': ', '   '))
+        for slider, value in zip(self.param_sliders, self.fit_params):
+            slider.set(value)
+
+    def _on_model_selected(self, event=None):
+        # Results of the previous model no longer apply
+        model = self._model()
+        self.fit_params = None
+        self.result_table.set_records(result_records([], model))
+        self.region_label.config(text="")
+        self._fit_line = None
+        self._build_param_sliders()
+        if self.T_data is not None:
             self.update_plot()
-        except Exception as e:
-            messagebox.showerror("Error", "Failed to fit data: {0}".format(e))
 
-    def WLF(self, T, C1, C2, T_r):
-        denom = C2 + (T - T_r)
-        with np.errstate(divide='ignore', invalid='ignore'):
-            result = np.where(denom == 0, np.nan, -C1 * (T - T_r) / denom)
-        return result
+    def _schedule_plot_update(self, event=None):
+        # Coalesce slider ticks so at most one redraw happens per frame
+        if self._slider_job is None:
+            self._slider_job = self.after(SLIDER_FRAME_MS, self._flush_plot_update)
+
+    def _flush_plot_update(self):
+        self._slider_job = None
+        self.update_plot()
 
     def update_plot(self, event=None):
         if self.T_data is None or self.log_aT_data is None:
             return
+        self._ensure_tab('step2_3', replot=False)
 
         T_r = float(self.reference_temp_entry.get()) + 273.15
-        C1 = self.c1_slider.get()
-        C2 = self.c2_slider.get()
+        model = self._model()
+        params = self._slider_params()
+
+        if self.fit_view_var.get() == 'SSE Map':
+            if (self._landscape_marker is not None and self._fit_background is not None
+                    and self._landscape_drawn is self._current_landscape()):
+                # Only the slider marker moves over the cached image
+                self._landscape_marker.set_data([params[0]], [params[1]])
+                self.canvas.restore_region(self._fit_background)
+                self.ax.draw_artist(self._landscape_marker)
+                self.canvas.blit(self.figure.bbox)
+            else:
+                self._plot_landscape()
+            return
+
+        T_fit = np.linspace(-80, 80, 100) + 273.15
+        log_aT_fit = wlf_core.evaluate_model(model, params, T_fit, T_r)[0]
+        label = '{0} Fit ({1})'.format(model.name, param_text(model.params, params))
+        finite = log_aT_fit[np.isfinite(log_aT_fit)]
+
+        # Fast path: same data on screen and the curve still fits the axes,
+        # so only the fit line and legend are redrawn over the cached background
+        plot_key = (id(self.T_data), id(self.log_aT_data), T_r, model.name)
+        if (self._fit_line is not None and self._fit_background is not None
+                and self._fit_plot_key == plot_key
+                and self._fit_ylim_ok(finite)):
+            legend = self.ax.get_legend()
+            for text in legend.get_texts():
+                if text.get_text() == self._fit_line.get_label():
+                    text.set_text(label)
+            self._fit_line.set_label(label)
+            self._fit_line.set_ydata(log_aT_fit)
+            self.canvas.restore_region(self._fit_background)
+            self._draw_fit_artists()
+            self.canvas.blit(self.figure.bbox)
+            return
 
         self.ax.clear()
         self.ax.scatter(self.T_data - 273.15, self.log_aT_data,
                         label='Data', color=ACCENT, zorder=5, s=50,
                         edgecolors='white', linewidths=0.8)
 
-        T_fit = np.linspace(-80, 80, 100) + 273.15
-        log_aT_fit = self.WLF(T_fit, C1, C2, T_r)
-        self.ax.plot(T_fit - 273.15, log_aT_fit,
-                     label='WLF Fit (C1={0}, C2={1})'.format(C1, C2),
-                     color=DANGER, linewidth=1.8)
+        self._landscape_marker = None
+        self._fit_line, = self.ax.plot(T_fit - 273.15, log_aT_fit,
+                                       label=label,
+                                       color=DANGER, linewidth=1.8)
 
         self.ax.set_xlim([-80, 80])
-        finite = log_aT_fit[np.isfinite(log_aT_fit)]
         if len(finite) > 0:
-            self.ax.set_ylim([finite.min() - 1, finite.max() + 1])
+            # Some headroom so that slider drags rarely force a full redraw
+            pad = 1 + 0.25 * (finite.max() - finite.min())
+            self.ax.set_ylim([finite.min() - pad, finite.max() + pad])
         self._style_plot(self.ax,
                          xlabel='Temperature (\u00b0C)',
                          ylabel='log(a\u209c)',
-                         title='WLF Fit Comparison')
+                         title='{0} Fit Comparison'.format(model.name))
+        # Animated artists are left out of the cached background
+        self._fit_line.set_animated(True)
+        self.ax.get_legend().set_animated(True)
+        self._fit_plot_key = plot_key
         self.canvas.draw()
 
-    def perform_grid_search(self):
-        if self.T_data is None or self.log_aT_data is None:
-            return
-
-        T_r = float(self.reference_temp_entry.get()) + 273.15
-
-        # ── Stage 1: coarse scan (step=5) ──
-        C1_coarse = np.arange(0.5, 201, 5)
-        C2_coarse = np.arange(0.5, 201, 5)
-
-        best_sse = np.inf
-        best_C1, best_C2 = 0, 0
-        for C1 in C1_coarse:
-            for C2 in C2_coarse:
-                sse = self.calculate_sse(C1, C2, T_r)
-                if np.isfinite(sse) and sse < best_sse:
-                    best_sse, best_C1, best_C2 = sse, C1, C2
-
-        # ── Stage 2: fine scan (step=0.5) around top coarse result ──
-        margin = 10
-        C1_fine = np.arange(max(0.1, best_C1 - margin), best_C1 + margin + 0.5, 0.5)
-        C2_fine = np.arange(max(0.1, best_C2 - margin), best_C2 + margin + 0.5, 0.5)
-
-        results = []
-        for C1 in C1_fine:
-            for C2 in C2_fine:
-                sse = self.calculate_sse(C1, C2, T_r)
-                if np.isfinite(sse):
-                    results.append((False, round(C1, 1), round(C2, 1),
-                                    round(sse, 4)))
-
-        results.sort(key=lambda x: x[3])
-
-        # Keep top 200 results for display
-        results = results[:200]
-
-        self.tree.delete(*self.tree.get_children())
-        for result in results:
-            self.tree.insert('', 'end', values=result)
-
-        if results:
-            best_params = results[0]
-            self.C1_fit, self.C2_fit = best_params[1], best_params[2]
-            self.result_label.config(text="C1: {0}   C2: {1}".format(
-                self.C1_fit, self.C2_fit))
-            self.c1_slider.set(self.C1_fit)
-            self.c2_slider.set(self.C2_fit)
-            self.tree.item(self.tree.get_children()[0], tags=('recommended',))
-            self.tree.tag_configure('recommended', background='#DDEAF6')
-
-    def calculate_sse(self, C1, C2, T_r):
-        log_aT_fit = self.WLF(self.T_data, C1, C2, T_r)
-        sse = np.nansum((self.log_aT_data - log_aT_fit) ** 2)
-        return sse
-
-    def sort_tree_column(self, col, reverse):
-        data = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
+    def _fit_ylim_ok(self, finite):
+        if len(finite) == 0:
+            return True
+        lo, hi = self.ax.get_ylim()
+        need_lo, need_hi = finite.min() - 1, finite.max() + 1
+        # Redraw fully when the curve leaves the axes or has shrunk a lot
+        return lo <= need_lo and need_hi <= hi and (hi - lo) <= 4 * (need_hi - need_lo)
+
+    def _draw_fit_artists(self):
+        self.ax.draw_artist(self._fit_line)
+        self.ax.draw_artist(self.ax.get_legend())
+
+    def _on_fit_canvas_draw(self, event):
+        self._fit_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        if self._fit_line is not None:
+            self._draw_fit_artists()
+        elif self._landscape_marker is not None:
+            self.ax.draw_artist(self._landscape_marker)
+
+    @staticmethod
+    def _grid_stage(model, T_data, log_aT_data, T_r, span=0.0, progress=None, cancel=None):
+        """Ranked (*params, SSE) rows of the grid search and the T_r they are for.
+
+        With ``span`` > 0 T_r is searched jointly within T_r \u00b1 span over
+        all cores, and the rows at the best T_r are returned.
+        """
+        if span > 0:
+            T_r_values = wlf_core.grid_axis(T_r - span, T_r + span, wlf_batch.REFERENCE_STEP)
+            rows = wlf_batch.joint_grid_search(model, T_data, log_aT_data, T_r_values,
+                                               progress=progress, cancel=cancel)
+            if len(rows):
+                rows = rows[rows[:, -2] == rows[0, -2]]
+                # As the T_r entry will show it, so cached landscapes match
+                T_r = round(rows[0, -2] - 273.15, 2) + 273.15
+            return np.delete(rows, -2, axis=1), T_r
+        # Coarse scan, then a fine scan around the best cell; every finite
+        # mesh point is kept and the table only renders what is visible
+        axes, surface = wlf_core.model_grid_search(model, T_data, log_aT_data, T_r,
+                                                   progress=progress, cancel=cancel)
+        return wlf_core.rank_grid(surface, axes), T_r
+
+    def _cache_landscape(self, key, landscape):
+        # Most recently computed last; the oldest entries are dropped first
+        self._landscapes.pop(key, None)
+        self._landscapes[key] = landscape
+        while len(self._landscapes) > LANDSCAPE_CACHE_SIZE:
+            del self._landscapes[next(iter(self._landscapes))]
+
+    def _current_landscape(self):
+        """Cached WLF SSE landscape for the Step 2 & 3 data and T_r, or None."""
+        if self.T_data is None or self.log_aT_data is None or self.model_var.get() != 'WLF':
+            return None
         try:
-            data.sort(key=lambda t: float(t[0]), reverse=reverse)
+            T_r = float(self.reference_temp_entry.get()) + 273.15
         except ValueError:
-            data.sort(key=lambda t: t[0], reverse=reverse)
-        for index, (_, k) in enumerate(data):
-            self.tree.move(k, '', index)
-        self.sort_orders[col] = not reverse
-        self.tree.heading(col, command=lambda: self.sort_tree_column(col, not reverse))
+            return None
+        return self._landscapes.get(landscape_key(self.T_data, self.log_aT_data, T_r))
+
+    def _show_grid_results(self, ranked):
+        model = self._model()
+        records = result_records(ranked, model)
+        self.result_table.set_records(records)
+        self._show_confidence(self._current_landscape())
 
-    def on_row_click(self, event):
-        item = self.tree.selection()[0]
-        current_value = self.tree.set(item, 'Select')
-        new_value = '1' if current_value == '0' else '0'
-        self.tree.set(item, 'Select', new_value)
+        if len(records):
+            self._set_fit_params(float(records[0][name]) for name in model.params)
+        self.fit_progress['value'] = 100
 
-        self.update_checked_plots()
+    def calculate_sse(self, C1, C2, T_r):
+        return wlf_core.calculate_sse(self.T_data, self.log_aT_data,
+                                      C1, C2, T_r)
 
     def update_checked_plots(self):
         if self.T_data is None or self.log_aT_data is None:
             return
+        self._ensure_tab('step2_3', replot=False)
+        if self.fit_view_var.get() == 'SSE Map':
+            self._plot_landscape()
+            return
 
         T_r = float(self.reference_temp_entry.get()) + 273.15
+        self._fit_line = None
+        self._landscape_marker = None
         self.ax.clear()
         self.ax.scatter(self.T_data - 273.15, self.log_aT_data,
                         label='Data', color=ACCENT, zorder=5, s=50,
@@ -1047,30 +2061,94 @@ class WLF_GUI(tk.Tk):
         T_fit = np.linspace(-80, 80, 100) + 273.15
 
         colors = [DANGER, '#6F42C1', SUCCESS, '#F97316', '#0EA5E9']
-        color_index = 0
-        log_aT_fit_all = []
-
-        for item in self.tree.get_children():
-            if self.tree.set(item, 'Select') == '1':
-                values = self.tree.item(item, 'values')
-                C1, C2 = float(values[1]), float(values[2])
-                log_aT_fit = self.WLF(T_fit, C1, C2, T_r)
-                log_aT_fit_all.extend(log_aT_fit)
-                self.ax.plot(T_fit - 273.15, log_aT_fit,
-                             label='WLF Fit (C1={0}, C2={1})'.format(C1, C2),
-                             color=colors[color_index % len(colors)],
-                             linewidth=1.8)
-                color_index += 1
+        model = self._model()
+        selected = self.result_table.selected()
+        params = [tuple(float(row[name]) for name in model.params) for row in selected]
 
         self.ax.set_xlim([-80, 80])
-        if log_aT_fit_all:
-            finite = [v for v in log_aT_fit_all if np.isfinite(v)]
-            if finite:
-                self.ax.set_ylim([min(finite) - 1, max(finite) + 1])
+        if params:
+            log_aT_fits = wlf_core.evaluate_model(model, params, T_fit, T_r)
+            for color_index, values in enumerate(params):
+                self.ax.plot(T_fit - 273.15, log_aT_fits[color_index],
+                             label='{0} Fit ({1})'.format(model.name,
+                                                          param_text(model.params, values)),
+                             color=colors[color_index % len(colors)],
+                             linewidth=1.8)
+            finite = log_aT_fits[np.isfinite(log_aT_fits)]
+            if finite.size:
+                self.ax.set_ylim([finite.min() - 1, finite.max() + 1])
         self._style_plot(self.ax,
                          xlabel='Temperature (\u00b0C)',
                          ylabel='log(a\u209c)',
-                         title='WLF Fit Comparison')
+                         title='{0} Fit Comparison'.format(model.name))
+        self.canvas.draw()
+
+    def _show_confidence(self, landscape):
+        bounds = None if landscape is None else wlf_core.confidence_bounds(landscape)
+        if bounds is None:
+            self.region_label.config(text="")
+            return
+        (C1_lo, C1_hi), (C2_lo, C2_hi), clipped = bounds
+        text = "{0:.0%} region: C1 {1:.1f}\u2013{2:.1f}, C2 {3:.1f}\u2013{4:.1f}".format(
+            landscape.level, C1_lo, C1_hi, C2_lo, C2_hi)
+        if clipped:
+            text += "\n(reaches the edge of the search range)"
+        self.region_label.config(text=text)
+
+    def _plot_landscape(self):
+        """SSE map of the cached landscape: one image, the confidence
+        contour, the best point, the checked rows and the slider marker."""
+        self._ensure_tab('step2_3', replot=False)
+        landscape = self._current_landscape()
+        self._fit_line = None
+        self._landscape_marker = None
+        self._landscape_drawn = landscape
+        self.ax.clear()
+        if self.model_var.get() != 'WLF':
+            self.ax.text(0.5, 0.5, "The SSE map is drawn for the WLF model only.",
+                         transform=self.ax.transAxes, ha='center', va='center',
+                         color=TEXT_SEC, fontfamily=FONT_FAMILY)
+            self.canvas.draw()
+            return
+        if landscape is None:
+            self.ax.text(0.5, 0.5, "Fit Data to map the SSE for this data and T\u1d63.",
+                         transform=self.ax.transAxes, ha='center', va='center',
+                         color=TEXT_SEC, fontfamily=FONT_FAMILY)
+            self.canvas.draw()
+            return
+
+        C1_values, C2_values = landscape.C1_values, landscape.C2_values
+        surface = landscape.surface.T
+        positive = surface[surface > 0]
+        floor = positive.min() if positive.size else 1.0
+        h1 = 0.5 * (C1_values[1] - C1_values[0]) if C1_values.size > 1 else 0.5
+        h2 = 0.5 * (C2_values[1] - C2_values[0]) if C2_values.size > 1 else 0.5
+        self.ax.imshow(np.log10(np.maximum(surface, floor)), origin='lower',
+                       aspect='auto', interpolation='nearest', cmap='viridis',
+                       extent=(C1_values[0] - h1, C1_values[-1] + h1,
+                               C2_values[0] - h2, C2_values[-1] + h2))
+        if landscape.threshold > landscape.best[2]:
+            self.ax.contour(C1_values, C2_values, surface, levels=[landscape.threshold],
+                            colors='#F97316', linewidths=1.5)
+            self.ax.plot([], [], color='#F97316', linewidth=1.5,
+                         label='{0:.0%} confidence region'.format(landscape.level))
+        self.ax.scatter([landscape.best[0]], [landscape.best[1]], marker='*', s=160,
+                        color='white', edgecolors=TEXT, zorder=5,
+                        label='Minimum (C1={0}, C2={1})'.format(landscape.best[0],
+                                                               landscape.best[1]))
+        selected = self.result_table.selected()
+        if len(selected):
+            self.ax.scatter(selected['C1'], selected['C2'], s=40, facecolors='none',
+                            edgecolors=DANGER, zorder=5, label='Checked')
+        C1, C2 = self._slider_params()
+        self._landscape_marker, = self.ax.plot(
+            [C1], [C2], marker='o', markersize=7,
+            color=ACCENT, markeredgecolor='white', linestyle='none', label='Sliders')
+        self._style_plot(self.ax, xlabel='C1', ylabel='C2',
+                         title='SSE Landscape (log\u2081\u2080 SSE)')
+        self.ax.grid(False)
+        # The marker is left out of the cached background and blitted on drags
+        self._landscape_marker.set_animated(True)
         self.canvas.draw()
 
     def estimate_aT(self):
@@ -1080,27 +2158,40 @@ class WLF_GUI(tk.Tk):
         T_r_new = float(self.new_reference_temp_entry.get()) + 273.15
         T_r = float(self.reference_temp_entry.get()) + 273.15
 
-        C1 = self.c1_slider.get()
-        C2 = self.c2_slider.get()
+        model = self._model()
+        params = self._slider_params()
 
-        selected_items = [self.tree.item(item) for item in self.tree.get_children() if self.tree.set(item, 'Select') == '1']
-        if selected_items:
-            C1 = float(selected_items[0]['values'][1])
-            C2 = float(selected_items[0]['values'][2])
+        selected = self.result_table.selected()
+        if len(selected):
+            params = tuple(float(selected[name][0]) for name in model.params)
 
-        T_fit = np.linspace(-80, 80, 100) + 273.15
-        log_aT_new = self.WLF(T_fit, C1, C2, T_r_new)
-        aT_new = 10 ** log_aT_new
+        estimated = wlf_core.model_aT_table(model, params, T_r_new)
+        self._ensure_tab('step4', replot=False)
+        self._plot_estimated_aT(model.name, params, T_r, T_r_new)
+
+        self.estimated_aT_values = estimated
+        # Step 5 evaluates the model at the exact isotherm temperatures from these
+        self.estimated_aT_model = model.name
+        self.estimated_aT_params = params + (T_r_new,)
+        print("Estimated aT values:")
+        print(self.estimated_aT_values)
+
+    def _plot_estimated_aT(self, model, params, T_r, T_r_new):
+        self._estimate_plot_args = (model, params, T_r, T_r_new)
+        T_fit = np.linspace(*wlf_core.AT_TABLE_RANGE) + 273.15
+        # New and original reference temperature in one batched evaluation
+        log_aT_new, log_aT_orig = wlf_core.evaluate_model(model, params, T_fit, [T_r_new, T_r])
+        text = param_text(wlf_core.get_model(model).params, params)
 
         self.estimate_ax.clear()
         self.estimate_ax.scatter(self.T_data - 273.15, self.log_aT_data,
                                  label='Original Data', color=ACCENT, zorder=5,
                                  s=50, edgecolors='white', linewidths=0.8)
         self.estimate_ax.plot(T_fit - 273.15, log_aT_new,
-                              label='Estimated a\u209c (T_r_new={0}\u00b0C, C1={1}, C2={2})'.format(T_r_new - 273.15, C1, C2),
+                              label='Estimated a\u209c (T_r_new={0}\u00b0C, {1})'.format(T_r_new - 273.15, text),
                               color=SUCCESS, linewidth=1.8)
-        self.estimate_ax.plot(T_fit - 273.15, self.WLF(T_fit, C1, C2, T_r),
-                              label='Original a\u209c (T_r={0}\u00b0C, C1={1}, C2={2})'.format(T_r - 273.15, C1, C2),
+        self.estimate_ax.plot(T_fit - 273.15, log_aT_orig,
+                              label='Original a\u209c (T_r={0}\u00b0C, {1})'.format(T_r - 273.15, text),
                               color=DANGER, linewidth=1.8)
 
         self.estimate_ax.set_xlim([-80, 80])
@@ -1111,31 +2202,24 @@ class WLF_GUI(tk.Tk):
                          title='Estimated a\u209c Fit')
         self.estimate_canvas.draw()
 
-        self.estimated_aT_values = pd.DataFrame({
-            'Temperature (\u00b0C)': np.round(T_fit - 273.15).astype(int),
-            'a_T': aT_new,
-            'log(a_T)': log_aT_new
-        })
-        print("Estimated aT values:")
-        print(self.estimated_aT_values)
-
     def on_key(self, event):
-        if self.selected_label is None or self.selected_index is None:
+        # Arrow keys nudge the last dragged isotherm: up/down scale its
+        # modulus (b_T), left/right its frequency (a_T), by 10% per press
+        if self.shift_history is None or self._shift_selected is None:
             return
 
         shift_amount = 0.1
-        label = self.selected_label.split('\u00b0')[0]
-        temp = f"{label}\u00b0C"
-
-        if event.key == 'up':
-            self.shifted_data[temp][self.selected_index] *= (1 + shift_amount)
-        elif event.key == 'down':
-            self.shifted_data[temp][self.selected_index] *= (1 - shift_amount)
-        elif event.key == 'right':
-            self.selected_index = min(self.selected_index + 1, len(self.shifted_data[temp]) - 1)
-        elif event.key == 'left':
-            self.selected_index = max(self.selected_index - 1, 0)
-
+        steps = {
+            'up': (0.0, np.log10(1 + shift_amount)),
+            'down': (0.0, np.log10(1 - shift_amount)),
+            'right': (np.log10(1 + shift_amount), 0.0),
+            'left': (np.log10(1 - shift_amount), 0.0),
+        }
+        if event.key not in steps:
+            return
+        d_log_aT, d_log_bT = steps[event.key]
+        self.shift_history.shift(self._shift_selected, d_log_aT, d_log_bT)
+        self._shifts_changed()
         self.plot_shifted_data()
 
 
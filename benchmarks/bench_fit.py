@@ -0,0 +1,44 @@
+"""Compare the WLF fitting backends on synthetic (T, log a_T) sets.
+
+    python benchmarks/bench_fit.py [--points 8] [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import wlf_core  # noqa: E402
+
+
+def make_sample(n_points, noise=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    T = np.linspace(-20, 60, n_points) + 273.15
+    T_r = 20 + 273.15
+    log_aT = wlf_core.wlf(T, 8.86, 101.6, T_r) + rng.normal(0, noise, n_points)
+    return T, log_aT, T_r
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    T, log_aT, T_r = make_sample(args.points)
+    print("{0:<10} {1:>10} {2:>10} {3:>12} {4:>10}".format(
+        'method', 'C1', 'C2', 'SSE', 'us/fit'))
+    for method in wlf_core.FIT_METHODS:
+        C1, C2 = wlf_core.fit_wlf(T, log_aT, T_r, method=method)
+        seconds = timeit.timeit(
+            lambda: wlf_core.fit_wlf(T, log_aT, T_r, method=method),
+            number=args.repeat) / args.repeat
+        sse = wlf_core.calculate_sse(T, log_aT, C1, C2, T_r)
+        print("{0:<10} {1:>10.4f} {2:>10.4f} {3:>12.3e} {4:>10.1f}".format(
+            method, C1, C2, sse, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
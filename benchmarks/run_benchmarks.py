@@ -0,0 +1,312 @@
+"""Time the fitting, shifting, smoothing, I/O and plotting hot paths.
+
+    python benchmarks/run_benchmarks.py [--isotherms 4 16 64]
+        [--points 100 10000 1000000] [--repeat 3] [--max-cells N]
+        [--output results.json] [--compare baseline.json] [--tolerance 1.25]
+
+Synthetic DMA tables (WLF-shifted Prony master curve plus noise) are built
+for every isotherm count x frequency-point count. Each case is timed
+``--repeat`` times and the min/median/mean seconds are written as JSON.
+With ``--compare`` every case whose median is more than ``--tolerance``
+times the baseline median is reported and the exit status is 1. Cases too
+large for this machine (see ``--max-cells``) are recorded as skipped.
+
+The GUI methods (fit_data, apply_tts, smooth_curve) are thin wrappers,
+so the core functions they call are timed instead; plot refreshes use an
+Agg canvas and need no display. Startup is tracked as the import time of
+the GUI module in a fresh interpreter.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import wlf_batch  # noqa: E402
+import wlf_core  # noqa: E402
+import wlf_io  # noqa: E402
+import wlf_master  # noqa: E402
+import wlf_shift  # noqa: E402
+
+C1_TRUE, C2_TRUE = 8.86, 101.6
+T_REF = 20.0
+# Larger cases (isotherms x points) are recorded as skipped
+MAX_CELLS = 4_000_000
+MAX_EXCEL_CELLS = 200_000
+MAX_PLOT_POINTS = 1_000_000
+MAX_SHIFT_FIT_POINTS = 1_000_000
+# Reference temperatures (T_REF ± this, °C) of the dense C1 x C2 x T_r search
+SHARDED_T_R_SPAN = 5.0
+# Shortest timed sample; faster calls are repeated within one sample
+MIN_SAMPLE_SECONDS = 0.05
+
+
+def make_dma_table(n_isotherms, n_points, noise=0.01, seed=0):
+    """Synthetic DMA table: frequency index, one modulus column per °C."""
+    rng = np.random.default_rng(seed)
+    freqs = np.logspace(-1, 2, n_points)
+    temperatures = np.linspace(-40, 80, n_isotherms).round(2)
+    log_aT = wlf_core.wlf(temperatures + 273.15, C1_TRUE, C2_TRUE, T_REF + 273.15)
+    master = wlf_master.PronyFit(np.logspace(-10, 6, 12), np.full(12, 150.0), 3.0,
+                                 'storage', 0.0)
+    values = wlf_master.prony_modulus(master, np.outer(freqs, 10 ** log_aT).ravel())
+    values = values.reshape(n_points, n_isotherms)
+    values *= 1 + rng.normal(0, noise, values.shape)
+    return pd.DataFrame(values, index=freqs, columns=temperatures), log_aT
+
+
+def time_call(func, repeat):
+    """min/median/mean seconds per ``func()`` call over ``repeat`` samples.
+
+    Fast calls are looped (like ``timeit``'s autorange) until one sample
+    takes at least ``MIN_SAMPLE_SECONDS``.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_SECONDS or number >= 10_000:
+            break
+        number *= 10
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {'min': min(times), 'median': float(np.median(times)),
+            'mean': float(np.mean(times)), 'repeat': repeat, 'number': number}
+
+
+def _plot_refresh(shifted_data, shifted_freqs):
+    figure = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    for temp in shifted_data.columns:
+        ax.plot(shifted_freqs[temp], shifted_data[temp])
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    canvas.draw()
+
+
+def _fit_model(model, T, log_aT, T_r):
+    # A fit that leaves the model ranges is timed too; the pipeline then
+    # uses the grid optimum
+    try:
+        return wlf_core.fit_model(model, T, log_aT, T_r)
+    except wlf_core.FitError:
+        return None
+
+
+def table_cases(data, log_aT, tmp_dir, max_cells=MAX_CELLS):
+    """(name, func, skip reason) for one DMA table."""
+    n_points, n_isotherms = data.shape
+    cells = data.size
+    T = np.asarray(data.columns, dtype=float) + 273.15
+    T_r = T_REF + 273.15
+    params = (C1_TRUE, C2_TRUE, T_r)
+    shifted = wlf_core.shift_data(data, params=params)
+    points = wlf_master.master_points(*shifted)
+
+    # Input files carry the frequency as their first column
+    table = data.rename_axis('Frequency (Hz)').reset_index()
+
+    def io_case(ext, use_cache=False):
+        # The cached read gets its own file so the timed writes keep it valid
+        path = os.path.join(tmp_dir, 'bench{0}.{1}'.format('_cached' if use_cache else '', ext))
+        if not os.path.exists(path):
+            wlf_io.write_table(path, table)
+        return (lambda: wlf_io.write_table(path, table),
+                lambda: wlf_io.read_dma_table(path, cache_dir=tmp_dir, use_cache=use_cache))
+
+    cases = [
+        ('calculate_sse', lambda: wlf_core.calculate_sse(T, log_aT, C1_TRUE, C2_TRUE, T_r), None),
+        ('grid_search', lambda: wlf_core.grid_search(T, log_aT, T_r), None),
+        ('sse_landscape', lambda: wlf_core.sse_landscape(T, log_aT, T_r), None),
+        ('apply_tts', lambda: wlf_core.shift_data(data, params=params), None),
+        ('smooth_curve[spline]', lambda: wlf_master.smooth_master(*points, method='spline'), None),
+        ('smooth_curve[binned]', lambda: wlf_master.smooth_master(*points, method='binned'), None),
+    ]
+    for method in wlf_core.FIT_METHODS:
+        cases.append(('fit_data[{0}]'.format(method),
+                      lambda method=method: wlf_core.fit_wlf(T, log_aT, T_r, method=method),
+                      None))
+    # Dense C1 x C2 x T_r mesh on one core and on all of them
+    C_axis = wlf_core.grid_axis(0.5, 200.5, 0.5)
+    T_r_values = wlf_core.grid_axis(T_r - SHARDED_T_R_SPAN, T_r + SHARDED_T_R_SPAN,
+                                    wlf_batch.REFERENCE_STEP)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        cases.append(('sharded_grid_search[{0} workers]'.format(workers),
+                      lambda workers=workers: wlf_batch.sharded_grid_search(
+                          'WLF', T, log_aT, (C_axis, C_axis), T_r_values, workers=workers),
+                      None))
+    for model in wlf_core.SHIFT_MODELS:
+        cases.append(('fit_model[{0}]'.format(model),
+                      lambda model=model: _fit_model(model, T, log_aT, T_r),
+                      None))
+
+    for ext, limit in (('xlsx', min(MAX_EXCEL_CELLS, max_cells)), ('csv', max_cells),
+                       ('parquet', max_cells), ('npz', max_cells)):
+        skip = 'more than {0} cells'.format(limit) if cells > limit else None
+        if ext == 'parquet' and skip is None:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                skip = 'pyarrow is not installed'
+        if skip:
+            cases.append(('write[{0}]'.format(ext), None, skip))
+            cases.append(('read[{0}]'.format(ext), None, skip))
+            continue
+        write, read = io_case(ext)
+        cases.append(('write[{0}]'.format(ext), write, None))
+        cases.append(('read[{0}]'.format(ext), read, None))
+    if cells <= min(MAX_EXCEL_CELLS, max_cells):
+        _, cached = io_case('xlsx', use_cache=True)
+        cached()
+        cases.append(('read[xlsx, cached]', cached, None))
+
+    fit_skip = 'more than {0} points'.format(MAX_SHIFT_FIT_POINTS) \
+        if cells > MAX_SHIFT_FIT_POINTS else None
+    cases.append(('fit_shifts', lambda: wlf_shift.fit_shifts(data, log_aT), fit_skip))
+
+    plot_skip = 'more than {0} points'.format(MAX_PLOT_POINTS) if cells > MAX_PLOT_POINTS else None
+    cases.append(('plot_refresh', lambda: _plot_refresh(*shifted), plot_skip))
+    return cases
+
+
+def startup_cases(tmp_dir):
+    """Import time of the GUI module in a fresh interpreter.
+
+    'cold' starts without the settings file (fonts are scanned), 'warm'
+    reads the cached font choice.
+    """
+    env = dict(os.environ, WLF_CONFIG_DIR=os.path.join(tmp_dir, 'config'))
+    command = [sys.executable, '-c', 'import WLF_250718']
+
+    def start(cold):
+        if cold:
+            settings = os.path.join(env['WLF_CONFIG_DIR'], 'settings.json')
+            if os.path.exists(settings):
+                os.remove(settings)
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        start(cold=False)
+        skip = None
+    except subprocess.CalledProcessError:
+        skip = 'the GUI module cannot be imported here'
+    return [('startup[cold]', lambda: start(cold=True), skip),
+            ('startup[warm]', lambda: start(cold=False), skip)]
+
+
+def run(isotherms, points, repeat, max_cells=MAX_CELLS):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, func, skip in startup_cases(tmp_dir):
+            row = {'name': name, 'params': {'isotherms': 0, 'points': 0}}
+            if skip:
+                row['skipped'] = skip
+            else:
+                row.update(time_call(func, repeat))
+            results.append(row)
+            print("{0:<12} {1:<22} {2}".format(
+                'startup', name, row.get('skipped') or '{0:.6f} s'.format(row['median'])))
+    for n_isotherms in isotherms:
+        for n_points in points:
+            case_params = {'isotherms': n_isotherms, 'points': n_points}
+            if n_isotherms * n_points > 8 * max_cells:
+                results.append(dict(name='*', params=case_params,
+                                    skipped='more than {0} cells'.format(8 * max_cells)))
+                print("{0:>3} x {1:<8} skipped".format(n_isotherms, n_points))
+                continue
+            data, log_aT = make_dma_table(n_isotherms, n_points)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                for name, func, skip in table_cases(data, log_aT, tmp_dir, max_cells):
+                    row = {'name': name, 'params': case_params}
+                    if skip:
+                        row['skipped'] = skip
+                    else:
+                        row.update(time_call(func, repeat))
+                    results.append(row)
+                    print("{0:>3} x {1:<8} {2:<22} {3}".format(
+                        n_isotherms, n_points, name,
+                        row.get('skipped') or '{0:.6f} s'.format(row['median'])))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Cases whose median got slower than ``tolerance`` x the baseline."""
+    def key(row):
+        return row['name'], row['params']['isotherms'], row['params']['points']
+
+    before = {key(row): row['median'] for row in baseline['results'] if 'median' in row}
+    slower = []
+    for row in results:
+        old = before.get(key(row))
+        if old and 'median' in row and row['median'] > tolerance * old:
+            slower.append((key(row), old, row['median']))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--isotherms', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--points', type=int, nargs='+', default=[100, 10_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-cells', type=int, default=MAX_CELLS,
+                        help="largest table (isotherms x points) written/read as a file; "
+                             "tables over 8x this are skipped (default: %(default)s)")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON results file (default: %(default)s)")
+    parser.add_argument('--compare', help="baseline JSON from an earlier run")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="allowed median slowdown vs the baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    # Exact synthetic data makes curve_fit warn about its covariance
+    warnings.simplefilter('ignore')
+    results = run(args.isotherms, args.points, args.repeat, args.max_cells)
+    report = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'matplotlib': matplotlib.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print("Results written to {0}".format(args.output))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            slower = compare(results, json.load(f), args.tolerance)
+        for (name, n_isotherms, n_points), old, new in slower:
+            print("SLOWER {0} ({1} x {2}): {3:.6f} s -> {4:.6f} s".format(
+                name, n_isotherms, n_points, old, new))
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import threading
+
+import numpy as np
+import pytest
+
+import wlf_batch
+import wlf_core
+
+T_R_VALUES = wlf_core.grid_axis(303.15, 323.15, 2.5)
+
+
+def _data():
+    T = np.array([-30.0, -10.0, 0.0, 10.0, 20.0, 40.0, 60.0]) + 273.15
+    noise = np.random.default_rng(0).normal(0, 0.05, T.size)
+    return T, wlf_core.wlf(T, 8.86, 101.6, 313.15) + noise
+
+
+def _axes(model):
+    return [wlf_core.grid_axis(lower, upper, 4 * coarse)
+            for lower, upper, coarse, _ in wlf_core.get_model(model).ranges]
+
+
+@pytest.mark.parametrize('model', ['WLF', 'WLF/Arrhenius'])
+def test_sharded_search_is_independent_of_workers(model):
+    T, log_aT = _data()
+    axes = _axes(model)
+    # Small tiles, so every worker merges several of them
+    kwargs = dict(top_k=50, tile_elements=2000)
+    single = wlf_batch.sharded_grid_search(model, T, log_aT, axes, T_R_VALUES,
+                                           workers=1, **kwargs)
+    pooled = wlf_batch.sharded_grid_search(model, T, log_aT, axes, T_R_VALUES,
+                                           workers=2, **kwargs)
+    assert single.shape == (50, len(axes) + 2)
+    np.testing.assert_allclose(pooled[:, -1], single[:, -1], rtol=1e-12)
+    np.testing.assert_array_equal(pooled[:, :-1], single[:, :-1])
+
+
+def test_sharded_search_matches_the_dense_surface():
+    T, log_aT = _data()
+    axes = _axes('WLF')
+    rows = wlf_batch.sharded_grid_search('WLF', T, log_aT, axes, T_R_VALUES,
+                                         top_k=20, workers=1, tile_elements=500)
+    surfaces = np.stack([wlf_core.model_sse_grid('WLF', T, log_aT, T_r, axes)
+                         for T_r in T_R_VALUES])
+    np.testing.assert_allclose(rows[:, -1], np.sort(surfaces.ravel())[:20], rtol=1e-12)
+    for C1, C2, T_r, sse in rows[:3]:
+        assert sse == pytest.approx(wlf_core.calculate_sse(T, log_aT, C1, C2, T_r))
+
+
+def test_sharded_search_cancel_and_progress():
+    T, log_aT = _data()
+    seen = []
+    wlf_batch.sharded_grid_search('WLF', T, log_aT, _axes('WLF'), T_R_VALUES, workers=1,
+                                  tile_elements=500, progress=seen.append)
+    assert seen[-1] == pytest.approx(1.0) and seen == sorted(seen)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(wlf_core.Cancelled):
+        wlf_batch.sharded_grid_search('WLF', T, log_aT, _axes('WLF'), T_R_VALUES,
+                                      workers=1, cancel=cancel)
+
+
+def test_joint_search_finds_the_reference_temperature():
+    T, log_aT = _data()
+    rows = wlf_batch.joint_grid_search('WLF', T, log_aT, T_R_VALUES, top_k=1, workers=1)
+    assert rows[0, 2] == pytest.approx(313.15)
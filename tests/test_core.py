@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+import wlf_core
+
+T_R = 313.15
+
+
+def _data():
+    T = np.array([-30.0, -10.0, 0.0, 10.0, 20.0, 40.0, 60.0]) + 273.15
+    noise = np.random.default_rng(0).normal(0, 0.05, T.size)
+    return T, wlf_core.wlf(T, 8.86, 101.6, T_R) + noise
+
+
+def test_sse_surface_matches_calculate_sse():
+    T, log_aT = _data()
+    C1_values = wlf_core.grid_axis(0.5, 30.5, 1.5)
+    C2_values = wlf_core.grid_axis(20.5, 200.5, 4.5)
+    # A small block size runs the chunk loop many times
+    surface = wlf_core.sse_surface(T, log_aT, T_R, C1_values, C2_values,
+                                   chunk_elements=50)
+    expected = np.array([[wlf_core.calculate_sse(T, log_aT, C1, C2, T_R)
+                          for C2 in C2_values] for C1 in C1_values])
+    np.testing.assert_allclose(surface, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('model', list(wlf_core.SHIFT_MODELS))
+def test_model_sse_grid_matches_model_sse(model):
+    T, log_aT = _data()
+    model = wlf_core.get_model(model)
+    axes = [wlf_core.grid_axis(lower, upper, 3 * coarse)
+            for lower, upper, coarse, _ in model.ranges]
+    surface = wlf_core.model_sse_grid(model, T, log_aT, T_R, axes, chunk_elements=100)
+    for index in [(0,) * len(axes), tuple(a.size // 2 for a in axes),
+                  tuple(a.size - 1 for a in axes)]:
+        p = [axis[i] for axis, i in zip(axes, index)]
+        assert surface[index] == pytest.approx(
+            wlf_core.model_sse(model, p, T, log_aT, T_R), rel=1e-12)
+
+
+# Parameters away from the WLF/Arrhenius kink at T = Tg
+JACOBIAN_POINTS = {
+    'WLF': [(8.86, 101.6), (17.4, 51.6)],
+    'Arrhenius': [(150.0,)],
+    'WLF/Arrhenius': [(8.86, 101.6, 200.0, 258.15), (12.0, 80.0, 300.0, 278.15)],
+    'Kaelble': [(8.86, 101.6), (17.4, 51.6)],
+}
+
+
+@pytest.mark.parametrize('model', list(wlf_core.SHIFT_MODELS))
+def test_jacobian_matches_finite_differences(model):
+    T, _ = _data()
+    model = wlf_core.get_model(model)
+    for p in JACOBIAN_POINTS[model.name]:
+        p = np.array(p)
+        J = model.jacobian(p, T, T_R)
+        assert J.shape == (T.size, p.size)
+        for k in range(p.size):
+            h = 1e-6 * max(1.0, abs(p[k]))
+            step = np.zeros(p.size)
+            step[k] = h
+            numeric = (model.evaluate(p + step, T, T_R)[0]
+                       - model.evaluate(p - step, T, T_R)[0]) / (2 * h)
+            np.testing.assert_allclose(J[:, k], numeric, rtol=1e-6, atol=1e-8)
+
+
+def test_wlf_fit_methods_agree():
+    T, log_aT = _data()
+    reference = wlf_core.fit_wlf(T, log_aT, T_R, method='curve_fit')
+    np.testing.assert_allclose(wlf_core.fit_wlf(T, log_aT, T_R, method='lm'),
+                               reference, rtol=1e-5)
+    # The linearized estimate is only a starting guess
+    C1, C2 = wlf_core.fit_wlf(T, log_aT, T_R, method='linear')
+    assert C1 > 0 and C2 > 0
+
+
+def test_linear_fit_is_exact_on_clean_data():
+    T, _ = _data()
+    log_aT = wlf_core.wlf(T, 8.86, 101.6, T_R)
+    np.testing.assert_allclose(wlf_core.fit_wlf_linear(T, log_aT, T_R), (8.86, 101.6),
+                               rtol=1e-9)
+
+
+def test_grid_search_finds_the_sse_minimum():
+    T, log_aT = _data()
+    C1_values, C2_values, surface = wlf_core.grid_search(T, log_aT, T_R)
+    best = wlf_core.rank_surface(surface, C1_values, C2_values, limit=1)[0]
+    C1, C2 = wlf_core.fit_wlf(T, log_aT, T_R)
+    assert abs(best[0] - C1) <= 0.5 and abs(best[1] - C2) <= 0.5
+    assert best[2] == pytest.approx(surface.min())
+
+
+def test_rank_grid_limit_keeps_the_best_rows():
+    surface = np.random.default_rng(1).random((20, 30))
+    surface[3, 4] = np.nan
+    axes = (np.arange(20.0), np.arange(30.0))
+    full = wlf_core.rank_grid(surface, axes)
+    assert len(full) == surface.size - 1
+    np.testing.assert_array_equal(wlf_core.rank_grid(surface, axes, limit=15), full[:15])
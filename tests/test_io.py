@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import wlf_core
+import wlf_io
+
+FORMATS = ['xlsx', 'csv', 'parquet', 'npz']
+
+
+def _sheets():
+    rng = np.random.default_rng(0)
+    return {'{0}°C'.format(temp): pd.DataFrame({
+                'Frequency (Hz)': np.logspace(-1, 2, 5) * 10.0 ** (-temp / 10),
+                'Modulus (MPa)': rng.uniform(1, 1000, 5)})
+            for temp in (-20, 0, 20)}
+
+
+def _skip_missing(fmt):
+    if fmt == 'parquet':
+        pytest.importorskip('pyarrow')
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_sheets_round_trip(tmp_path, fmt):
+    _skip_missing(fmt)
+    path = str(tmp_path / 'a_shifted.{0}'.format(fmt))
+    sheets = _sheets()
+    wlf_io.write_sheets(path, sheets)
+    result = wlf_io.read_sheets(path)
+    assert sorted(result) == sorted(sheets)
+    for name, df in sheets.items():
+        pd.testing.assert_frame_equal(result[name], df)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_single_table_round_trip(tmp_path, fmt):
+    _skip_missing(fmt)
+    path = str(tmp_path / 'a_aT.{0}'.format(fmt))
+    df = _sheets()['0°C']
+    wlf_io.write_table(path, df)
+    result = wlf_io.read_sheets(path)
+    assert list(result) == [wlf_io.DEFAULT_SHEET]
+    pd.testing.assert_frame_equal(result[wlf_io.DEFAULT_SHEET], df)
+    pd.testing.assert_frame_equal(wlf_io.read_table(path), df)
+
+
+def test_sheet_files_ignore_other_tables(tmp_path):
+    wlf_io.write_sheets(str(tmp_path / 'a.csv'), _sheets())
+    wlf_io.write_table(str(tmp_path / 'b.csv'), _sheets()['0°C'])
+    assert sorted(wlf_io.read_sheets(str(tmp_path / 'a.csv'))) == sorted(_sheets())
+    with pytest.raises(FileNotFoundError):
+        wlf_io.read_sheets(str(tmp_path / 'c.csv'))
+
+
+def _dma_table(n_points=57, temps=(-20.0, 0.0, 20.0, 40.0)):
+    freqs = np.logspace(-1, 2, n_points)
+    rng = np.random.default_rng(2)
+    return pd.DataFrame(rng.uniform(1, 1000, (n_points, len(temps))),
+                        index=pd.Index(freqs, name='Frequency (Hz)'), columns=list(temps))
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'xlsx'])
+def test_stream_tts_matches_in_memory_table(tmp_path, fmt):
+    _skip_missing(fmt)
+    data = _dma_table()
+    in_path = str(tmp_path / 'dma.{0}'.format(fmt))
+    out_path = str(tmp_path / 'tts.{0}'.format(fmt))
+    if fmt == 'xlsx':
+        data.to_excel(in_path)
+    else:
+        wlf_io.write_table(in_path, data.reset_index().rename(columns=str))
+    params = (8.86, 101.6, 293.15)
+
+    # A block size that does not divide the row count
+    written = wlf_io.stream_tts(
+        in_path, out_path,
+        lambda temps: wlf_core.aT_for_temperatures(temps, params=params), chunk_rows=10)
+
+    expected = wlf_io.tts_table(*wlf_core.shift_data(data, params=params))
+    result = wlf_io.read_table(out_path)
+    assert written == len(expected)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(), rtol=1e-12)
+
+
+def _count_excel_reads(monkeypatch):
+    calls = []
+    read_excel = pd.read_excel
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(wlf_io.pd, 'read_excel', counting)
+    return calls
+
+
+def test_dma_cache_hit_and_invalidation(tmp_path, monkeypatch):
+    path = str(tmp_path / 'dma.xlsx')
+    cache_dir = str(tmp_path / 'cache')
+    data = _dma_table()
+    data.to_excel(path)
+    calls = _count_excel_reads(monkeypatch)
+
+    first = wlf_io.read_dma_table(path, cache_dir=cache_dir)
+    second = wlf_io.read_dma_table(path, cache_dir=cache_dir)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(second, first)
+    np.testing.assert_allclose(second.to_numpy(), data.to_numpy())
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A changed file is parsed again and cached under a new key
+    (data * 2).to_excel(path)
+    third = wlf_io.read_dma_table(path, cache_dir=cache_dir)
+    assert len(calls) == 2
+    np.testing.assert_allclose(third.to_numpy(), 2 * data.to_numpy())
+
+    wlf_io.read_dma_table(path, cache_dir=cache_dir, use_cache=False)
+    assert len(calls) == 3
+
+    # Same mtime and size but other content: the stored digest no longer
+    # matches, so the (now corrupt) workbook is parsed instead of served
+    stat = os.stat(path)
+    with open(path, 'r+b') as f:
+        f.seek(stat.st_size // 2)
+        byte = f.read(1)
+        f.seek(stat.st_size // 2)
+        f.write(bytes([byte[0] ^ 1]))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with pytest.raises(Exception):
+        wlf_io.read_dma_table(path, cache_dir=cache_dir)
+    assert len(calls) == 4
+
+
+def test_dma_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / 'dma{0}.xlsx'.format(i))
+        (_dma_table() + i).to_excel(path)
+        paths.append(path)
+    wlf_io.read_dma_table(paths[0], cache_dir=cache_dir)
+    entry_size = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+    max_bytes = int(2.5 * entry_size)
+
+    wlf_io.read_dma_table(paths[1], cache_dir=cache_dir, max_bytes=max_bytes)
+    # Make the first entry the older one, then touch it with a cache hit
+    for age, path in ((1_000_000, paths[0]), (2_000_000, paths[1])):
+        entry = os.path.join(cache_dir, wlf_io._cache_key(path) + '.npz')
+        os.utime(entry, (age, age))
+    calls = _count_excel_reads(monkeypatch)
+    wlf_io.read_dma_table(paths[0], cache_dir=cache_dir, max_bytes=max_bytes)
+    assert calls == []
+
+    wlf_io.read_dma_table(paths[2], cache_dir=cache_dir, max_bytes=max_bytes)
+    calls.clear()
+    wlf_io.read_dma_table(paths[0], cache_dir=cache_dir, max_bytes=max_bytes)
+    wlf_io.read_dma_table(paths[2], cache_dir=cache_dir, max_bytes=max_bytes)
+    assert calls == []
+    wlf_io.read_dma_table(paths[1], cache_dir=cache_dir, max_bytes=max_bytes)
+    assert calls == [paths[1]]
+    assert len([n for n in os.listdir(cache_dir) if n.endswith('.npz')]) == 2
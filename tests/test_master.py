@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+import wlf_master
+from wlf_master import _binned_median
+
+
+def _lexsort_binned_median(x, y, n_bins):
+    # Reference: the (bin, y) lexsort the offset sort replaced
+    edges = np.linspace(x[0], x[-1], n_bins + 1)
+    bins = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[counts > 0]
+    counts = counts[counts > 0]
+    lo, hi = starts + (counts - 1) // 2, starts + counts // 2
+    y_sorted = y[np.lexsort((y, bins))]
+    return 0.5 * (x[lo] + x[hi]), 0.5 * (y_sorted[lo] + y_sorted[hi]), counts
+
+
+def _assert_same(x, y, n_bins):
+    expected = _lexsort_binned_median(x, y, n_bins)
+    result = _binned_median(x, y, n_bins)
+    for got, want in zip(result, expected):
+        np.testing.assert_allclose(got, want, rtol=0, atol=1e-9)
+
+
+def test_random_log_data():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(-6, 9, 5000))
+    y = 2 * np.tanh(x / 3) + rng.normal(0, 0.3, x.size)
+    for n_bins in (1, 7, 200, 5000):
+        _assert_same(x, y, n_bins)
+
+
+def test_ties():
+    rng = np.random.default_rng(1)
+    x = np.sort(np.repeat(rng.uniform(0, 10, 50), 4))
+    y = rng.integers(-3, 4, x.size).astype(float)
+    _assert_same(x, y, 12)
+
+
+def test_single_point_bins():
+    # Sparse ends leave bins with one point and empty bins in between
+    x = np.concatenate(([-10.0], np.linspace(0, 1, 101), [5.0, 20.0]))
+    y = np.sin(x) * 1e3
+    _assert_same(x, y, 30)
+    x_med, y_med, counts = _binned_median(x, y, 30)
+    assert counts[0] == 1 and counts[-1] == 1
+    np.testing.assert_allclose(y_med[[0, -1]], y[[0, -1]], rtol=1e-12)
+
+
+def _nnls_problems():
+    rng = np.random.default_rng(3)
+    for m, n in ((30, 8), (60, 20), (10, 25)):
+        A = rng.normal(size=(m, n))
+        yield A, rng.normal(size=m)
+    # The ill-conditioned storage Prony basis
+    freqs = np.logspace(-2, 3, 80)
+    A = wlf_master.prony_basis(freqs, wlf_master.prony_times(freqs, 15))
+    yield A, A @ rng.uniform(0, 5, 15) * (1 + rng.normal(0, 0.01, 80))
+
+
+def test_nnls_matches_scipy():
+    scipy_nnls = pytest.importorskip('scipy.optimize').nnls
+    for A, b in _nnls_problems():
+        x = wlf_master.nnls(A, b)
+        expected, _ = scipy_nnls(A, b)
+        assert (x >= 0).all()
+        # Compare the objective; ill-conditioned bases allow several minimisers
+        assert np.linalg.norm(A @ x - b) == pytest.approx(
+            np.linalg.norm(A @ expected - b), rel=1e-6, abs=1e-10)
+
+
+def test_nnls_warm_start_gives_the_same_solution():
+    for A, b in _nnls_problems():
+        x = wlf_master.nnls(A, b)
+        for passive in (x > 0, np.ones(A.shape[1], dtype=bool)):
+            warm = wlf_master.nnls(A, b, passive=passive)
+            assert np.linalg.norm(A @ warm - b) == pytest.approx(
+                np.linalg.norm(A @ x - b), rel=1e-6, abs=1e-10)
+
+
+@pytest.mark.parametrize('kind', wlf_master.PRONY_KINDS)
+def test_fit_prony_matches_scipy_on_the_full_system(kind):
+    scipy_nnls = pytest.importorskip('scipy.optimize').nnls
+    freqs = np.logspace(-3, 4, 300)
+    truth = wlf_master.PronyFit(np.logspace(-4, 2, 6), np.array([50, 20, 80, 5, 40, 10.0]),
+                                3.0 if kind == 'storage' else 0.0, kind, 0.0)
+    values = wlf_master.prony_modulus(truth, freqs)
+    values *= 1 + np.random.default_rng(4).normal(0, 0.02, freqs.size)
+
+    # Small blocks run the blockwise QR several times
+    fit = wlf_master.fit_prony(freqs, values, n_terms=12, kind=kind, chunk_rows=64)
+
+    # The same relative-residual problem, built whole
+    A = wlf_master.prony_basis(freqs, fit.tau, kind)
+    if kind == 'storage':
+        A = np.column_stack((np.ones(freqs.size), A))
+    coef, norm = scipy_nnls(A / values[:, None], np.ones(freqs.size))
+    rms = norm / np.sqrt(freqs.size)
+    assert fit.rms == pytest.approx(rms, rel=1e-6)
+    np.testing.assert_allclose(wlf_master.prony_modulus(fit, freqs), A @ coef, rtol=1e-4)
+    assert fit.rms < 0.1
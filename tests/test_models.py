@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import wlf_batch
+import wlf_core
+
+T_R = 293.15
+
+
+def _wlf_data(celsius, noise=0.0):
+    T = np.asarray(celsius, dtype=float) + 273.15
+    log_aT = wlf_core.wlf(T, 8.86, 101.6, T_R)
+    return T, log_aT + np.random.default_rng(0).normal(0, noise, T.size)
+
+
+@pytest.mark.parametrize('method', wlf_core.FIT_METHODS)
+@pytest.mark.parametrize('model', list(wlf_core.SHIFT_MODELS))
+def test_fits_stay_inside_ranges(model, method):
+    # Below T_r only, where Kaelble and the linearized guesses run off
+    T, log_aT = _wlf_data(np.arange(-40, 21, 10), noise=0.05)
+    lower, upper = wlf_core.model_bounds(model)
+    try:
+        params = wlf_core.fit_model(model, T, log_aT, T_R, method=method)
+    except wlf_core.FitError:
+        return
+    assert np.all((np.array(params) > lower) & (np.array(params) < upper))
+
+
+def test_diverging_kaelble_fit_raises():
+    T, log_aT = _wlf_data(np.arange(-40, 21, 10), noise=0.05)
+    with pytest.raises(wlf_core.FitError, match='left the model ranges'):
+        wlf_core.fit_model('Kaelble', T, log_aT, T_R, method='lm')
+
+
+def test_lm_start_is_clipped():
+    T, log_aT = _wlf_data(np.arange(-30, 81, 10))
+    params = wlf_core.fit_model_lm('Kaelble', T, log_aT, T_R, p0=(-5.0, 1e6))
+    lower, upper = wlf_core.model_bounds('Kaelble')
+    assert np.all((np.array(params) >= lower) & (np.array(params) <= upper))
+
+
+def test_clean_wlf_data_is_recovered():
+    T, log_aT = _wlf_data(np.arange(-30, 81, 10))
+    for model in ('WLF', 'WLF/Arrhenius'):
+        params = wlf_core.fit_model(model, T, log_aT, T_R, method='lm')
+        np.testing.assert_allclose(params[:2], (8.86, 101.6), rtol=1e-6)
+
+
+def test_batch_falls_back_to_grid_optimum():
+    T, log_aT = _wlf_data(np.arange(-40, 21, 10), noise=0.05)
+    sample = dict(name='s', temperatures=list(T - 273.15), log_aT=list(log_aT),
+                  reference_temperature=T_R - 273.15,
+                  new_reference_temperature=T_R - 273.15, fit_method='lm')
+    rows = wlf_batch.fit_samples([sample], workers=1, models=['WLF', 'Kaelble'])
+    wlf_row, kaelble_row = rows.to_dict('records')
+    assert 'grid optimum' in wlf_row['Error']
+    assert 'grid optimum' in kaelble_row['Error']
+    for row in (wlf_row, kaelble_row):
+        assert row['C1_curve_fit'] == row['C1'] and row['C2_curve_fit'] == row['C2']
+        assert row['C1'] <= 200.5 and row['C2'] <= 200.5
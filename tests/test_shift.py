@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from wlf_shift import ShiftHistory
+
+
+def _history():
+    return ShiftHistory(np.zeros(3))
+
+
+def test_initial_state():
+    history = _history()
+    np.testing.assert_array_equal(history.current.log_bT, np.zeros(3))
+    assert not history.can_undo and not history.can_redo
+    with pytest.raises(ValueError):
+        history.current.log_aT[0] = 1.0
+    with pytest.raises(ValueError):
+        ShiftHistory(np.zeros(3), np.zeros(2))
+
+
+def test_push_undo_redo():
+    history = _history()
+    first = history.push([1.0, 0.0, 0.0])
+    second = history.push(log_bT=[0.0, 0.5, 0.0])
+    # Unchanged arrays are shared, not copied
+    assert second.log_aT is first.log_aT
+    assert history.undo() is first
+    assert history.undo().log_aT.sum() == 0
+    assert not history.can_undo
+    assert history.undo().log_aT.sum() == 0
+    assert history.redo() is first
+    assert history.redo() is second
+    assert not history.can_redo
+
+
+def test_push_drops_redo_states():
+    history = _history()
+    history.push([1.0, 0.0, 0.0])
+    history.undo()
+    state = history.push([2.0, 0.0, 0.0])
+    assert not history.can_redo
+    assert history.undo().log_aT.sum() == 0
+    assert history.redo() is state
+
+
+def test_unchanged_push_records_nothing():
+    history = _history()
+    state = history.push([1.0, 0.0, 0.0])
+    assert history.push([1.0, 0.0, 0.0]) is state
+    history.undo()
+    assert not history.can_undo
+
+
+def test_replace_merges_one_drag():
+    history = _history()
+    for value in (0.1, 0.2, 0.3):
+        history.push([value, 0.0, 0.0], replace=value > 0.1)
+    np.testing.assert_allclose(history.current.log_aT, [0.3, 0.0, 0.0])
+    assert history.undo().log_aT.sum() == 0
+    assert not history.can_undo
+
+
+def test_replace_never_overwrites_the_initial_state():
+    history = _history()
+    history.push([1.0, 0.0, 0.0], replace=True)
+    assert history.can_undo
+    assert history.undo().log_aT.sum() == 0
+
+
+def test_consecutive_drags_are_separate_steps():
+    history = _history()
+    history.shift(0, d_log_aT=0.2)
+    history.shift(0, d_log_aT=0.1, replace=True)
+    history.shift(1, d_log_bT=0.5)
+    np.testing.assert_allclose(history.current.log_aT, [0.3, 0.0, 0.0])
+    np.testing.assert_allclose(history.undo().log_bT, np.zeros(3))
+    np.testing.assert_allclose(history.current.log_aT, [0.3, 0.0, 0.0])
+    assert history.undo().log_aT.sum() == 0
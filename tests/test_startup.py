@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import time budget of the GUI module, in seconds (about 1 s here)
+STARTUP_BUDGET = float(os.environ.get('WLF_STARTUP_BUDGET', 3.0))
+
+# Times the import inside the child, so interpreter start-up is left out
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import WLF_250718
+print(json.dumps({'seconds': time.perf_counter() - start,
+                  'modules': sorted(m for m in sys.modules if m.split('.')[0] == 'scipy')}))
+"""
+
+
+def _import_gui(config_dir):
+    env = dict(os.environ, WLF_CONFIG_DIR=str(config_dir), MPLBACKEND='Agg')
+    result = subprocess.run([sys.executable, '-c', _CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope='module')
+def startup(tmp_path_factory):
+    pytest.importorskip('tkinter')
+    config_dir = tmp_path_factory.mktemp('config')
+    cold = _import_gui(config_dir)
+    # The second start reads the cached font choice
+    warm = min((_import_gui(config_dir) for _ in range(3)), key=lambda r: r['seconds'])
+    return cold, warm
+
+
+def test_startup_within_budget(startup):
+    cold, warm = startup
+    assert warm['seconds'] < STARTUP_BUDGET, \
+        "import WLF_250718 took {0:.2f} s (budget {1} s)".format(warm['seconds'], STARTUP_BUDGET)
+    assert cold['seconds'] < 2 * STARTUP_BUDGET
+
+
+def test_startup_does_not_import_scipy(startup):
+    for run in startup:
+        assert run['modules'] == []
+
+
+def test_font_choice_is_cached(startup, tmp_path):
+    _import_gui(tmp_path)
+    with open(os.path.join(tmp_path, 'settings.json'), encoding='utf-8') as f:
+        settings = json.load(f)
+    assert settings['font_family']
+    assert settings['font_matplotlib']
@@ -0,0 +1,469 @@
+"""Headless batch runner for the WLF fit / a_T estimation / TTS pipeline.
+
+Usage::
+
+    python wlf_batch.py DATA_DIR --config config.json [--output-dir OUT]
+                        [--pattern *.xlsx] [--format xlsx|csv|parquet|npz]
+                        [--stream] [--jobs N] [--chunksize K]
+
+For in-process use, :func:`fit_samples` fits a list of samples over a
+process pool and returns one summary table; with ``models`` every sample
+is fitted with each shift model, for side-by-side comparison.
+:func:`sharded_grid_search` spreads one dense parameter x T_r mesh over
+all cores through shared memory.
+
+The config is a JSON object::
+
+    {
+        "temperatures": [0, 10, 20, 40],        # Step 1, in °C
+        "log_aT": [1.93, 1.3, 0.9, 0],
+        "reference_temperature": 40,            # Step 2 & 3 T_r, °C
+        "reference_span": 0,                    # >0: search T_r within ± span °C
+        "grid_workers": 1,                      # processes of that joint search
+        "new_reference_temperature": 40,        # Step 4 T_Ref_new, °C
+        "auto_shift": false,                    # log a_T from curve overlap
+        "model": "WLF",                         # or "Arrhenius", "WLF/Arrhenius", "Kaelble"
+        "fit_method": "curve_fit",              # or "linear", "lm"
+        "prony_terms": 0,                       # >0: write <name>_prony (not with --stream)
+        "samples": {"<file stem>": {...}}       # optional per-file overrides
+    }
+
+Nothing here imports tkinter or a matplotlib backend.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import wlf_core
+import wlf_io
+import wlf_master
+import wlf_shift
+
+# Parameter sets x temperatures evaluated per grid-search tile
+GRID_TILE_ELEMENTS = 16_000_000
+# Rows kept by the top-k merge of a sharded grid search
+GRID_TOP_K = 10_000
+# Spacing (°C) of the reference temperatures of a joint T_r search
+REFERENCE_STEP = 0.5
+
+DEFAULT_CONFIG = {
+    'temperatures': [0, 10, 20, 40],
+    'log_aT': [1.93, 1.3, 0.9, 0],
+    'reference_temperature': 40,
+    'new_reference_temperature': 40,
+    'reference_span': 0,
+    'grid_workers': 1,
+    'model': 'WLF',
+    'fit_method': 'curve_fit',
+    'prony_terms': 0,
+}
+
+
+def load_config(path):
+    """Read a JSON pipeline config, filling in the GUI defaults."""
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            config.update(json.load(f))
+    return config
+
+
+def sample_config(config, name):
+    """Config for one input file, with its ``samples`` overrides applied."""
+    merged = {k: v for k, v in config.items() if k != 'samples'}
+    merged.update(config.get('samples', {}).get(name, {}))
+    return merged
+
+
+def run_pipeline(data, config):
+    """Steps 2-5 on one DMA table; returns (summary, aT_table, shifted).
+
+    The summary's ``Error`` entry is empty unless the least-squares fit
+    diverged and the grid optimum was used in its place.
+    """
+    if config.get('auto_shift'):
+        if data is None:
+            raise ValueError("auto_shift needs the DMA table.")
+        temperatures, log_aT_values = wlf_shift.auto_shift(
+            data, float(config['reference_temperature']))
+    else:
+        temperatures = config['temperatures']
+        log_aT_values = config['log_aT']
+    if len(temperatures) != len(log_aT_values):
+        raise ValueError("The number of temperatures and log aT values must be the same.")
+
+    T_data = np.asarray(temperatures, dtype=float) + 273.15
+    log_aT_data = np.asarray(log_aT_values, dtype=float)
+    T_r = float(config['reference_temperature']) + 273.15
+    T_r_new = float(config['new_reference_temperature']) + 273.15
+
+    model = wlf_core.get_model(config.get('model', 'WLF'))
+    span = float(config.get('reference_span') or 0)
+    if span > 0:
+        # The fits below then use the best reference temperature
+        T_r_values = wlf_core.grid_axis(T_r - span, T_r + span, REFERENCE_STEP)
+        rows = joint_grid_search(model, T_data, log_aT_data, T_r_values, top_k=1,
+                                 workers=int(config.get('grid_workers') or 1))
+        if len(rows):
+            T_r = float(rows[0, -2])
+    method = config['fit_method']
+    try:
+        lsq = wlf_core.fit_model(model, T_data, log_aT_data, T_r, method=method)
+        note = ''
+    except wlf_core.FitError as e:
+        lsq, note = None, str(e)
+    best = wlf_core.best_fit(T_data, log_aT_data, T_r, model=model)
+    if best is None:
+        if lsq is None:
+            raise wlf_core.FitError(note)
+        params = tuple(round(value, 1) for value in lsq)
+        sse = wlf_core.model_sse(model, params, T_data, log_aT_data, T_r)
+    else:
+        params, sse = best[:-1], best[-1]
+        if lsq is not None and \
+                wlf_core.model_sse(model, lsq, T_data, log_aT_data, T_r) > sse:
+            lsq, note = None, "The {0} {1} fit stopped in a local minimum.".format(
+                model.name, method)
+    if lsq is None:
+        # A diverged fit is replaced by the grid optimum, and the row says so
+        lsq = params
+        note += " The grid optimum is used."
+
+    aT_table = wlf_core.model_aT_table(model, params, T_r_new)
+    shifted = wlf_core.shift_data(data, params=params + (T_r_new,), model=model) \
+        if data is not None else None
+    summary = {'Model': model.name}
+    summary.update(('{0}_curve_fit'.format(name), value) for name, value in zip(model.params, lsq))
+    summary.update(zip(model.params, params))
+    summary.update({
+        'SSE': sse,
+        'T_r (°C)': T_r - 273.15,
+        'T_r_new (°C)': T_r_new - 273.15,
+        'Error': note,
+    })
+    return summary, aT_table, shifted
+
+
+def write_outputs(output_dir, name, aT_table, shifted, fmt='xlsx'):
+    """Write the Step 4 a_T table and Step 5 shifted data like the GUI does."""
+    wlf_io.write_table(os.path.join(output_dir, '{0}_aT.{1}'.format(name, fmt)), aT_table)
+    if shifted is None:
+        return
+    wlf_io.write_sheets(os.path.join(output_dir, '{0}_shifted.{1}'.format(name, fmt)),
+                        wlf_io.shifted_sheets(*shifted))
+
+
+def process_file(path, config, output_dir, fmt='xlsx', stream=False):
+    """Run the pipeline for one spreadsheet; returns its summary row.
+
+    With ``stream`` the DMA table is never loaded whole: it is shifted block
+    by block into ``<name>_tts.<fmt>`` (the Output TTS layout) instead of the
+    per-temperature shifted workbook.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    row = {'Sample': name}
+    try:
+        if stream:
+            sample = sample_config(config, name)
+            # Only the automatic shift needs the whole table up front
+            data = wlf_io.read_dma_table(path) if sample.get('auto_shift') else None
+            summary, aT_table, _ = run_pipeline(data, sample)
+            write_outputs(output_dir, name, aT_table, None, fmt)
+            model = wlf_core.get_model(summary['Model'])
+            params = tuple(summary[p] for p in model.params) + (summary['T_r_new (°C)'] + 273.15,)
+            wlf_io.stream_tts(path, os.path.join(output_dir, '{0}_tts.{1}'.format(name, fmt)),
+                              lambda temps: wlf_core.aT_for_temperatures(temps, params=params,
+                                                                         model=model))
+        else:
+            sample = sample_config(config, name)
+            data = wlf_io.read_dma_table(path)
+            summary, aT_table, shifted = run_pipeline(data, sample)
+            write_outputs(output_dir, name, aT_table, shifted, fmt)
+            if sample.get('prony_terms'):
+                fit = wlf_master.fit_prony(*wlf_master.master_points(*shifted),
+                                           n_terms=int(sample['prony_terms']))
+                wlf_io.write_table(os.path.join(output_dir, '{0}_prony.{1}'.format(name, fmt)),
+                                   wlf_master.prony_table(fit))
+                summary['Prony RMS'] = fit.rms
+        row.update(summary)
+    except Exception as e:
+        row['Error'] = str(e)
+    return row
+
+
+def _run_chunk(func, chunk):
+    return [func(item) for item in chunk]
+
+
+def map_chunked(func, items, workers=None, chunksize=None):
+    """``[func(item) for item in items]`` spread over a process pool.
+
+    Items are submitted in chunks of ``chunksize`` with at most two chunks
+    per worker in flight, so large batches are never pickled up front.
+    Results come back in input order. ``func`` must be a module-level
+    function; with ``workers=1`` everything runs in this process.
+    """
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    if chunksize is None:
+        chunksize = max(1, -(-len(items) // (workers * 4)))
+
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < 2 * workers:
+                future = pool.submit(_run_chunk, func, chunks[next_chunk])
+                pending[future] = next_chunk
+                next_chunk += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+    return [row for chunk in results for row in chunk]
+
+
+def fit_sample(sample):
+    """Summary row for one sample dict (see :func:`fit_samples`)."""
+    row = {'Sample': sample.get('name', '')}
+    try:
+        config = {k: v for k, v in sample.items() if k not in ('name', 'data')}
+        summary, _, _ = run_pipeline(sample.get('data'), dict(DEFAULT_CONFIG, **config))
+        row.update(summary)
+    except Exception as e:
+        row['Error'] = str(e)
+    return row
+
+
+def fit_samples(samples, workers=None, chunksize=None, models=None):
+    """Fit many samples in parallel and collect one parameter/SSE summary table.
+
+    Each sample is a dict with the keys of the pipeline config
+    (``temperatures``, ``log_aT``, ``reference_temperature``,
+    ``new_reference_temperature``, ``model``) plus an optional ``name`` and
+    an optional DMA ``data`` table to shift. Rows keep the input order.
+    With ``models`` (names of :data:`wlf_core.SHIFT_MODELS`) each sample is
+    fitted once per model, giving consecutive rows per sample in one run;
+    parameters another model does not have are left empty.
+    """
+    if models is not None:
+        samples = [dict(sample, model=model) for sample in samples for model in models]
+    return pd.DataFrame(map_chunked(fit_sample, samples, workers, chunksize))
+
+
+def _share_arrays(arrays):
+    """Copy float arrays into one shared-memory block; returns (block, layout)."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, sum(a.size for a in arrays)) * 8)
+    layout = []
+    offset = 0
+    for array in arrays:
+        np.ndarray(array.size, dtype=float, buffer=block.buf, offset=8 * offset)[:] = array.ravel()
+        layout.append((offset, array.size))
+        offset += array.size
+    return block, layout
+
+
+# Per-process state of a sharded grid search, set by _init_grid_worker
+_GRID = {}
+
+
+def _init_grid_worker(name, layout, model, top_k):
+    block = shared_memory.SharedMemory(name=name)
+    arrays = [np.ndarray(size, dtype=float, buffer=block.buf, offset=8 * offset)
+              for offset, size in layout]
+    _GRID.update(block=block, arrays=arrays, model=model, top_k=top_k)
+
+
+def _grid_tile_worker(tile):
+    return _grid_tile(_GRID['model'], _GRID['arrays'], _GRID['top_k'], tile)
+
+
+def _grid_tile(model, arrays, top_k, tile):
+    """Best ``top_k`` rows (*params, T_r, SSE) of one tile: a single
+    reference temperature and a block of the first parameter axis."""
+    T, log_aT, T_r_values = arrays[:3]
+    axes = list(arrays[3:])
+    r, start, stop = tile
+    axes[0] = axes[0][start:stop]
+    surface = wlf_core.model_sse_grid(model, T, log_aT, T_r_values[r], axes)
+    ranked = wlf_core.rank_grid(surface, axes, limit=top_k)
+    return np.insert(ranked, -1, T_r_values[r], axis=1)
+
+
+def _merge_top_k(best, rows, top_k):
+    rows = np.concatenate((best, rows))
+    if len(rows) > top_k:
+        rows = rows[np.argpartition(rows[:, -1], top_k)[:top_k]]
+    return rows
+
+
+def sharded_grid_search(model, T, log_aT, axes, T_r_values, top_k=GRID_TOP_K, workers=None,
+                        tile_elements=GRID_TILE_ELEMENTS, progress=None, cancel=None):
+    """Dense SSE search over the parameters of ``model`` and T_r jointly.
+
+    ``axes`` holds one value axis per model parameter and ``T_r_values``
+    the reference temperatures (K). The mesh is cut into tiles of one T_r
+    and a block of the first axis of about ``tile_elements`` evaluations.
+    Tiles run on ``workers`` spawned processes that read T, log a_T and the
+    axes from one shared-memory block, and every finished tile is merged
+    into the ``top_k`` best rows of (*params, T_r, SSE), returned best
+    first. ``progress`` and ``cancel`` work as in
+    :func:`wlf_core.sse_surface`; ``workers=1`` runs in this process.
+    """
+    model = wlf_core.get_model(model).name
+    arrays = [np.asarray(T, dtype=float).ravel(), np.asarray(log_aT, dtype=float).ravel(),
+              np.atleast_1d(np.asarray(T_r_values, dtype=float))]
+    arrays += [np.asarray(axis, dtype=float).ravel() for axis in axes]
+    workers = workers or os.cpu_count() or 1
+    n_first, n_T_r = arrays[3].size, arrays[2].size
+    per_row = arrays[0].size * int(np.prod([axis.size for axis in arrays[4:]]))
+    rows = max(1, min(n_first, tile_elements // max(per_row, 1)))
+    # At least four tiles per worker, so the last ones do not run alone
+    rows = max(1, min(rows, -(-n_first * n_T_r // (4 * workers))))
+    tiles = [(r, start, min(start + rows, n_first))
+             for r in range(n_T_r) for start in range(0, n_first, rows)]
+
+    best = np.empty((0, len(axes) + 2))
+    if workers <= 1 or len(tiles) <= 1:
+        for done, tile in enumerate(tiles, 1):
+            if cancel is not None and cancel.is_set():
+                raise wlf_core.Cancelled()
+            best = _merge_top_k(best, _grid_tile(model, arrays, top_k, tile), top_k)
+            if progress is not None:
+                progress(done / len(tiles))
+        return best[np.argsort(best[:, -1], kind='stable')]
+
+    block, layout = _share_arrays(arrays)
+    try:
+        # Spawned workers are safe to start from a GUI thread, and attach to
+        # the shared inputs once instead of unpickling them with every tile
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_grid_worker,
+                                 initargs=(block.name, layout, model, top_k)) as pool:
+            pending = set()
+            next_tile = done = 0
+            while next_tile < len(tiles) or pending:
+                if cancel is not None and cancel.is_set():
+                    for future in pending:
+                        future.cancel()
+                    raise wlf_core.Cancelled()
+                while next_tile < len(tiles) and len(pending) < 2 * workers:
+                    pending.add(pool.submit(_grid_tile_worker, tiles[next_tile]))
+                    next_tile += 1
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    best = _merge_top_k(best, future.result(), top_k)
+                    done += 1
+                if finished and progress is not None:
+                    progress(done / len(tiles))
+    finally:
+        block.close()
+        block.unlink()
+    return best[np.argsort(best[:, -1], kind='stable')]
+
+
+def joint_grid_search(model, T, log_aT, T_r_values, top_k=GRID_TOP_K, workers=None,
+                      progress=None, cancel=None):
+    """Two-stage search of a model's parameters and T_r together.
+
+    The coarse stage covers the model's coarse ``ranges`` at every
+    reference temperature, the fine stage its fine steps within two coarse
+    steps of the coarse best, again at every T_r. Both stages are
+    :func:`sharded_grid_search` runs; the fine stage's rows are returned.
+    """
+    model = wlf_core.get_model(model)
+
+    def stage_progress(offset):
+        if progress is None:
+            return None
+        return lambda fraction: progress(offset + 0.5 * fraction)
+
+    coarse_axes = [wlf_core.grid_axis(lower, upper, coarse)
+                   for lower, upper, coarse, _ in model.ranges]
+    coarse = sharded_grid_search(model, T, log_aT, coarse_axes, T_r_values, top_k=1,
+                                 workers=workers, progress=stage_progress(0.0),
+                                 cancel=cancel)
+    if len(coarse):
+        centres = coarse[0, :-2]
+    else:
+        centres = [axis[axis.size // 2] for axis in coarse_axes]
+    fine_axes = [wlf_core.grid_axis(max(lower, centre - 2 * coarse_step),
+                                    min(upper, centre + 2 * coarse_step), fine_step)
+                 for centre, (lower, upper, coarse_step, fine_step) in zip(centres, model.ranges)]
+    return sharded_grid_search(model, T, log_aT, fine_axes, T_r_values, top_k=top_k,
+                               workers=workers, progress=stage_progress(0.5), cancel=cancel)
+
+
+def _process_file_args(args):
+    return process_file(*args)
+
+
+def find_inputs(input_dir, pattern):
+    return sorted(glob.glob(os.path.join(input_dir, pattern)))
+
+
+def run_batch(paths, config, output_dir, jobs=None, chunksize=None, fmt='xlsx',
+              stream=False):
+    """Process every file over ``jobs`` worker processes; returns a summary."""
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(path, config, output_dir, fmt, stream) for path in paths]
+    return pd.DataFrame(map_chunked(_process_file_args, tasks, jobs, chunksize))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the WLF fit, a_T estimation and TTS shift "
+                    "for a directory of DMA spreadsheets.")
+    parser.add_argument('input_dir', help="directory with DMA spreadsheets")
+    parser.add_argument('--config', help="JSON pipeline config")
+    parser.add_argument('--output-dir', default=None,
+                        help="where results are written (default: INPUT_DIR/wlf_output)")
+    parser.add_argument('--pattern', default='*.xlsx',
+                        help="glob for input files (default: %(default)s)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument('--format', default='xlsx', choices=('xlsx', 'csv', 'parquet', 'npz'),
+                        help="output file format (default: %(default)s)")
+    parser.add_argument('--stream', action='store_true',
+                        help="shift each table block by block into <name>_tts.<format> "
+                             "(csv, parquet or xlsx) with constant memory")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="files per submitted task (default: automatic)")
+    args = parser.parse_args(argv)
+
+    if args.stream and args.format == 'npz':
+        parser.error("--stream needs --format csv, parquet or xlsx")
+
+    config = load_config(args.config)
+    output_dir = args.output_dir or os.path.join(args.input_dir, 'wlf_output')
+    paths = find_inputs(args.input_dir, args.pattern)
+    if not paths:
+        print("No input files matching {0} in {1}".format(args.pattern, args.input_dir),
+              file=sys.stderr)
+        return 1
+
+    summary = run_batch(paths, config, output_dir, jobs=args.jobs,
+                        chunksize=args.chunksize, fmt=args.format,
+                        stream=args.stream)
+    summary_path = os.path.join(output_dir, 'wlf_summary.csv')
+    summary.to_csv(summary_path, index=False)
+    failed = summary['Error'].astype(bool).sum()
+    print("Processed {0} file(s), {1} failed; summary written to {2}".format(
+        len(summary), failed, summary_path))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,812 @@
+"""Numerical core of the WLF analysis program (no GUI dependencies)."""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Temperatures (°C) of the a_T table produced by Step 4
+AT_TABLE_RANGE = (-80, 80, 100)
+# Memory budget for one broadcast block of the grid search, in float64 elements
+GRID_CHUNK_ELEMENTS = 4_000_000
+# Default probability content of the (C1, C2) confidence region
+CONFIDENCE_LEVEL = 0.95
+# Gas constant in kJ/(mol K), for activation energies in kJ/mol
+R_GAS = 8.314462618e-3
+
+
+class Cancelled(Exception):
+    """Raised inside a long computation when its cancel event is set."""
+
+
+class FitError(ValueError):
+    """Raised when a least-squares fit does not converge or leaves the
+    parameter ranges of its model."""
+
+
+# ── WLF model ────────────────────────────────────────────────────────────────
+def wlf(T, C1, C2, T_r):
+    """log(a_T) from the WLF equation; NaN where the denominator vanishes."""
+    denom = C2 + (T - T_r)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(denom == 0, np.nan, -C1 * (T - T_r) / denom)
+    return result
+
+
+def evaluate_wlf(C1, C2, T, T_r, dtype=np.float64, out=None):
+    """log(a_T) for N parameter sets at M temperatures in one broadcast.
+
+    ``C1``, ``C2`` and ``T_r`` are scalars or length-N arrays, ``T`` holds
+    the M temperatures (K). Returns an (N, M) array of ``dtype`` (float32
+    or float64), written into ``out`` when given; NaN where the
+    denominator vanishes.
+    """
+    C1 = np.asarray(C1, dtype=dtype).reshape(-1, 1)
+    C2 = np.asarray(C2, dtype=dtype).reshape(-1, 1)
+    T_r = np.asarray(T_r, dtype=dtype).reshape(-1, 1)
+    T = np.asarray(T, dtype=dtype).reshape(1, -1)
+    shape = (max(C1.shape[0], C2.shape[0], T_r.shape[0]), T.shape[1])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError("out must have shape {0}, not {1}.".format(shape, out.shape))
+
+    np.subtract(T, T_r, out=out)
+    denom = out + C2
+    singular = denom == 0
+    np.multiply(out, -C1, out=out)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(out, denom, out=out)
+    out[singular] = np.nan
+    return out
+
+
+def calculate_sse(T, log_aT, C1, C2, T_r):
+    """Sum of squared log(a_T) residuals, ignoring undefined points."""
+    log_aT_fit = wlf(T, C1, C2, T_r)
+    return np.nansum((log_aT - log_aT_fit) ** 2)
+
+
+FIT_METHODS = ('curve_fit', 'linear', 'lm')
+
+
+def _linearized_c1_c2(u, x, log_aT):
+    """C1, C2 from the straight line x / log a_T = -C2/C1 - u/C1.
+
+    ``x`` is T - T_r and ``u`` the regressor (x for WLF, |x| for Kaelble).
+    Points with log a_T = 0 carry no information and are skipped.
+    """
+    log_aT = np.asarray(log_aT, dtype=float)
+    ok = (log_aT != 0) & np.isfinite(log_aT) & np.isfinite(x)
+    if ok.sum() < 2:
+        raise ValueError("At least two points with log aT != 0 are needed.")
+    u = u[ok]
+    y = x[ok] / log_aT[ok]
+    u_mean, y_mean = u.mean(), y.mean()
+    suu = np.dot(u - u_mean, u - u_mean)
+    if suu == 0:
+        raise ValueError("The temperatures must not all be equal.")
+    slope = np.dot(u - u_mean, y - y_mean) / suu
+    intercept = y_mean - slope * u_mean
+    if slope == 0:
+        raise ValueError("The linearized fit is degenerate.")
+    return -1.0 / slope, intercept / slope
+
+
+def fit_wlf_linear(T, log_aT, T_r):
+    """Closed-form C1, C2 from the linearized WLF equation.
+
+    (T - T_r) / log a_T = -C2/C1 - (T - T_r)/C1 is a straight line in
+    T - T_r, solved by ordinary least squares. Points with log a_T = 0
+    (T = T_r) carry no information and are skipped.
+    """
+    x = np.asarray(T, dtype=float) - T_r
+    return _linearized_c1_c2(x, x, log_aT)
+
+
+def fit_wlf_lm(T, log_aT, T_r, p0=None, max_iter=100, tol=1e-10):
+    """Levenberg-Marquardt C1, C2 with the analytic WLF Jacobian.
+
+    Starts from ``p0`` or, by default, the linearized solution.
+    """
+    x = np.asarray(T, dtype=float) - T_r
+    y = np.asarray(log_aT, dtype=float)
+    if p0 is None:
+        try:
+            p0 = fit_wlf_linear(T, log_aT, T_r)
+        except ValueError:
+            p0 = (17, 52)
+    C1, C2 = float(p0[0]), float(p0[1])
+
+    def residuals(C1, C2):
+        denom = C2 + x
+        r = y + C1 * x / denom
+        r[denom == 0] = 0.0
+        return r, denom
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r, denom = residuals(C1, C2)
+        cost = np.dot(r, r)
+        lam = 1e-3
+        for _ in range(max_iter):
+            # d(log aT)/dC1 = -x/d, d(log aT)/dC2 = C1 x/d^2, with d = C2 + x
+            j1 = -x / denom
+            j2 = -C1 * j1 / denom
+            singular = denom == 0
+            j1[singular] = 0.0
+            j2[singular] = 0.0
+            a11, a12, a22 = np.dot(j1, j1), np.dot(j1, j2), np.dot(j2, j2)
+            g1, g2 = np.dot(j1, r), np.dot(j2, r)
+            while True:
+                b11, b22 = a11 * (1 + lam), a22 * (1 + lam)
+                det = b11 * b22 - a12 * a12
+                if det == 0 or not np.isfinite(det):
+                    return C1, C2
+                d1 = (b22 * g1 - a12 * g2) / det
+                d2 = (b11 * g2 - a12 * g1) / det
+                r_new, denom_new = residuals(C1 + d1, C2 + d2)
+                cost_new = np.dot(r_new, r_new)
+                if np.isfinite(cost_new) and cost_new <= cost:
+                    lam = max(lam / 10, 1e-12)
+                    break
+                lam *= 10
+                if lam > 1e12:
+                    return C1, C2
+            C1, C2 = C1 + d1, C2 + d2
+            converged = abs(cost - cost_new) <= tol * max(cost, 1e-30) or \
+                (abs(d1) <= tol * (abs(C1) + tol) and abs(d2) <= tol * (abs(C2) + tol))
+            r, denom, cost = r_new, denom_new, cost_new
+            if converged:
+                break
+    return C1, C2
+
+
+def fit_wlf(T, log_aT, T_r, p0=(17, 52), method='curve_fit'):
+    """Least-squares C1, C2 for (T, log a_T) data (temperatures in K).
+
+    ``method`` is one of :data:`FIT_METHODS`: ``'curve_fit'`` (scipy with a
+    finite-difference Jacobian), ``'linear'`` (closed-form linearized WLF)
+    or ``'lm'`` (Levenberg-Marquardt with the analytic Jacobian).
+    """
+    if method == 'linear':
+        return fit_wlf_linear(T, log_aT, T_r)
+    if method == 'lm':
+        return fit_wlf_lm(T, log_aT, T_r)
+    if method != 'curve_fit':
+        raise ValueError("Unknown fit method: {0}".format(method))
+    # scipy is only loaded once a curve_fit fit is actually requested
+    from scipy.optimize import curve_fit
+    popt, _ = curve_fit(lambda T, C1, C2: wlf(T, C1, C2, T_r),
+                        T, log_aT, p0=list(p0))
+    return popt[0], popt[1]
+
+
+# ── Grid search ──────────────────────────────────────────────────────────────
+def grid_axis(start, stop, step):
+    """Inclusive parameter axis from start to stop with the given step."""
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + step * np.arange(n)
+
+
+def sse_surface(T, log_aT, T_r, C1_values, C2_values,
+                chunk_elements=GRID_CHUNK_ELEMENTS, progress=None, cancel=None):
+    """SSE for every (C1, C2) pair of a mesh, shape (len(C1), len(C2)).
+
+    The mesh is evaluated by broadcasting a block of C1 rows against all
+    C2 values and temperatures at once; the block height is chosen so that
+    the intermediate array stays below ``chunk_elements``. After each block
+    ``progress(fraction_done)`` is called, and :class:`Cancelled` is raised
+    once ``cancel`` (a ``threading.Event``) is set.
+    """
+    T = np.asarray(T, dtype=float)
+    log_aT = np.asarray(log_aT, dtype=float)
+    C1_values = np.asarray(C1_values, dtype=float)
+    C2_values = np.asarray(C2_values, dtype=float)
+
+    dT = T - T_r
+    denom = C2_values[:, None] + dT[None, :]
+    valid = denom != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # log(a_T) = -C1 * ratio, so only C1 varies inside a block
+        ratio = np.where(valid, dT[None, :] / denom, 0.0)
+    target = np.where(valid, log_aT[None, :], 0.0)
+
+    surface = np.empty((C1_values.size, C2_values.size))
+    per_row = max(C2_values.size * T.size, 1)
+    rows = max(1, int(chunk_elements // per_row))
+    for start in range(0, C1_values.size, rows):
+        if cancel is not None and cancel.is_set():
+            raise Cancelled()
+        C1_block = C1_values[start:start + rows, None, None]
+        resid = target[None] + C1_block * ratio[None]
+        surface[start:start + rows] = np.einsum('ijk,ijk->ij', resid, resid)
+        if progress is not None:
+            progress(min(start + rows, C1_values.size) / C1_values.size)
+    return surface
+
+
+def rank_surface(surface, C1_values, C2_values, limit=None):
+    """Finite mesh points as rows of (C1, C2, SSE), best first.
+
+    With ``limit`` only the best ``limit`` rows are selected (argpartition),
+    so huge meshes need no full sort.
+    """
+    return rank_grid(surface, (C1_values, C2_values), limit)
+
+
+def grid_search(T, log_aT, T_r, coarse_step=5.0, fine_step=0.5, margin=10.0,
+                lower=0.5, upper=200.5, chunk_elements=GRID_CHUNK_ELEMENTS,
+                progress=None, cancel=None):
+    """Two-stage (coarse, then fine around the best cell) C1/C2 search.
+
+    Returns ``(C1_values, C2_values, surface)`` for the fine stage.
+    ``progress`` and ``cancel`` are passed on to :func:`sse_surface`, with
+    the progress fraction covering both stages.
+    """
+    def stage_progress(offset, share):
+        if progress is None:
+            return None
+        return lambda fraction: progress(offset + share * fraction)
+
+    C1_coarse = grid_axis(lower, upper, coarse_step)
+    C2_coarse = grid_axis(lower, upper, coarse_step)
+    coarse = sse_surface(T, log_aT, T_r, C1_coarse, C2_coarse,
+                         chunk_elements, stage_progress(0.0, 0.5), cancel)
+    if not np.isfinite(coarse).any():
+        best_C1, best_C2 = 0.0, 0.0
+    else:
+        i1, i2 = np.unravel_index(np.nanargmin(coarse), coarse.shape)
+        best_C1, best_C2 = C1_coarse[i1], C2_coarse[i2]
+
+    C1_fine = grid_axis(max(0.1, best_C1 - margin), best_C1 + margin, fine_step)
+    C2_fine = grid_axis(max(0.1, best_C2 - margin), best_C2 + margin, fine_step)
+    fine = sse_surface(T, log_aT, T_r, C1_fine, C2_fine,
+                       chunk_elements, stage_progress(0.5, 0.5), cancel)
+    return C1_fine, C2_fine, fine
+
+
+def best_fit(T, log_aT, T_r, model='WLF', **kwargs):
+    """Best (*params, SSE) of the two-stage grid search of ``model``, or None."""
+    axes, surface = model_grid_search(model, T, log_aT, T_r, **kwargs)
+    ranked = rank_grid(surface, axes, limit=1)
+    if not len(ranked):
+        return None
+    return tuple(ranked[0])
+
+
+SSELandscape = namedtuple('SSELandscape',
+                          'C1_values C2_values surface best threshold region level')
+SSELandscape.__doc__ = """SSE over a (C1, C2) mesh with its best point and
+the Delta chi^2 confidence ``region`` (SSE <= ``threshold``)."""
+
+
+def confidence_threshold(sse_min, n_points, level=CONFIDENCE_LEVEL):
+    """SSE bound of the joint (C1, C2) confidence region at ``level``.
+
+    The residual variance is estimated as SSE_min / (n - 2), so the region
+    SSE <= SSE_min + Delta chi^2 * sigma^2 uses the 2-dof quantile
+    Delta chi^2 = -2 ln(1 - level). NaN with two or fewer points.
+    """
+    if not 0 < level < 1:
+        raise ValueError("The confidence level must be between 0 and 1.")
+    if n_points <= 2:
+        return np.nan
+    delta_chi2 = -2.0 * np.log1p(-level)
+    return sse_min * (1.0 + delta_chi2 / (n_points - 2))
+
+
+def sse_landscape(T, log_aT, T_r, step=0.5, lower=0.5, upper=200.5,
+                  level=CONFIDENCE_LEVEL, chunk_elements=GRID_CHUNK_ELEMENTS,
+                  progress=None, cancel=None):
+    """The whole SSE surface over the search range in a single stage.
+
+    Unlike :func:`grid_search`, which only keeps the fine mesh around the
+    coarse optimum, the surface covers ``lower``..``upper`` for both
+    parameters at ``step``, so the long C1/C2 valley and its confidence
+    region are not cut off.
+    """
+    T = np.asarray(T, dtype=float)
+    log_aT = np.asarray(log_aT, dtype=float)
+    C1_values = grid_axis(lower, upper, step)
+    C2_values = grid_axis(lower, upper, step)
+    surface = sse_surface(T, log_aT, T_r, C1_values, C2_values,
+                          chunk_elements, progress, cancel)
+    ranked = rank_surface(surface, C1_values, C2_values, limit=1)
+    if not len(ranked):
+        best, threshold = None, np.nan
+    else:
+        best = tuple(ranked[0])
+        n_points = int(np.count_nonzero(np.isfinite(T) & np.isfinite(log_aT)))
+        threshold = confidence_threshold(best[2], n_points, level)
+    with np.errstate(invalid='ignore'):
+        region = surface <= threshold
+    return SSELandscape(C1_values, C2_values, surface, best, threshold, region, level)
+
+
+def confidence_bounds(landscape):
+    """((C1_lo, C1_hi), (C2_lo, C2_hi), clipped) of the confidence region.
+
+    ``clipped`` is True when the region touches the edge of the mesh, so
+    the true interval is wider than reported. None for an empty region.
+    """
+    region = landscape.region
+    if not region.any():
+        return None
+    rows = np.flatnonzero(region.any(axis=1))
+    cols = np.flatnonzero(region.any(axis=0))
+    clipped = bool(region[0].any() or region[-1].any()
+                   or region[:, 0].any() or region[:, -1].any())
+    return ((landscape.C1_values[rows[0]], landscape.C1_values[rows[-1]]),
+            (landscape.C2_values[cols[0]], landscape.C2_values[cols[-1]]),
+            clipped)
+
+
+# ── Shift-model registry ─────────────────────────────────────────────────────
+_LN10_R = np.log(10) * R_GAS
+
+ShiftModel = namedtuple('ShiftModel', 'name params units ranges evaluate jacobian guess')
+ShiftModel.__doc__ = """A log(a_T) model with parameters ``params`` (``units``).
+
+``evaluate(P, T, T_r)`` gives log(a_T) for an (N, P) parameter array at M
+temperatures as an (N, M) array (NaN where undefined; ``T_r`` is a scalar
+or length-N), ``jacobian(p, T, T_r)`` the (M, P) derivatives for one
+parameter set and ``guess(T, log_aT, T_r)`` a fast linearized estimate.
+``ranges`` holds ``(lower, upper, coarse_step, fine_step)`` per parameter
+for the grid search and the GUI sliders. Temperatures are in K."""
+
+SHIFT_MODELS = {}
+
+
+def register_model(model):
+    """Add a :class:`ShiftModel` to :data:`SHIFT_MODELS` under its name."""
+    SHIFT_MODELS[model.name] = model
+    return model
+
+
+def get_model(model):
+    """The registered :class:`ShiftModel` for a name (or the model itself)."""
+    if isinstance(model, ShiftModel):
+        return model
+    try:
+        return SHIFT_MODELS[model]
+    except KeyError:
+        raise ValueError("Unknown shift model {0!r}; use one of {1}.".format(
+            model, tuple(SHIFT_MODELS))) from None
+
+
+def _columns(P, n_params):
+    P = np.asarray(P, dtype=float).reshape(-1, n_params)
+    return [P[:, k:k + 1] for k in range(n_params)]
+
+
+def _wlf_evaluate(P, T, T_r):
+    C1, C2 = _columns(P, 2)
+    return evaluate_wlf(C1, C2, T, T_r)
+
+
+def _wlf_jacobian(p, T, T_r):
+    C1, C2 = p
+    x = np.asarray(T, dtype=float) - T_r
+    denom = C2 + x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        J = np.column_stack((-x / denom, C1 * x / denom ** 2))
+    J[denom == 0] = 0.0
+    return J
+
+
+def _wlf_guess(T, log_aT, T_r):
+    try:
+        return fit_wlf_linear(T, log_aT, T_r)
+    except ValueError:
+        return (17.0, 52.0)
+
+
+def _kaelble_evaluate(P, T, T_r):
+    C1, C2 = _columns(P, 2)
+    x = np.asarray(T, dtype=float).reshape(1, -1) - np.asarray(T_r, dtype=float).reshape(-1, 1)
+    denom = C2 + np.abs(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denom == 0, np.nan, -C1 * x / denom)
+
+
+def _kaelble_jacobian(p, T, T_r):
+    C1, C2 = p
+    x = np.asarray(T, dtype=float) - T_r
+    denom = C2 + np.abs(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        J = np.column_stack((-x / denom, C1 * x / denom ** 2))
+    J[denom == 0] = 0.0
+    return J
+
+
+def _kaelble_guess(T, log_aT, T_r):
+    x = np.asarray(T, dtype=float) - T_r
+    try:
+        return _linearized_c1_c2(np.abs(x), x, log_aT)
+    except ValueError:
+        return (17.0, 52.0)
+
+
+def _arrhenius_evaluate(P, T, T_r):
+    Ea, = _columns(P, 1)
+    u = 1.0 / np.asarray(T, dtype=float).reshape(1, -1) \
+        - 1.0 / np.asarray(T_r, dtype=float).reshape(-1, 1)
+    return Ea / _LN10_R * u
+
+
+def _arrhenius_jacobian(p, T, T_r):
+    u = 1.0 / np.asarray(T, dtype=float) - 1.0 / T_r
+    return (u / _LN10_R)[:, None]
+
+
+def _arrhenius_guess(T, log_aT, T_r):
+    # log a_T is linear in Ea, so this is already the least-squares solution
+    u = 1.0 / np.asarray(T, dtype=float) - 1.0 / T_r
+    y = np.asarray(log_aT, dtype=float)
+    ok = np.isfinite(u) & np.isfinite(y)
+    suu = np.dot(u[ok], u[ok])
+    if suu == 0:
+        return (100.0,)
+    return (_LN10_R * np.dot(u[ok], y[ok]) / suu,)
+
+
+def _hybrid_evaluate(P, T, T_r):
+    C1, C2, Ea, Tg = _columns(P, 4)
+    T = np.asarray(T, dtype=float).reshape(1, -1)
+    T_r = np.asarray(T_r, dtype=float).reshape(-1, 1)
+    # WLF at max(T, Tg), plus the Arrhenius branch below Tg
+    x = np.maximum(T, Tg) - T_r
+    denom = C2 + x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(denom == 0, np.nan, -C1 * x / denom)
+    return result + Ea / _LN10_R * np.maximum(1.0 / T - 1.0 / Tg, 0.0)
+
+
+def _hybrid_jacobian(p, T, T_r):
+    C1, C2, Ea, Tg = p
+    T = np.asarray(T, dtype=float)
+    below = T < Tg
+    x = np.where(below, Tg, T) - T_r
+    denom = C2 + x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        J = np.column_stack((
+            -x / denom,
+            C1 * x / denom ** 2,
+            np.where(below, (1.0 / T - 1.0 / Tg) / _LN10_R, 0.0),
+            # d/dTg of WLF(Tg) + Ea/(R ln 10) (1/T - 1/Tg)
+            np.where(below, -C1 * C2 / denom ** 2 + Ea / (_LN10_R * Tg ** 2), 0.0),
+        ))
+    J[denom == 0] = 0.0
+    return J
+
+
+def _hybrid_guess(T, log_aT, T_r):
+    """Best split of the data at one of its temperatures: a linearized WLF
+    fit above Tg and the least-squares Arrhenius Ea below it."""
+    T = np.asarray(T, dtype=float)
+    log_aT = np.asarray(log_aT, dtype=float)
+    best, best_sse = None, np.inf
+    for Tg in np.unique(T[np.isfinite(T)]):
+        above = T >= Tg
+        try:
+            C1, C2 = _linearized_c1_c2(T[above] - T_r, T[above] - T_r, log_aT[above])
+        except ValueError:
+            continue
+        Ea = 100.0
+        if (~above).any():
+            u = 1.0 / T[~above] - 1.0 / Tg
+            y = log_aT[~above] - wlf(Tg, C1, C2, T_r)
+            if np.isfinite(y).all():
+                Ea = _LN10_R * np.dot(u, y) / np.dot(u, u)
+        p = (C1, C2, Ea, Tg)
+        sse = np.nansum((log_aT - _hybrid_evaluate(p, T, T_r)[0]) ** 2)
+        if sse < best_sse:
+            best, best_sse = p, sse
+    return best if best is not None else (17.0, 52.0, 100.0, T.min())
+
+
+register_model(ShiftModel(
+    'WLF', ('C1', 'C2'), ('', 'K'),
+    ((0.5, 200.5, 5.0, 0.5), (0.5, 200.5, 5.0, 0.5)),
+    _wlf_evaluate, _wlf_jacobian, _wlf_guess))
+register_model(ShiftModel(
+    'Arrhenius', ('Ea',), ('kJ/mol',),
+    ((1.0, 501.0, 5.0, 0.1),),
+    _arrhenius_evaluate, _arrhenius_jacobian, _arrhenius_guess))
+register_model(ShiftModel(
+    'WLF/Arrhenius', ('C1', 'C2', 'Ea', 'Tg'), ('', 'K', 'kJ/mol', 'K'),
+    ((0.5, 200.5, 10.0, 2.0), (0.5, 200.5, 10.0, 2.0),
+     (5.0, 505.0, 25.0, 5.0), (173.15, 373.15, 10.0, 2.0)),
+    _hybrid_evaluate, _hybrid_jacobian, _hybrid_guess))
+register_model(ShiftModel(
+    'Kaelble', ('C1', 'C2'), ('', 'K'),
+    ((0.5, 200.5, 5.0, 0.5), (0.5, 200.5, 5.0, 0.5)),
+    _kaelble_evaluate, _kaelble_jacobian, _kaelble_guess))
+
+
+def evaluate_model(model, params, T, T_r):
+    """log(a_T) of ``model`` for one (P,) or N (N, P) parameter sets, (N, M)."""
+    model = get_model(model)
+    return model.evaluate(np.asarray(params, dtype=float), T, T_r)
+
+
+def model_bounds(model):
+    """Lower and upper parameter bounds of ``model``, from its grid ranges."""
+    model = get_model(model)
+    lower, upper = np.array([r[:2] for r in model.ranges], dtype=float).T
+    return lower, upper
+
+
+def check_ranges(model, params, method):
+    """Raise :class:`FitError` unless every parameter lies strictly inside the
+    model's ranges; a fit pinned to a bound has run off towards it."""
+    model = get_model(model)
+    lower, upper = model_bounds(model)
+    p = np.asarray(params, dtype=float)
+    margin = 1e-6 * (upper - lower)
+    if not (np.isfinite(p).all() and (p > lower + margin).all()
+            and (p < upper - margin).all()):
+        raise FitError("The {0} {1} fit left the model ranges ({2}).".format(
+            model.name, method,
+            ', '.join('{0} = {1:.4g}'.format(name, value)
+                      for name, value in zip(model.params, p))))
+    return tuple(float(v) for v in p)
+
+
+def model_sse(model, params, T, log_aT, T_r):
+    """SSE of one parameter set of ``model``, ignoring undefined points."""
+    resid = np.asarray(log_aT, dtype=float) - evaluate_model(model, params, T, T_r)[0]
+    return np.nansum(resid ** 2)
+
+
+def fit_model_lm(model, T, log_aT, T_r, p0=None, max_iter=100, tol=1e-10):
+    """Levenberg-Marquardt fit of any registered model with its analytic
+    Jacobian, starting from ``p0`` or the model's linearized guess.
+
+    The start and every step are clipped to :func:`model_bounds`. Raises
+    :class:`FitError` if the fit has not converged after ``max_iter`` steps.
+    """
+    model = get_model(model)
+    T = np.asarray(T, dtype=float)
+    y = np.asarray(log_aT, dtype=float)
+    lower, upper = model_bounds(model)
+    p = np.array(model.guess(T, y, T_r) if p0 is None else p0, dtype=float)
+    p = np.clip(np.nan_to_num(p, nan=0.5 * (lower + upper)), lower, upper)
+
+    def residuals(p):
+        r = y - model.evaluate(p, T, T_r)[0]
+        r[~np.isfinite(r)] = 0.0
+        return r
+
+    r = residuals(p)
+    cost = np.dot(r, r)
+    lam = 1e-3
+    for _ in range(max_iter):
+        J = model.jacobian(p, T, T_r)
+        A = J.T @ J
+        g = J.T @ r
+        # A floor keeps the damped system solvable when the data do not
+        # constrain a parameter (e.g. Ea with no point below Tg)
+        damping = np.maximum(np.diag(A), 1e-12 * max(np.diag(A).max(), 1e-30))
+        while True:
+            try:
+                step = np.linalg.solve(A + lam * np.diag(damping), g)
+            except np.linalg.LinAlgError:
+                step = None
+            if step is not None and np.isfinite(step).all():
+                step = np.clip(p + step, lower, upper) - p
+                r_new = residuals(p + step)
+                cost_new = np.dot(r_new, r_new)
+                if cost_new <= cost:
+                    lam = max(lam / 10, 1e-12)
+                    break
+            lam *= 10
+            if lam > 1e12:
+                # No step lowers the cost: p is a (bounded) minimum
+                return tuple(float(v) for v in p)
+        p = p + step
+        converged = abs(cost - cost_new) <= tol * max(cost, 1e-30) or \
+            (np.abs(step) <= tol * (np.abs(p) + tol)).all()
+        r, cost = r_new, cost_new
+        if converged:
+            return tuple(float(v) for v in p)
+    raise FitError("The {0} lm fit did not converge in {1} steps.".format(
+        model.name, max_iter))
+
+
+def fit_model(model, T, log_aT, T_r, method='lm'):
+    """Least-squares parameters of ``model`` (a name or :class:`ShiftModel`).
+
+    WLF keeps the :func:`fit_wlf` backends. For other models ``'linear'``
+    returns the linearized guess, ``'lm'`` refines it by
+    :func:`fit_model_lm` and ``'curve_fit'`` by scipy with the analytic
+    Jacobian within :func:`model_bounds`. A result that is not strictly
+    inside the model's ranges raises :class:`FitError` (see
+    :func:`check_ranges`); callers fall back to the grid optimum.
+    """
+    model = get_model(model)
+    if method not in FIT_METHODS:
+        raise ValueError("Unknown fit method: {0}".format(method))
+    try:
+        if model.name == 'WLF':
+            params = fit_wlf(T, log_aT, T_r, method=method)
+        elif method == 'linear':
+            params = model.guess(T, log_aT, T_r)
+        elif method == 'lm':
+            params = fit_model_lm(model, T, log_aT, T_r)
+        else:
+            from scipy.optimize import curve_fit
+            lower, upper = model_bounds(model)
+            p0 = np.clip(model.guess(T, log_aT, T_r), lower, upper)
+            params, _ = curve_fit(lambda T, *p: model.evaluate(p, T, T_r)[0],
+                                  T, log_aT, p0=list(p0), bounds=(lower, upper),
+                                  jac=lambda T, *p: model.jacobian(p, T, T_r))
+    except RuntimeError as e:
+        # curve_fit gives up with a RuntimeError when it does not converge
+        raise FitError("The {0} {1} fit did not converge: {2}".format(
+            model.name, method, e)) from None
+    return check_ranges(model, params, method)
+
+
+def model_sse_grid(model, T, log_aT, T_r, axes, chunk_elements=GRID_CHUNK_ELEMENTS,
+                   progress=None, cancel=None):
+    """SSE of ``model`` on the mesh spanned by one axis per parameter.
+
+    The mesh is flattened and evaluated in blocks of parameter sets, each
+    one (rows, M) call of the model's vectorized ``evaluate`` below
+    ``chunk_elements``. ``progress`` and ``cancel`` work as in
+    :func:`sse_surface`, which WLF meshes use directly.
+    """
+    model = get_model(model)
+    axes = [np.asarray(axis, dtype=float) for axis in axes]
+    if model.name == 'WLF':
+        return sse_surface(T, log_aT, T_r, axes[0], axes[1],
+                           chunk_elements, progress, cancel)
+    T = np.asarray(T, dtype=float)
+    log_aT = np.asarray(log_aT, dtype=float)
+    shape = tuple(axis.size for axis in axes)
+    total = int(np.prod(shape))
+    surface = np.empty(total)
+    rows = max(1, int(chunk_elements // max(T.size, 1)))
+    for start in range(0, total, rows):
+        if cancel is not None and cancel.is_set():
+            raise Cancelled()
+        index = np.unravel_index(np.arange(start, min(start + rows, total)), shape)
+        P = np.column_stack([axis[i] for axis, i in zip(axes, index)])
+        resid = model.evaluate(P, T, T_r) - log_aT
+        # A parameter set with a pole at a data temperature gets NaN and is
+        # left out of the ranking
+        surface[start:start + rows] = np.einsum('ij,ij->i', resid, resid)
+        if progress is not None:
+            progress(min(start + rows, total) / total)
+    return surface.reshape(shape)
+
+
+def rank_grid(surface, axes, limit=None):
+    """Finite mesh points as rows of (*params, SSE), best first.
+
+    The n-parameter form of :func:`rank_surface`.
+    """
+    flat = surface.ravel()
+    idx = np.flatnonzero(np.isfinite(flat))
+    if limit is not None and limit < idx.size:
+        idx = idx[np.argpartition(flat[idx], limit)[:limit]]
+    idx = idx[np.argsort(flat[idx], kind='stable')]
+    index = np.unravel_index(idx, surface.shape)
+    return np.column_stack([np.asarray(axis)[i] for axis, i in zip(axes, index)]
+                           + [flat[idx]])
+
+
+def model_grid_search(model, T, log_aT, T_r, chunk_elements=GRID_CHUNK_ELEMENTS,
+                      progress=None, cancel=None, **kwargs):
+    """Two-stage grid search of any registered model; ``(axes, surface)``.
+
+    WLF runs :func:`grid_search` (``kwargs`` are passed on). Other models
+    scan their coarse ``ranges`` and then a fine mesh of two coarse steps
+    either side of the best cell.
+    """
+    model = get_model(model)
+    if model.name == 'WLF':
+        C1_values, C2_values, surface = grid_search(
+            T, log_aT, T_r, chunk_elements=chunk_elements,
+            progress=progress, cancel=cancel, **kwargs)
+        return (C1_values, C2_values), surface
+
+    def stage_progress(offset):
+        if progress is None:
+            return None
+        return lambda fraction: progress(offset + 0.5 * fraction)
+
+    coarse_axes = [grid_axis(lower, upper, coarse)
+                   for lower, upper, coarse, _ in model.ranges]
+    coarse = model_sse_grid(model, T, log_aT, T_r, coarse_axes, chunk_elements,
+                            stage_progress(0.0), cancel)
+    if np.isfinite(coarse).any():
+        best = np.unravel_index(np.nanargmin(coarse), coarse.shape)
+    else:
+        best = tuple(axis.size // 2 for axis in coarse_axes)
+    fine_axes = []
+    for axis, i, (lower, upper, coarse_step, fine_step) in zip(coarse_axes, best, model.ranges):
+        centre = axis[i]
+        fine_axes.append(grid_axis(max(lower, centre - 2 * coarse_step),
+                                   min(upper, centre + 2 * coarse_step), fine_step))
+    fine = model_sse_grid(model, T, log_aT, T_r, fine_axes, chunk_elements,
+                          stage_progress(0.5), cancel)
+    return tuple(fine_axes), fine
+
+
+# ── a_T estimation & TTS shift ───────────────────────────────────────────────
+def estimate_aT_table(C1, C2, T_r_new):
+    """Step 4 table of a_T over -80..80 °C for a new reference temperature."""
+    return model_aT_table('WLF', (C1, C2), T_r_new)
+
+
+def model_aT_table(model, params, T_r_new):
+    """:func:`estimate_aT_table` for any registered model."""
+    T_fit = np.linspace(*AT_TABLE_RANGE) + 273.15
+    log_aT_new = evaluate_model(model, params, T_fit, T_r_new)[0]
+    return pd.DataFrame({
+        'Temperature (\u00b0C)': np.round(T_fit - 273.15).astype(int),
+        'a_T': 10 ** log_aT_new,
+        'log(a_T)': log_aT_new
+    })
+
+
+def interpolate_log_aT(temperatures, table_T, table_log_aT):
+    """log(a_T) at arbitrary temperatures from a tabulated curve.
+
+    The table is sorted once and every temperature is located with a single
+    ``np.searchsorted``; values are interpolated linearly in log(a_T) and
+    held constant beyond the ends of the table.
+    """
+    table_T, first = np.unique(np.asarray(table_T, dtype=float), return_index=True)
+    table_log_aT = np.asarray(table_log_aT, dtype=float)[first]
+    T = np.asarray(temperatures, dtype=float)
+    if table_T.size == 1:
+        return np.full(T.shape, table_log_aT[0])
+
+    idx = np.clip(np.searchsorted(table_T, T), 1, table_T.size - 1)
+    T0, T1 = table_T[idx - 1], table_T[idx]
+    weight = np.clip((T - T0) / (T1 - T0), 0.0, 1.0)
+    return table_log_aT[idx - 1] + weight * (table_log_aT[idx] - table_log_aT[idx - 1])
+
+
+def aT_for_temperatures(temperatures, aT_table=None, params=None, model='WLF'):
+    """a_T for each temperature (°C) of a DMA table.
+
+    With ``params = (*model parameters, T_r)``, e.g. ``(C1, C2, T_r)`` for
+    WLF (T_r in K), ``model`` is evaluated exactly; otherwise log(a_T) is
+    interpolated from the Step 4 table.
+    """
+    T = np.array([float(temp) for temp in temperatures])
+    if params is not None:
+        log_aT = evaluate_model(model, params[:-1], T + 273.15, params[-1])[0]
+    else:
+        if aT_table is None or not len(aT_table):
+            raise ValueError("No estimated a\u209c values.")
+        if 'log(a_T)' in aT_table:
+            table_log_aT = aT_table['log(a_T)'].values
+        else:
+            table_log_aT = np.log10(aT_table['a_T'].values)
+        log_aT = interpolate_log_aT(T, aT_table['Temperature (\u00b0C)'].values,
+                                    table_log_aT)
+
+    missing = ~np.isfinite(log_aT)
+    if missing.any():
+        raise ValueError("No estimated a\u209c value for temperature "
+                         "{0}\u00b0C.".format(list(temperatures)[np.flatnonzero(missing)[0]]))
+    return 10 ** log_aT
+
+
+def shift_data(data, aT_table=None, params=None, model='WLF'):
+    """Shift every temperature column of a DMA table along frequency.
+
+    ``data`` has frequencies as index and one modulus column per
+    temperature; a_T comes from :func:`aT_for_temperatures`. Returns
+    ``(shifted_data, shifted_freqs)`` DataFrames.
+    """
+    aT_values = aT_for_temperatures(data.columns, aT_table, params, model)
+    freqs = np.asarray(data.index, dtype=float)
+    shifted_freqs = pd.DataFrame(freqs[:, None] * aT_values[None, :],
+                                 columns=data.columns)
+    shifted_data = pd.DataFrame(data.to_numpy(), columns=data.columns)
+    return shifted_data, shifted_freqs
@@ -0,0 +1,456 @@
+"""Reading and writing of DMA tables and results (no GUI dependencies)."""
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# On-disk cache of parsed DMA spreadsheets
+CACHE_DIR_ENV = 'WLF_CACHE_DIR'
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+_CACHE_VERSION = 1
+
+# File dialog entries for every supported table format
+TABLE_FILETYPES = [('Excel files', '*.xlsx'), ('CSV files', '*.csv'),
+                   ('Parquet files', '*.parquet'), ('NumPy archives', '*.npz'),
+                   ('All files', '*.*')]
+_EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+# Sheet name of a single-sheet table, and of a csv/parquet file read back
+DEFAULT_SHEET = 'Sheet1'
+# Rows per block when streaming a DMA table
+STREAM_CHUNK_ROWS = 50_000
+
+
+def default_cache_dir():
+    """Cache location: $WLF_CACHE_DIR, else ~/.cache/wlf."""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser('~'), '.cache', 'wlf')
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_key(path):
+    stat = os.stat(path)
+    key = '{0}|{1}|{2}|{3}'.format(os.path.abspath(path), stat.st_mtime_ns,
+                                   stat.st_size, _CACHE_VERSION)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _to_arrays(df):
+    """Columnar arrays for a DMA table, or None if it cannot be cached."""
+    values = df.to_numpy()
+    if values.dtype.kind not in 'iuf' or df.index.dtype.kind not in 'iuf':
+        return None
+    columns = df.columns
+    if columns.dtype.kind not in 'iuf':
+        if not all(isinstance(c, str) for c in columns):
+            return None
+        columns = columns.astype(str)
+    return {
+        'index': df.index.to_numpy(),
+        'values': values,
+        'columns': np.asarray(columns),
+        'index_name': np.array([] if df.index.name is None else [str(df.index.name)]),
+    }
+
+
+def _from_arrays(arrays):
+    index_name = arrays['index_name']
+    index = pd.Index(arrays['index'], name=str(index_name[0]) if index_name.size else None)
+    return pd.DataFrame(arrays['values'], index=index, columns=list(arrays['columns']))
+
+
+def _evict(cache_dir, max_bytes):
+    """Remove least recently used entries until the cache fits max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.npz'):
+            full = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, full))
+    total = sum(size for _, size, _ in entries)
+    for _, size, full in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(full)
+            total -= size
+        except OSError:
+            pass
+
+
+def read_dma_table(path, cache_dir=None, max_bytes=CACHE_MAX_BYTES, use_cache=True):
+    """DMA table (frequency index, one column per temperature) from a file.
+
+    Excel workbooks are read with ``pd.read_excel(path, index_col=0)``
+    through a binary NPZ cache; CSV, Parquet and NPZ files are read directly
+    with their first column as the index. Cache entries are keyed by
+    absolute path, mtime and size, and carry a SHA-1 of the source file that
+    must still match on a hit. Hits refresh the entry's mtime; the least
+    recently used entries are evicted once the cache directory grows beyond
+    ``max_bytes``.
+    """
+    if _extension(path) not in _EXCEL_EXTENSIONS:
+        df = read_table(path, index_col=0)
+        try:
+            # Text formats give temperature headers as strings
+            df.columns = pd.to_numeric(df.columns)
+        except (ValueError, TypeError):
+            pass
+        return df
+    if not use_cache:
+        return pd.read_excel(path, index_col=0)
+
+    cache_dir = cache_dir or default_cache_dir()
+    entry = os.path.join(cache_dir, _cache_key(path) + '.npz')
+    digest = _file_digest(path)
+    if os.path.exists(entry):
+        try:
+            with np.load(entry, allow_pickle=False) as cached:
+                if str(cached['digest']) == digest:
+                    df = _from_arrays(cached)
+                    os.utime(entry)
+                    return df
+        except (OSError, ValueError, KeyError):
+            pass
+
+    df = pd.read_excel(path, index_col=0)
+    arrays = _to_arrays(df)
+    if arrays is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, digest=np.array(digest), **arrays)
+            os.replace(tmp, entry)
+            _evict(cache_dir, max_bytes)
+        except OSError:
+            pass
+    return df
+
+
+# ── Table import / export ────────────────────────────────────────────────────
+def _extension(path):
+    return os.path.splitext(path)[1].lower()
+
+
+def _safe_name(name):
+    return ''.join('_' if c in '/\\:*?"<>|' else c for c in str(name))
+
+
+def _sheet_path(path, sheet, count):
+    """Single-sheet formats: one file per sheet once there is more than one."""
+    if count == 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return '{0}_{1}{2}'.format(stem, _safe_name(sheet), ext)
+
+
+def _write_excel(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for sheet, df in sheets.items():
+            # Excel sheet names max 31 chars
+            df.to_excel(writer, sheet_name=str(sheet)[:31], index=False)
+
+
+def _write_csv(path, sheets):
+    for sheet, df in sheets.items():
+        df.to_csv(_sheet_path(path, sheet, len(sheets)), index=False)
+
+
+def _write_parquet(path, sheets):
+    for sheet, df in sheets.items():
+        df.rename(columns=str).to_parquet(_sheet_path(path, sheet, len(sheets)),
+                                          index=False)
+
+
+def _write_npz(path, sheets):
+    # One archive; members are named "<sheet>/<column>" and keep their order
+    arrays = {}
+    for sheet, df in sheets.items():
+        for column in df.columns:
+            key = '{0}/{1}'.format(_safe_name(sheet), _safe_name(column))
+            arrays[key] = np.asarray(df[column])
+    np.savez(path, **arrays)
+
+
+_WRITERS = {
+    '.csv': _write_csv,
+    '.parquet': _write_parquet,
+    '.npz': _write_npz,
+}
+
+
+def write_sheets(path, sheets):
+    """Write ``{sheet name: DataFrame}`` in the format of the file extension.
+
+    ``.xlsx`` gives one workbook with a worksheet per entry and ``.npz`` one
+    archive with ``sheet/column`` members. ``.csv`` and ``.parquet`` write
+    ``path`` itself for a single sheet and ``<stem>_<sheet><ext>`` files
+    otherwise. Frames are written without their index, like the Excel path.
+    """
+    _WRITERS.get(_extension(path), _write_excel)(path, sheets)
+
+
+def write_table(path, df, sheet_name=DEFAULT_SHEET):
+    """Write a single DataFrame; see :func:`write_sheets`."""
+    write_sheets(path, {sheet_name: df})
+
+
+def _sheet_files(path):
+    """``{sheet name: file}`` of a csv/parquet table from :func:`write_sheets`.
+
+    ``path`` itself holds a single sheet, which has no stored name. Otherwise
+    every ``<stem>_<sheet><ext>`` file next to it is a sheet, in name order.
+    """
+    if os.path.exists(path):
+        return {DEFAULT_SHEET: path}
+    folder, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    prefix = stem + '_'
+    files = sorted(f for f in os.listdir(folder or '.')
+                   if f.startswith(prefix) and f.endswith(ext) and len(f) > len(name))
+    if not files:
+        raise FileNotFoundError("No such file or sheet files: {0}".format(path))
+    return {f[len(prefix):len(f) - len(ext)]: os.path.join(folder, f) for f in files}
+
+
+def read_sheets(path):
+    """Read back ``{sheet name: DataFrame}`` written by :func:`write_sheets`.
+
+    Sheet names come back as written, except that file-name characters
+    (``/\\:*?"<>|``) are ``_`` for csv, parquet and npz and Excel keeps
+    31 characters. A single csv/parquet sheet is named
+    :data:`DEFAULT_SHEET`, like a :func:`write_table` default.
+    """
+    ext = _extension(path)
+    if ext == '.csv':
+        return {sheet: pd.read_csv(f) for sheet, f in _sheet_files(path).items()}
+    if ext == '.parquet':
+        return {sheet: pd.read_parquet(f) for sheet, f in _sheet_files(path).items()}
+    if ext == '.npz':
+        sheets = {}
+        with np.load(path, allow_pickle=False) as archive:
+            for key in archive.files:
+                sheet, _, column = key.partition('/')
+                sheets.setdefault(sheet, {})[column] = archive[key]
+        return {sheet: pd.DataFrame(columns) for sheet, columns in sheets.items()}
+    return pd.read_excel(path, sheet_name=None)
+
+
+def read_table(path, index_col=None):
+    """First sheet of a table file, optionally indexed by one of its columns."""
+    df = next(iter(read_sheets(path).values()))
+    if index_col is not None:
+        df = df.set_index(df.columns[index_col])
+    return df
+
+
+def shifted_sheets(shifted_data, shifted_freqs, smoothed=None):
+    """Step 5 export layout: one (frequency, modulus) sheet per temperature.
+
+    ``smoothed`` is an optional ``(freqs, values)`` master curve, written to
+    an extra 'Smoothed' sheet.
+    """
+    sheets = {'{0}\u00b0C'.format(temp): pd.DataFrame({
+                  'Frequency (Hz)': shifted_freqs[temp],
+                  'Modulus (MPa)': shifted_data[temp]
+              }) for temp in shifted_data.columns}
+    if smoothed is not None:
+        sheets['Smoothed'] = pd.DataFrame({
+            'Frequency (Hz)': smoothed[0],
+            'Modulus (MPa)': smoothed[1]
+        })
+    return sheets
+
+
+def tts_table(shifted_data, shifted_freqs, smoothed_values=None):
+    """All shifted points flattened into one (frequency, modulus) table.
+
+    ``smoothed_values`` (one per point, in the same flattened order) adds a
+    'Smoothed Modulus' column.
+    """
+    table = pd.DataFrame({
+        'Frequency (Hz)': shifted_freqs.values.flatten(),
+        'Modulus': shifted_data.values.flatten()
+    })
+    if smoothed_values is not None:
+        table['Smoothed Modulus'] = smoothed_values
+    return table
+
+
+# ── Streaming ────────────────────────────────────────────────────────────────
+def _numeric_labels(labels):
+    try:
+        return list(pd.to_numeric(pd.Index(labels)))
+    except (ValueError, TypeError):
+        return list(labels)
+
+
+def _iter_excel_rows(path, chunk_rows):
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = _numeric_labels(next(rows)[1:])
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) == chunk_rows:
+                yield columns, np.array(block, dtype=float)
+                block = []
+        if block:
+            yield columns, np.array(block, dtype=float)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_rows(path, chunk_rows):
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        yield _numeric_labels(chunk.columns[1:]), chunk.to_numpy(dtype=float)
+
+
+def _iter_parquet_rows(path, chunk_rows):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        chunk = batch.to_pandas()
+        yield _numeric_labels(chunk.columns[1:]), chunk.to_numpy(dtype=float)
+
+
+def _iter_npz_rows(path, chunk_rows):
+    # Read every member's .npy payload block by block instead of np.load-ing it
+    with zipfile.ZipFile(path) as archive:
+        names = [n for n in archive.namelist() if n.endswith('.npy')]
+        sheet = names[0].partition('/')[0]
+        names = [n for n in names if n.partition('/')[0] == sheet]
+        columns = _numeric_labels([n.partition('/')[2][:-4] for n in names])
+        streams, dtypes, n_rows = [], [], None
+        try:
+            for name in names:
+                f = archive.open(name)
+                streams.append(f)
+                if np.lib.format.read_magic(f) == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+                dtypes.append(dtype)
+                n_rows = shape[0]
+            for start in range(0, n_rows, chunk_rows):
+                count = min(chunk_rows, n_rows - start)
+                block = np.empty((count, len(names)))
+                for j, (f, dtype) in enumerate(zip(streams, dtypes)):
+                    block[:, j] = np.frombuffer(f.read(count * dtype.itemsize), dtype=dtype)
+                yield columns[1:], block
+        finally:
+            for f in streams:
+                f.close()
+
+
+_ROW_READERS = {
+    '.csv': _iter_csv_rows,
+    '.parquet': _iter_parquet_rows,
+    '.npz': _iter_npz_rows,
+}
+
+
+def iter_dma_rows(path, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield ``(temperatures, block)`` row blocks of a DMA table file.
+
+    ``block`` holds ``chunk_rows`` rows with the frequency in column 0 and
+    one modulus column per temperature, so only one block is in memory.
+    """
+    reader = _ROW_READERS.get(_extension(path), _iter_excel_rows)
+    return reader(path, chunk_rows)
+
+
+class _CsvRowWriter:
+    def __init__(self, path, columns):
+        self.f = open(path, 'w', newline='', encoding='utf-8')
+        self.f.write(','.join(columns) + '\n')
+
+    def write(self, block):
+        self.f.write(pd.DataFrame(block).to_csv(header=False, index=False))
+
+    def close(self):
+        self.f.close()
+
+
+class _ParquetRowWriter:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.columns = columns
+        schema = pa.schema([(c, pa.float64()) for c in columns])
+        self.writer = pq.ParquetWriter(path, schema)
+
+    def write(self, block):
+        arrays = [self.pa.array(block[:, j]) for j in range(block.shape[1])]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, names=self.columns))
+
+    def close(self):
+        self.writer.close()
+
+
+class _ExcelRowWriter:
+    def __init__(self, path, columns):
+        from openpyxl import Workbook
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Sheet1')
+        self.sheet.append(columns)
+
+    def write(self, block):
+        for row in block.tolist():
+            self.sheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+_ROW_WRITERS = {
+    '.csv': _CsvRowWriter,
+    '.parquet': _ParquetRowWriter,
+    '.xlsx': _ExcelRowWriter,
+}
+
+
+def stream_tts(in_path, out_path, aT_for_temperatures, chunk_rows=STREAM_CHUNK_ROWS):
+    """Shift a DMA table block by block and append it to ``out_path``.
+
+    ``aT_for_temperatures`` maps the column temperatures to their a_T. The
+    output has the ``output_tts`` layout (one ``Frequency (Hz)``, ``Modulus``
+    row per point, row-major) in CSV, Parquet or write-only Excel, and peak
+    memory is bounded by ``chunk_rows`` rather than the table size.
+    Returns the number of points written.
+    """
+    writer_cls = _ROW_WRITERS.get(_extension(out_path))
+    if writer_cls is None:
+        raise ValueError("Streaming output must be .csv, .parquet or .xlsx, "
+                         "not {0}".format(out_path))
+    writer = writer_cls(out_path, ['Frequency (Hz)', 'Modulus'])
+    aT = None
+    written = 0
+    try:
+        for temperatures, block in iter_dma_rows(in_path, chunk_rows):
+            if aT is None:
+                aT = np.asarray(aT_for_temperatures(temperatures), dtype=float)
+            freqs = block[:, :1] * aT[None, :]
+            out = np.column_stack((freqs.ravel(), block[:, 1:].ravel()))
+            writer.write(out)
+            written += out.shape[0]
+    finally:
+        writer.close()
+    return written
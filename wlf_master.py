@@ -0,0 +1,249 @@
+"""Master-curve models fitted to TTS-shifted DMA data (no GUI dependencies)."""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Rows of the Prony design matrix built and QR-reduced at a time
+PRONY_CHUNK_ROWS = 2048
+PRONY_KINDS = ('storage', 'loss')
+SMOOTH_METHODS = ('spline', 'binned')
+# Default RMS of the smoothing spline residual, in ln(modulus)
+SMOOTH_RMS = 0.05
+# Default number of log-frequency bins / points of a smoothed master curve
+SMOOTH_POINTS = 200
+# The smoothing spline is fitted to the medians of at most this many bins
+SPLINE_BINS = 2000
+
+PronyFit = namedtuple('PronyFit', 'tau moduli E_inf kind rms')
+SmoothCurve = namedtuple('SmoothCurve', 'freqs values method')
+SmoothCurve.__doc__ = """Smoothed master curve sampled at increasing ``freqs`` (Hz)."""
+PronyFit.__doc__ = """Generalized Maxwell model: relaxation times ``tau`` (s),
+term moduli ``moduli`` and equilibrium modulus ``E_inf`` (data units),
+the fitted modulus ``kind`` and the relative RMS residual."""
+
+
+def master_points(shifted_data, shifted_freqs):
+    """All shifted points of a master curve as frequency-sorted arrays.
+
+    ``shifted_data``/``shifted_freqs`` are the Step 5 DataFrames (one column
+    per temperature). Only positive, finite points are kept.
+    """
+    freqs = np.asarray(shifted_freqs, dtype=float).ravel()
+    values = np.asarray(shifted_data, dtype=float).ravel()
+    ok = (freqs > 0) & (values > 0) & np.isfinite(freqs) & np.isfinite(values)
+    freqs, values = freqs[ok], values[ok]
+    order = np.argsort(freqs, kind='stable')
+    return freqs[order], values[order]
+
+
+# ── Smoothing ────────────────────────────────────────────────────────────────
+def _binned_median(x, y, n_bins):
+    """Median x, median y and count of the points in equal-width x bins.
+
+    ``x`` must be sorted, so every bin is a contiguous run of points. One
+    value sort of ``bin * span + y`` orders y within each run without
+    moving the runs, and every median is then picked by index.
+    """
+    edges = np.linspace(x[0], x[-1], n_bins + 1)
+    bins = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[counts > 0]
+    counts = counts[counts > 0]
+    lo, hi = starts + (counts - 1) // 2, starts + counts // 2
+    y_min = y.min()
+    span = y.max() - y_min + 1.0
+    offset = bins * span
+    y_sorted = np.sort(offset + (y - y_min)) - offset + y_min
+    return 0.5 * (x[lo] + x[hi]), 0.5 * (y_sorted[lo] + y_sorted[hi]), counts
+
+
+def smooth_master(freqs, values, method='spline', n_points=SMOOTH_POINTS, s=None):
+    """One smooth curve through all points of a master curve.
+
+    Works in log10-log10 space on the merged, frequency-sorted points of
+    :func:`master_points`. ``'spline'`` fits a single smoothing spline,
+    sampled at ``n_points`` log-spaced frequencies, to the medians of up
+    to ``SPLINE_BINS`` fine bins weighted by their point counts, so its
+    cost does not grow with the data and outliers do not pull in knots
+    (``s`` defaults to ``SMOOTH_RMS`` of ln-modulus per bin).
+    ``'binned'`` takes the median of each of ``n_points`` log-frequency
+    bins.
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if freqs.size < 4:
+        raise ValueError("At least four master-curve points are needed.")
+    x = np.log10(freqs)
+    y = np.log10(values)
+    if method == 'spline':
+        from scipy.interpolate import UnivariateSpline
+        x_bins, y_bins, counts = _binned_median(x, y, min(x.size, SPLINE_BINS))
+        if s is None:
+            s = x_bins.size * (SMOOTH_RMS / np.log(10)) ** 2
+        spline = UnivariateSpline(x_bins, y_bins, w=np.sqrt(counts), s=s)
+        x_curve = np.linspace(x[0], x[-1], n_points)
+        y_curve = spline(x_curve)
+    elif method == 'binned':
+        x_curve, y_curve, _ = _binned_median(x, y, n_points)
+    else:
+        raise ValueError("Unknown smoothing method {0!r}; use one of {1}.".format(
+            method, SMOOTH_METHODS))
+    return SmoothCurve(10 ** x_curve, 10 ** y_curve, method)
+
+
+def smooth_values(curve, freqs):
+    """A :class:`SmoothCurve` interpolated log-log at ``freqs`` (Hz)."""
+    x = np.log10(np.asarray(freqs, dtype=float))
+    return 10 ** np.interp(x, np.log10(curve.freqs), np.log10(curve.values))
+
+
+# ── Prony series ─────────────────────────────────────────────────────────────
+def prony_times(freqs, n_terms):
+    """``n_terms`` log-spaced relaxation times spanning the frequency range."""
+    freqs = np.asarray(freqs, dtype=float)
+    if n_terms < 1:
+        raise ValueError("At least one Prony term is needed.")
+    tau_min = 1.0 / (2 * np.pi * freqs.max())
+    tau_max = 1.0 / (2 * np.pi * freqs.min())
+    return np.logspace(np.log10(tau_min), np.log10(tau_max), n_terms)
+
+
+def prony_basis(freqs, tau, kind='storage'):
+    """(M, N) response of unit Maxwell terms at M frequencies (Hz)."""
+    wt = (2 * np.pi) * np.asarray(freqs, dtype=float)[:, None] * np.asarray(tau)[None, :]
+    if kind == 'storage':
+        wt *= wt
+        return wt / (1 + wt)
+    if kind == 'loss':
+        return wt / (1 + wt * wt)
+    raise ValueError("Unknown modulus kind {0!r}; use one of {1}.".format(kind, PRONY_KINDS))
+
+
+def nnls(A, b, passive=None, max_iter=None, tol=1e-12):
+    """Lawson-Hanson non-negative least squares, min ||A x - b||, x >= 0.
+
+    ``passive`` is an optional boolean start set of free (positive)
+    coefficients, e.g. the support of a previous solution; starting there
+    usually leaves only a few active-set changes.
+    """
+    m, n = A.shape
+    max_iter = max_iter or 3 * n
+    P = np.zeros(n, dtype=bool) if passive is None else np.array(passive, dtype=bool)
+    x = np.zeros(n)
+
+    def solve(P):
+        s = np.zeros(n)
+        if P.any():
+            s[P] = np.linalg.lstsq(A[:, P], b, rcond=None)[0]
+        return s
+
+    def feasible(P, x):
+        # Step back along x -> s until no passive coefficient is negative
+        for _ in range(max_iter):
+            s = solve(P)
+            bad = P & (s <= 0)
+            if not bad.any():
+                return P, s
+            alpha = np.min(x[bad] / (x[bad] - s[bad]))
+            x = x + alpha * (s - x)
+            P = P & (x > tol)
+        return P, np.where(P, x, 0.0)
+
+    # Warm start: shrink the start set until its solution is all positive
+    while P.any():
+        s = solve(P)
+        if (s[P] > 0).all():
+            x = s
+            break
+        P &= s > 0
+    for _ in range(max_iter):
+        w = A.T @ (b - A @ x)
+        w[P] = -np.inf
+        j = int(np.argmax(w))
+        if w[j] <= tol * max(1.0, np.abs(A.T @ b).max()):
+            break
+        P[j] = True
+        P, x = feasible(P, x)
+    return x
+
+
+def _prony_system(freqs, values, tau, kind, chunk_rows):
+    """QR-reduced relative-residual Prony system.
+
+    The design matrix is built and reduced one block of rows at a time, so
+    the NNLS only ever sees ``(R, q)`` with ``||A x - b||^2 =
+    ||R x - q||^2 + rest``; ``rest`` is returned as the third item.
+    """
+    n = tau.size + (kind == 'storage')
+    R = np.zeros((0, n + 1))
+    for start in range(0, freqs.size, chunk_rows):
+        stop = start + chunk_rows
+        block = np.empty((min(stop, freqs.size) - start, n + 1))
+        block[:, n - tau.size:n] = prony_basis(freqs[start:stop], tau, kind)
+        if kind == 'storage':
+            block[:, 0] = 1.0
+        block[:, :n] /= values[start:stop, None]
+        block[:, n] = 1.0
+        R = np.linalg.qr(np.vstack((R, block)), mode='r')
+    if R.shape[0] < n + 1:
+        R = np.vstack((R, np.zeros((n + 1 - R.shape[0], n + 1))))
+    return R[:n, :n], R[:n, n], R[n, n] ** 2
+
+
+def fit_prony(freqs, values, n_terms=30, tau=None, kind='storage', warm_start=None,
+              chunk_rows=PRONY_CHUNK_ROWS):
+    """Non-negative Prony series fitted to a master curve.
+
+    The storage modulus is modelled as E_inf + sum E_i w^2 tau_i^2 /
+    (1 + w^2 tau_i^2), the loss modulus as sum E_i w tau_i / (1 + w^2
+    tau_i^2), with w = 2 pi f and log-spaced ``tau`` (see
+    :func:`prony_times`) unless given. Residuals are relative to the data.
+    The tall design matrix is reduced by blockwise QR, so the active-set
+    NNLS only sees an (N, N) problem. Passing the previous
+    :class:`PronyFit` as ``warm_start`` starts from its support when the
+    times match.
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if freqs.size == 0:
+        raise ValueError("No master-curve points to fit.")
+    if kind not in PRONY_KINDS:
+        raise ValueError("Unknown modulus kind {0!r}; use one of {1}.".format(kind, PRONY_KINDS))
+    tau = prony_times(freqs, n_terms) if tau is None else np.asarray(tau, dtype=float)
+    R, q, rest = _prony_system(freqs, values, tau, kind, chunk_rows)
+
+    passive = None
+    if warm_start is not None and np.array_equal(warm_start.tau, tau) \
+            and warm_start.kind == kind:
+        support = warm_start.moduli > 0
+        passive = np.concatenate(([warm_start.E_inf > 0], support)) \
+            if kind == 'storage' else support
+    coef = nnls(R, q, passive=passive)
+
+    residual = R @ coef - q
+    rms = float(np.sqrt((np.dot(residual, residual) + rest) / freqs.size))
+    if kind == 'storage':
+        return PronyFit(tau, coef[1:], float(coef[0]), kind, rms)
+    return PronyFit(tau, coef, 0.0, kind, rms)
+
+
+def prony_modulus(fit, freqs):
+    """Modulus of a :class:`PronyFit` at frequencies ``freqs`` (Hz)."""
+    return fit.E_inf + prony_basis(freqs, fit.tau, fit.kind) @ fit.moduli
+
+
+def prony_table(fit):
+    """Prony coefficients for export, with E_inf as the tau = inf row.
+
+    ``g_i`` are the moduli normalised by the instantaneous modulus
+    E_0 = E_inf + sum E_i, as most FEA material cards expect.
+    """
+    E_0 = fit.E_inf + fit.moduli.sum()
+    tau = np.concatenate(([np.inf], fit.tau))
+    moduli = np.concatenate(([fit.E_inf], fit.moduli))
+    return pd.DataFrame({
+        'tau_i (s)': tau,
+        'E_i': moduli,
+        'g_i': moduli / E_0 if E_0 > 0 else np.zeros_like(moduli),
+    })
@@ -0,0 +1,382 @@
+"""Time-temperature superposition shift factors (no GUI dependencies)."""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Candidate shifts per refinement level of the pairwise overlap search
+SHIFT_CANDIDATES = 128
+# Minimum number of overlapping points for a candidate shift to count
+MIN_OVERLAP = 3
+# Knots per decade of the B-spline master curve in the joint a_T/b_T fit
+SHIFT_FIT_KNOTS = 4
+# Weight of its second-difference penalty, per point and coefficient
+SHIFT_FIT_SMOOTHING = 1e-3
+
+
+def _log_curve(freqs, values):
+    """Sorted (log10 f, log10 value) of the positive, finite points."""
+    freqs = np.asarray(freqs, dtype=float)
+    values = np.asarray(values, dtype=float)
+    ok = (freqs > 0) & (values > 0) & np.isfinite(freqs) & np.isfinite(values)
+    x = np.log10(freqs[ok])
+    y = np.log10(values[ok])
+    order = np.argsort(x, kind='stable')
+    return x[order], y[order]
+
+
+def _overlap_mismatch(x_ref, y_ref, x, y, shifts):
+    """Mean squared log-modulus gap between two curves for each shift.
+
+    Both directions are used: points of the shifted curve are compared with
+    the interpolated reference and vice versa, only inside the overlap.
+    """
+    xs = x[None, :] + shifts[:, None]
+    inside = (xs >= x_ref[0]) & (xs <= x_ref[-1])
+    gap = np.interp(xs.ravel(), x_ref, y_ref).reshape(xs.shape) - y[None, :]
+    sq = np.where(inside, gap * gap, 0.0).sum(axis=1)
+    count = inside.sum(axis=1)
+
+    xr = x_ref[None, :] - shifts[:, None]
+    inside_r = (xr >= x[0]) & (xr <= x[-1])
+    gap_r = np.interp(xr.ravel(), x, y).reshape(xr.shape) - y_ref[None, :]
+    sq += np.where(inside_r, gap_r * gap_r, 0.0).sum(axis=1)
+    count += inside_r.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mismatch = sq / count
+    mismatch[count < 2 * MIN_OVERLAP] = np.inf
+    return mismatch
+
+
+def pair_shift(x_ref, y_ref, x, y, levels=3):
+    """log10 shift that moves curve (x, y) onto (x_ref, y_ref).
+
+    Inputs are sorted log-log curves. All candidate shifts of a level are
+    scored in one vectorized pass; each level then zooms in around the best
+    candidate. Returns NaN when the curves cannot overlap.
+    """
+    if x_ref.size < MIN_OVERLAP or x.size < MIN_OVERLAP:
+        return np.nan
+    lo = x_ref[0] - x[-1]
+    hi = x_ref[-1] - x[0]
+    best = np.nan
+    for _ in range(levels):
+        shifts = np.linspace(lo, hi, SHIFT_CANDIDATES)
+        mismatch = _overlap_mismatch(x_ref, y_ref, x, y, shifts)
+        if not np.isfinite(mismatch).any():
+            return best
+        i = int(np.argmin(mismatch))
+        best = shifts[i]
+        step = shifts[1] - shifts[0]
+        lo, hi = best - 2 * step, best + 2 * step
+    return best
+
+
+def auto_shift(data, T_r=None):
+    """log(a_T) for every isotherm of a DMA table, from curve overlap.
+
+    ``data`` has frequencies as index and one modulus column per
+    temperature (°C). Neighbouring isotherms (in temperature order) are
+    matched pairwise in log-log space and the relative shifts are chained,
+    so that ``shifted_freq = freq * 10**log_aT``. log(a_T) is zero at
+    ``T_r`` (interpolated between isotherms), or at the middle isotherm when
+    ``T_r`` is None. Returns ``(temperatures, log_aT)`` in column order.
+    """
+    temperatures = np.array([float(temp) for temp in data.columns])
+    if temperatures.size == 0:
+        raise ValueError("The DMA table has no temperature columns.")
+    order = np.argsort(temperatures, kind='stable')
+    freqs = np.asarray(data.index, dtype=float)
+    curves = [_log_curve(freqs, data.iloc[:, j].to_numpy()) for j in order]
+
+    steps = np.empty(order.size - 1)
+    for k in range(order.size - 1):
+        x_ref, y_ref = curves[k]
+        x, y = curves[k + 1]
+        steps[k] = pair_shift(x_ref, y_ref, x, y)
+    if not np.isfinite(steps).all():
+        bad = temperatures[order[1:][~np.isfinite(steps)][0]]
+        raise ValueError("The {0}°C isotherm does not overlap its "
+                         "neighbour.".format(bad))
+
+    chained = np.concatenate(([0.0], np.cumsum(steps)))
+    sorted_T = temperatures[order]
+    if T_r is None:
+        offset = chained[order.size // 2]
+    else:
+        offset = np.interp(T_r, sorted_T, chained)
+    log_aT = np.empty(order.size)
+    log_aT[order] = chained - offset
+    return temperatures, log_aT
+
+
+# ── Shift state ──────────────────────────────────────────────────────────────
+ShiftState = namedtuple('ShiftState', 'log_aT log_bT')
+ShiftState.__doc__ = """Horizontal (log10 a_T) and vertical (log10 b_T) shift of
+every isotherm, as read-only arrays in DMA-table column order. The
+modulus is multiplied by 10**log_bT, so a density factor b_T = rho T /
+(rho_0 T_0) is stored as log_bT = -log10(b_T)."""
+ShiftFit = namedtuple('ShiftFit', 'log_aT log_bT rms n_iter')
+ShiftFit.__doc__ = """Jointly fitted shifts (as in :class:`ShiftState`), the RMS
+log10-modulus residual about the master curve and the iteration count."""
+
+
+def _frozen(values):
+    values = np.array(values, dtype=float)
+    values.flags.writeable = False
+    return values
+
+
+def shifted_column(data, state, i):
+    """(frequencies, modulus) of column ``i`` shifted by ``state``.
+
+    ``data`` is the original DMA table and is never modified.
+    """
+    freqs = np.asarray(data.index, dtype=float) * 10 ** state.log_aT[i]
+    values = data.iloc[:, i].to_numpy(dtype=float) * 10 ** state.log_bT[i]
+    return freqs, values
+
+
+def shift_views(data, state):
+    """``(shifted_data, shifted_freqs)`` DataFrames of a DMA table under a
+    :class:`ShiftState`, laid out like :func:`wlf_core.shift_data`."""
+    freqs = np.asarray(data.index, dtype=float)
+    shifted_freqs = pd.DataFrame(freqs[:, None] * 10 ** state.log_aT[None, :],
+                                 columns=data.columns)
+    shifted_data = pd.DataFrame(data.to_numpy(dtype=float) * 10 ** state.log_bT[None, :],
+                                columns=data.columns)
+    return shifted_data, shifted_freqs
+
+
+def density_bT(temperatures, density, T_ref):
+    """Vertical shift factor b_T = rho T / (rho_0 T_0) per isotherm.
+
+    ``temperatures`` (°C) and ``density`` have one value per isotherm;
+    rho_0 at ``T_ref`` (°C) is interpolated linearly from them.
+    """
+    T = np.asarray(temperatures, dtype=float)
+    density = np.asarray(density, dtype=float)
+    if density.shape != T.shape:
+        raise ValueError("Give one density value per isotherm ({0}).".format(T.size))
+    if not (np.isfinite(density).all() and (density > 0).all()):
+        raise ValueError("Densities must be positive numbers.")
+    order = np.argsort(T, kind='stable')
+    rho_0 = np.interp(T_ref, T[order], density[order])
+    return density * (T + 273.15) / (rho_0 * (T_ref + 273.15))
+
+
+def _shift_points(data):
+    """log10 f, log10 modulus and column of every positive, finite point,
+    grouped by column, plus the start of each group."""
+    freqs = np.asarray(data.index, dtype=float)
+    values = data.to_numpy(dtype=float)
+    ok = ((freqs > 0) & np.isfinite(freqs))[:, None] & (values > 0) & np.isfinite(values)
+    col, row = np.nonzero(ok.T)
+    counts = np.bincount(col, minlength=values.shape[1])
+    if (counts < 2).any():
+        bad = data.columns[np.flatnonzero(counts < 2)[0]]
+        raise ValueError("The {0}°C isotherm has fewer than two usable points.".format(bad))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return np.log10(freqs[row]), np.log10(values[row, col]), col, starts
+
+
+def _bspline_basis(t, n_coef):
+    """Uniform cubic B-spline values and slopes at knot coordinates ``t``.
+
+    Returns the first coefficient index ``k`` of every point and (4, N)
+    arrays of the four non-zero basis functions and their derivatives;
+    points past the ends use the polynomial of the outermost cell.
+    """
+    k = np.clip(np.floor(t).astype(int), 0, n_coef - 4)
+    u = t - k
+    v = 1 - u
+    uu = u * u
+    basis = np.array((v * v * v, (3 * uu * u - 6 * uu + 4), (-3 * uu * u + 3 * uu + 3 * u + 1),
+                      uu * u)) / 6
+    slopes = np.array((-v * v, 3 * uu - 4 * u, -3 * uu + 2 * u + 1, uu)) / 2
+    return k, basis, slopes
+
+
+def fit_shifts(data, log_aT, log_bT=None, reference=None, fit_bT=True,
+               knots_per_decade=SHIFT_FIT_KNOTS, smoothing=SHIFT_FIT_SMOOTHING,
+               max_iter=100, tol=1e-9):
+    """Joint least-squares log a_T and log b_T of every isotherm.
+
+    All points are fitted at once to one master curve g in log-log space,
+    ``g(log f + log_aT[j]) = log E + log_bT[j]``, by Levenberg-Marquardt
+    over the shifts and g. g is a uniform cubic B-spline with a small
+    second-difference penalty (``smoothing``), so gaps in the data do not
+    leave it undetermined. Residuals and the analytic Jacobian (dg/dx for
+    a_T, -1 for b_T, four B-spline values per point for g) are vectorized
+    over all points, and the normal equations are summed with
+    ``np.bincount``, so no (points x parameters) matrix is formed.
+
+    ``log_aT``/``log_bT`` are the start values (e.g. from the WLF shift);
+    isotherm ``reference`` (default: smallest |log_aT|) keeps its shifts,
+    and with ``fit_bT=False`` every b_T is kept.
+    """
+    x, y, col, starts = _shift_points(data)
+    n = starts.size
+    a = np.array(log_aT, dtype=float)
+    b = np.zeros(n) if log_bT is None else np.array(log_bT, dtype=float)
+    if a.shape != (n,) or b.shape != (n,):
+        raise ValueError("log a_T and log b_T need one value per isotherm.")
+    if reference is None:
+        reference = int(np.argmin(np.abs(a)))
+
+    # Knots cover the starting master curve; t is x in knot units
+    u = x + a[col]
+    lo = u.min()
+    h = 1.0 / knots_per_decade
+    m = max(int(np.ceil((u.max() - lo) / h)), 1) + 3
+    size = 2 * n + m
+    ia, ib, ic = slice(0, n), slice(n, 2 * n), slice(2 * n, size)
+    free = np.ones(size, dtype=bool)
+    free[ib] = bool(fit_bT)
+    free[reference] = free[n + reference] = False
+
+    D = np.diff(np.eye(m), 2, axis=0)
+    penalty = smoothing * (x.size / m) * (D.T @ D)
+    offsets = np.arange(4)
+
+    def residuals(a, b, c):
+        k, basis, slopes = _bspline_basis((x + a[col] - lo) / h + 1, m)
+        r = (basis * c[k + offsets[:, None]]).sum(axis=0) - (y + b[col])
+        cost = np.dot(r, r) + c @ penalty @ c
+        return k, basis, slopes, r, cost
+
+    def normal_equations(c, k, basis, slopes, r):
+        slope = (slopes * c[k + offsets[:, None]]).sum(axis=0) / h
+        A = np.zeros((size, size))
+        grad = np.empty(size)
+        cc = np.zeros((m, m))
+        # Upper triangle of the banded B-spline block, mirrored below
+        for p in range(4):
+            for q in range(p, 4):
+                cc += np.bincount((k + p) * m + (k + q), basis[p] * basis[q],
+                                  minlength=m * m).reshape(m, m)
+        cc += np.triu(cc, 1).T
+        A[ic, ic] = cc + penalty
+        ac = np.zeros((n, m))
+        bc = np.zeros((n, m))
+        for p in range(4):
+            ac += np.bincount(col * m + k + p, slope * basis[p], minlength=n * m).reshape(n, m)
+            bc -= np.bincount(col * m + k + p, basis[p], minlength=n * m).reshape(n, m)
+        A[ia, ic], A[ib, ic] = ac, bc
+        A[ic, ia], A[ic, ib] = ac.T, bc.T
+        diag = np.arange(n)
+        A[diag, diag] = np.add.reduceat(slope * slope, starts)
+        A[n + diag, n + diag] = np.diff(np.append(starts, x.size))
+        A[diag, n + diag] = A[n + diag, diag] = -np.add.reduceat(slope, starts)
+        grad[ia] = np.add.reduceat(slope * r, starts)
+        grad[ib] = -np.add.reduceat(r, starts)
+        grad[ic] = penalty @ c
+        for p in range(4):
+            grad[ic] += np.bincount(k + p, basis[p] * r, minlength=m)
+        return A, grad
+
+    # Start from the best curve for the starting shifts (one linear solve)
+    c = np.zeros(m)
+    k, basis, slopes, r, _ = residuals(a, b, c)
+    A, grad = normal_equations(c, k, basis, slopes, r)
+    c = np.linalg.lstsq(A[ic, ic], -grad[ic], rcond=None)[0]
+    k, basis, slopes, r, cost = residuals(a, b, c)
+
+    lam = 1e-3
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        A, grad = normal_equations(c, k, basis, slopes, r)
+        A_free, g_free = A[np.ix_(free, free)], grad[free]
+        scale = np.maximum(np.diag(A_free), 1e-12)
+        while True:
+            try:
+                delta = np.linalg.solve(A_free + lam * np.diag(scale), -g_free)
+            except np.linalg.LinAlgError:
+                delta = None
+            if delta is not None:
+                step = np.zeros(size)
+                step[free] = delta
+                trial = a + step[ia], b + step[ib], c + step[ic]
+                result = residuals(*trial)
+                if np.isfinite(result[4]) and result[4] <= cost:
+                    lam = max(lam / 10, 1e-12)
+                    break
+            lam *= 10
+            if lam > 1e12:
+                return ShiftFit(a, b, float(np.sqrt(np.dot(r, r) / x.size)), n_iter)
+        converged = cost - result[4] <= tol * max(cost, 1e-30)
+        (a, b, c), (k, basis, slopes, r, cost) = trial, result
+        if converged:
+            break
+    return ShiftFit(a, b, float(np.sqrt(np.dot(r, r) / x.size)), n_iter)
+
+
+class ShiftHistory:
+    """Undo/redo history of the :class:`ShiftState` of one DMA table.
+
+    Every edit stores two arrays with one value per isotherm, never the
+    data, so the history is unbounded. A new edit drops the redo states.
+    """
+
+    def __init__(self, log_aT, log_bT=None):
+        log_aT = _frozen(log_aT)
+        log_bT = _frozen(np.zeros_like(log_aT) if log_bT is None else log_bT)
+        if log_aT.shape != log_bT.shape or log_aT.ndim != 1:
+            raise ValueError("log a_T and log b_T need one value per isotherm.")
+        self._states = [ShiftState(log_aT, log_bT)]
+        self._index = 0
+
+    @property
+    def current(self):
+        return self._states[self._index]
+
+    @property
+    def can_undo(self):
+        return self._index > 0
+
+    @property
+    def can_redo(self):
+        return self._index < len(self._states) - 1
+
+    def push(self, log_aT=None, log_bT=None, replace=False):
+        """Make a new current state; unchanged arrays are kept.
+
+        With ``replace`` the current state is overwritten instead, so a
+        continuous edit (a slider drag) is undone in one step. Returns the
+        current state; nothing is recorded when no value changes.
+        """
+        current = self.current
+        state = ShiftState(current.log_aT if log_aT is None else _frozen(log_aT),
+                           current.log_bT if log_bT is None else _frozen(log_bT))
+        if state.log_aT.shape != current.log_aT.shape \
+                or state.log_bT.shape != current.log_bT.shape:
+            raise ValueError("log a_T and log b_T need one value per isotherm.")
+        if np.array_equal(state.log_aT, current.log_aT) \
+                and np.array_equal(state.log_bT, current.log_bT):
+            return current
+        del self._states[self._index + 1:]
+        if replace and self._index > 0:
+            self._states[self._index] = state
+        else:
+            self._states.append(state)
+            self._index += 1
+        return state
+
+    def shift(self, i, d_log_aT=0.0, d_log_bT=0.0, replace=False):
+        """Add to the log a_T / log b_T of isotherm ``i``."""
+        log_aT = self.current.log_aT.copy()
+        log_bT = self.current.log_bT.copy()
+        log_aT[i] += d_log_aT
+        log_bT[i] += d_log_bT
+        return self.push(log_aT, log_bT, replace=replace)
+
+    def undo(self):
+        if self.can_undo:
+            self._index -= 1
+        return self.current
+
+    def redo(self):
+        if self.can_redo:
+            self._index += 1
+        return self.current